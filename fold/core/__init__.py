@@ -1,2 +1,5 @@
 from .plugin import Plugin
-from .config import BaseConfig, ConfigManager, Content, ConfigError
+from .config import BaseConfig, ConfigManager, Content, ConfigError, LazyManager, ParseResult
+from .cache import ConfigCache
+from .reload import CallGate, ConfigDiff, ConfigWatcher, diffContent, reloadPlugins
+from .layers import ConfigLoader, LayeredContent
@@ -0,0 +1,105 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple
+from pathlib import Path
+import hashlib
+import marshal
+import os
+import pickle
+import sys
+import tempfile
+
+from fold.utils.plugin import pluginPath
+
+if TYPE_CHECKING:
+    from fold.plugins.config import ConfigFilePlugin
+    from .config import Content
+
+# Serialization tags, marshal is used whenever the content is made of builtins only
+MARSHAL = b"M"
+PICKLE = b"P"
+
+
+class ConfigCache:
+    def __init__(self, directory: Path | str) -> None:
+        """On-disk cache of parsed config content
+
+        Entries are keyed by the hash of the raw config bytes, the set of parsers
+        available and the fold and python versions, so any change to one of them is
+        a cache miss. Only the parsed content is stored, validation still runs since
+        config managers may have side effects when they are constructed.
+
+        Entries may be pickled, so the directory must only be writable by trusted users.
+
+        Args:
+            directory (Path | str): Directory to store the cache entries in
+        """
+        self.directory = Path(directory)
+
+    def key(self, data: bytes, parsers: Iterable[ConfigFilePlugin]) -> str:
+        """Compute the cache key of a raw config
+
+        Args:
+            data (bytes): Raw config
+            parsers (Iterable[ConfigFilePlugin]): Parsers that may parse the config
+
+        Returns:
+            str: Cache key
+        """
+        from fold import __version__
+
+        digest = hashlib.sha256(data)
+        for name in sorted(pluginPath(parser) for parser in parsers):
+            digest.update(b"\0" + name.encode())
+        digest.update(f"\0{__version__}\0{sys.version}".encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.cache"
+
+    def get(self, key: str) -> Optional[Tuple[str, Content]]:
+        """Read a cache entry
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[Tuple[str, Content]]: (parser, content) or None if missed
+        """
+        try:
+            data = self._path(key).read_bytes()
+        except OSError:
+            return None
+
+        tag, payload = data[:1], data[1:]
+        try:
+            if tag == MARSHAL:
+                return marshal.loads(payload)
+            if tag == PICKLE:
+                return pickle.loads(payload)
+        except Exception:  # corrupted entries are treated as a miss
+            pass
+        return None
+
+    def put(self, key: str, parser: ConfigFilePlugin, content: Content) -> None:
+        """Write a cache entry atomically
+
+        Args:
+            key (str): Cache key
+            parser (ConfigFilePlugin): Parser that produced the content
+            content (Content): Parsed content
+        """
+        entry = (pluginPath(parser), content)
+        try:
+            data = MARSHAL + marshal.dumps(entry)
+        except ValueError:  # e.g. TOML datetimes
+            data = PICKLE + pickle.dumps(entry, pickle.HIGHEST_PROTOCOL)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=self.directory, delete=False) as file:
+            file.write(data)
+        os.replace(file.name, self._path(key))
+
+    def clear(self) -> None:
+        """Remove every cache entry"""
+        for path in self.directory.glob("*.cache"):
+            path.unlink(missing_ok=True)
@@ -1,44 +1,130 @@
 from __future__ import annotations
 from types import NoneType
-from typing import TYPE_CHECKING, Iterable, Optional, Dict, List, Set
+from typing import TYPE_CHECKING, IO, Any, ClassVar, Iterable, Mapping, Optional, Dict, List, Set, Type
+from concurrent.futures import Executor
+from dataclasses import dataclass
 from pathlib import Path
+from threading import Lock, RLock
 
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, PrivateAttr, validator
 from pydantic.fields import ModelField
 
-from fold.utils.plugin import PluginManager
+from fold.utils.profile import span
+from fold.utils.plugin import LazyPlugin
+
+from .cache import ConfigCache, pluginPath
+from .reload import ConfigDiff, diffContent, trackManager
+from .layers import ConfigLoader, LayeredContent, environmentOverlay
 
 if TYPE_CHECKING:
-    from fold.plugins.config import ConfigFilePlugin
+    from fold.plugins.config import ConfigFilePlugin, ParserRegistry
+    from .plugin import Plugin
 
 Content = str | int | float | bool | NoneType | List["Content"] | Dict[str, "Content"]
 
 
+# Default parser registry, created on first use
+_parsers: Optional[ParserRegistry] = None
+
+
 class ConfigError(Exception):
     pass
 
 
+def sectionsError(message: str, errors: Dict[str, Exception]) -> ConfigError:
+    """Combine the errors of several config sections into one ConfigError
+
+    Args:
+        message (str): Summary of the failure
+        errors (Dict[str, Exception]): Error of each failed section
+
+    Returns:
+        ConfigError: Error listing every section, chained to the first error and
+            keeping all of them in its errors attribute
+    """
+    details = ", ".join(f"{key} ({error!r})" for key, error in sorted(errors.items()))
+    error = ConfigError(f"{message}: {details}")
+    error.errors = errors
+    error.__cause__ = next(iter(errors.values()))
+    error.__suppress_context__ = True
+    return error
+
+
+@dataclass
+class ParseResult:
+    """Outcome of parsing a config text
+
+    Attributes:
+        content (Dict[str, Content]): Parsed content
+        parser (ConfigFilePlugin): Parser that succeeded
+        attempts (int): Number of full parses run, including the successful one
+        cached (bool): Content was read from a ConfigCache instead of being parsed
+    """
+
+    content: Dict[str, Content]
+    parser: ConfigFilePlugin
+    attempts: int
+    cached: bool = False
+
+
 class ConfigManager:
+    # Method parsing each content type. Subclasses may extend it, e.g.
+    # DISPATCH = {**ConfigManager.DISPATCH, Decimal: "parseDecimal"}
+    DISPATCH: Dict[type, str] = {
+        str: "parseStr",
+        bool: "parseBool",
+        int: "parseInt",
+        float: "parseFloat",
+        NoneType: "parseNone",
+        list: "parseList",
+        dict: "parseDict",
+    }
+    _dispatchCache: Dict[type, str] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._dispatchCache = {}
+
     def __init__(self, config: BaseModel, *args, **kwargs) -> None:
         self.config = config
-        
+        trackManager(self)
+
+    def close(self) -> None:
+        """Release resources once the manager was replaced by a config reload"""
+        pass
+
+    def swapPlugins(self, plugins: Mapping[Plugin, Plugin]) -> bool:
+        """Replace the instances of reloaded plugins held by the manager
+
+        Override in managers holding plugin instances. Calls in flight on the old
+        instances must finish before they are replaced.
+
+        Args:
+            plugins (Mapping[Plugin, Plugin]): New version of each reloaded plugin
+
+        Returns:
+            bool: True if the manager held any of the plugins
+        """
+        return False
+
+    @classmethod
+    def _resolve(cls, kind: type) -> str:
+        """Find the parse method of a content type, falling back to its base classes"""
+        try:
+            return cls._dispatchCache[kind]
+        except KeyError:
+            pass
+        for base in kind.__mro__:
+            if (name := cls.DISPATCH.get(base)) is not None:
+                break
+        else:
+            raise TypeError(f"Unsupported config type {kind.__name__}")
+        cls._dispatchCache[kind] = name
+        return name
+
     @classmethod
     def parseConfig(cls, config: Content) -> BaseModel | List[BaseModel]:
-        match config:
-            case str():
-                return cls.parseStr(config)
-            case int():
-                return cls.parseInt(config)
-            case float():
-                return cls.parseFloat(config)
-            case bool():
-                return cls.parseBool(config)
-            case NoneType():
-                return cls.parseNone(config)
-            case list():
-                return cls.parseList(config)
-            case dict():
-                return cls.parseDict(config)
+        return getattr(cls, cls._resolve(type(config)))(config)
 
     @classmethod
     def parseStr(cls, config: str) -> BaseModel:
@@ -62,86 +148,595 @@ class ConfigManager:
 
     @classmethod
     def parseList(cls, config: List[Content]) -> List[BaseModel]:
+        kinds = {type(conf) for conf in config}
+        if len(kinds) == 1:
+            return cls.parseBatch(kinds.pop(), config)
         return [cls.parseConfig(conf) for conf in config]
 
+    @classmethod
+    def parseBatch(cls, kind: type, config: List[Content]) -> List[BaseModel]:
+        """Parse a list whose elements all have the same type
+
+        Override to validate homogeneous lists in one pass. By default the parse
+        method is resolved once and applied to every element.
+
+        Args:
+            kind (type): Type of every element
+            config (List[Content]): Elements to parse
+
+        Returns:
+            List[BaseModel]: Parsed elements, in order
+        """
+        parse = getattr(cls, cls._resolve(kind))
+        return [parse(conf) for conf in config]
+
     @classmethod
     def parseDict(cls, config: Dict[str, Content]) -> BaseModel:
         raise NotImplementedError
 
 
+class LazyManager:
+    def __init__(self, manager: Type[ConfigManager], content: Content) -> None:
+        """Proxy that parses its content and constructs the manager on first use
+
+        The proxy reports the manager class as its __class__ so that isinstance checks
+        on the field keep working. Construction happens at most once, even when
+        several threads access the proxy at the same time.
+
+        Args:
+            manager (Type[ConfigManager]): Manager class to construct
+            content (Content): Raw content of the section
+        """
+        self._manager = manager
+        self._content = content
+        self._instance: Optional[ConfigManager] = None
+        self._lock = Lock()
+
+    @property
+    def __class__(self):
+        return self._manager
+
+    @property
+    def materialized(self) -> bool:
+        """Whether the manager was constructed"""
+        return self._instance is not None
+
+    def materialize(self) -> ConfigManager:
+        """Parse the content and construct the manager if it was not done yet
+
+        Returns:
+            ConfigManager: Constructed manager
+        """
+        if (instance := self._instance) is None:
+            with self._lock:
+                if self._instance is None:
+                    config = self._manager.parseConfig(self._content)
+                    self._instance = self._manager(config)
+                    self._content = None
+                instance = self._instance
+        return instance
+
+    def close(self) -> None:
+        # Never construct a manager only to close it
+        if self._instance is not None:
+            self._instance.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.materialize(), name)
+
+    def __repr__(self) -> str:
+        state = "materialized" if self.materialized else "pending"
+        return f"<LazyManager {self._manager.__name__} ({state})>"
+
+
 class BaseConfig(BaseModel):
+    # Number of leading characters inspected when sniffing the format
+    SNIFF_SIZE: ClassVar[int] = 4096
+
+    _parseResult: Optional[ParseResult] = PrivateAttr(default=None)
+    _layers: Optional[LayeredContent] = PrivateAttr(default=None)
+    # Raw content of each section, used to diff reloads
+    _content: Dict[str, Content] = PrivateAttr(default_factory=dict)
+    _reloadLock: RLock = PrivateAttr(default_factory=RLock)
+
     class Config:
         validate_all = True
         arbitrary_types_allowed = True
-        
+        # Defer parsing and constructing managers until a section is first used
+        lazy = False
+
+    def __init__(self, **data) -> None:
+        super().__init__(**data)
+        # Sections given as prebuilt managers have no content to compare against
+        self._content = {
+            key: value
+            for key, value in data.items()
+            if key in self.__fields__ and not isinstance(value, ConfigManager)
+        }
+
     @validator("*", pre=True, always=True)
     def name(cls, content: Content, field: ModelField):
+        # Managers built ahead of validation, e.g. while streaming, are kept as is
+        if isinstance(content, field.type_):
+            return content
+        return cls._buildManager(field, content)
+
+    @classmethod
+    def _buildManager(cls, field: ModelField, content: Content) -> ConfigManager:
         manager: ConfigManager = field.type_
+        if getattr(cls.__config__, "lazy", False):
+            return LazyManager(manager, content)
         config = manager.parseConfig(content)
         return manager(config)
+
+    def materialize(self) -> BaseConfig:
+        """Construct every lazy manager now, e.g. to fail fast on deployment
+
+        Raises:
+            ConfigError: One or more sections are invalid
+
+        Returns:
+            BaseConfig: This config
+        """
+        managers, errors = {}, {}
+        for key in self.__fields__:
+            value = self.__dict__.get(key)
+            if type(value) is not LazyManager:
+                continue
+            try:
+                managers[key] = value.materialize()
+            except Exception as e:
+                errors[key] = e
+        # Valid sections are unwrapped even if others failed
+        self.__dict__.update(managers)
+        if errors:
+            raise sectionsError("Invalid sections", errors)
+        return self
     
+    @classmethod
+    @property
+    def PARSERS(cls) -> ParserRegistry:
+        """Registry of the default parsers, discovered once and shared by every config"""
+        global _parsers
+        if _parsers is None:
+            from fold.plugins.config import ParserRegistry
+
+            _parsers = ParserRegistry(modules=["fold.plugins.config"])
+        return _parsers
+
     @classmethod
     @property
     def DEFAULT_PARSERS(cls) -> Set[ConfigFilePlugin]:
-        return PluginManager(ConfigFilePlugin).discover("fold.plugins.config")
+        return cls.PARSERS.plugins
+
+    @property
+    def parseResult(self) -> Optional[ParseResult]:
+        """Which parser produced this config and after how many attempts, if it was parsed from text"""
+        return self._parseResult
+
+    @property
+    def layers(self) -> Optional[LayeredContent]:
+        """Files this config was merged from and where each value came from, if it was loaded with fromPaths"""
+        return self._layers
 
     @classmethod
-    def fromText(
-        cls, text: str, parsers: Optional[Iterable[ConfigFilePlugin]] = None
-    ) -> BaseConfig:
-        """Parse a config as a single string
+    def rankParsers(
+        cls,
+        text: str,
+        parsers: Iterable[ConfigFilePlugin],
+        extension: Optional[str] = None,
+    ) -> List[ConfigFilePlugin]:
+        """Order parsers from most to least likely to parse a text
+
+        Parsers matching the file extension come first, then parsers are ordered by
+        their sniff score of the head of the text. Lazy parsers not imported yet are
+        not sniffed. Ties keep a stable, name based order.
+
+        Args:
+            text (str): config
+            parsers (Iterable[ConfigFilePlugin]): File parsers or a ParserRegistry to rank
+            extension (str, optional): File extension hint with or without the leading dot. Defaults to None.
+
+        Returns:
+            List[ConfigFilePlugin]: Parsers, best candidate first
+        """
+        from fold.plugins.config import ParserRegistry
+
+        # Explicit parsers are indexed for this call only
+        if not isinstance(parsers, ParserRegistry):
+            parsers = ParserRegistry(parsers)
+        extParsers = parsers.byExtension(extension)
+        head = text[: cls.SNIFF_SIZE]
+
+        def score(parser: ConfigFilePlugin):
+            return (parser in extParsers, cls._sniff(parser, head))
+
+        return sorted(parsers.ordered, key=score, reverse=True)
+
+    @staticmethod
+    def _sniff(parser: ConfigFilePlugin, head: str) -> float:
+        # sniffing would import a lazy parser, it is ranked by its extensions only
+        if isinstance(parser, LazyPlugin) and not parser.loaded:
+            return 0.0
+        try:
+            return parser.sniff(head)
+        except Exception:  # a broken sniffer only loses its ranking
+            return 0.0
+
+    @classmethod
+    def parseText(
+        cls,
+        text: str,
+        parsers: Optional[Iterable[ConfigFilePlugin]] = None,
+        extension: Optional[str] = None,
+    ) -> ParseResult:
+        """Parse a config text into content without validating it
 
         Args:
             text (str): config
             parsers (Iterable[ConfigFile], None): File parsers to use, default to fold.config
+            extension (str, optional): File extension hint. Defaults to None.
 
         Raises:
             ConfigError: None of the parsers worked
 
         Returns:
-            BaseConfig: Base config model
+            ParseResult: Parsed content along with the parser used
         """
-        # If the parsers are not defined, then discover the parsers first.
+        # If the parsers are not defined, then use the default registry
         if parsers is None:
-            parsers = cls.DEFAULT_PARSERS
+            parsers = cls.PARSERS
 
-        # Brute force all parsers defined
-        for parser in parsers:
+        # Try the most likely parsers first so that usually only one full parse runs
+        ranked = cls.rankParsers(text, parsers, extension)
+        for attempts, parser in enumerate(ranked, start=1):
             try:
-                config = parser.fromText(text)
-                break
+                with span(pluginPath(parser), "parse"):
+                    content = parser.fromText(text)
             except Exception:
-                pass
-        else:
-            # None of them worked...
-            raise ConfigError(f"Failed to parse {text}")
-        return BaseConfig(**config)
+                continue
+            return ParseResult(content, parser, attempts)
+        # None of them worked...
+        raise ConfigError(f"Failed to parse {text}")
+
+    @classmethod
+    def fromContent(
+        cls, content: Dict[str, Content], executor: Optional[Executor] = None
+    ) -> BaseConfig:
+        """Validate parsed content, optionally parsing sections concurrently
+
+        With an executor, the parseConfig step of every section runs on the pool
+        so that sections doing I/O or imports overlap. Managers are then
+        constructed one after another in field order, exactly as serial
+        validation would, since constructing a manager may have side effects.
+        Process pools require the managers and parsed configs to be picklable.
+
+        Args:
+            content (Dict[str, Content]): Parsed content
+            executor (Executor, optional): Pool to parse sections on. Defaults to None, validate serially.
+
+        Raises:
+            ConfigError: One or more sections are invalid, reported together
+            ValidationError: Validation failed without an executor
+
+        Returns:
+            BaseConfig: Base config model
+        """
+        if executor is None or getattr(cls.__config__, "lazy", False):
+            return cls(**content)
+
+        # Missing sections are left to the model so they fail the same way
+        fields = {key: field for key, field in cls.__fields__.items() if key in content}
+        futures = {
+            key: executor.submit(field.type_.parseConfig, content[key])
+            for key, field in fields.items()
+        }
+
+        managers, errors = {}, {}
+        for key, field in fields.items():
+            try:
+                managers[key] = field.type_(futures[key].result())
+            except Exception as e:
+                errors[key] = e
+        if errors:
+            raise sectionsError("Invalid sections", errors)
+
+        config = cls(**{**content, **managers})
+        config._content = {key: content[key] for key in fields}
+        return config
+
+    @classmethod
+    def fromText(
+        cls,
+        text: str,
+        parsers: Optional[Iterable[ConfigFilePlugin]] = None,
+        extension: Optional[str] = None,
+        executor: Optional[Executor] = None,
+    ) -> BaseConfig:
+        """Parse a config as a single string
+
+        Args:
+            text (str): config
+            parsers (Iterable[ConfigFile], None): File parsers to use, default to fold.config
+            extension (str, optional): File extension hint. Defaults to None.
+            executor (Executor, optional): Pool to validate sections concurrently on, see fromContent. Defaults to None.
+
+        Raises:
+            ConfigError: None of the parsers worked
+
+        Returns:
+            BaseConfig: Base config model
+        """
+        result = cls.parseText(text, parsers, extension)
+        config = cls.fromContent(result.content, executor)
+        config._parseResult = result
+        return config
 
     @classmethod
     def fromPath(
-        cls, path: Path, parsers: Optional[Iterable[ConfigFilePlugin]] = None
+        cls,
+        path: Path,
+        parsers: Optional[Iterable[ConfigFilePlugin]] = None,
+        cache: Optional[ConfigCache] = None,
+        stream: bool = False,
+        executor: Optional[Executor] = None,
     ) -> BaseConfig:
-        # If the parsers are not defined, then discover the parsers first.
+        """Parse a config file
+
+        Args:
+            path (Path): Path to the config
+            parsers (Iterable[ConfigFile], None): File parsers to use, default to fold.config
+            cache (ConfigCache, optional): Cache of parsed configs to skip parsing on a hit. Defaults to None.
+            stream (bool, optional): Load the file section by section with bounded memory, see fromStream. Defaults to False.
+            executor (Executor, optional): Pool to validate sections concurrently on, see fromContent. Defaults to None.
+
+        Raises:
+            ConfigError: None of the parsers worked
+
+        Returns:
+            BaseConfig: Base config model
+        """
+        path = Path(path)
+        if stream:
+            return cls._fromStreamedPath(path, parsers)
+
+        result = cls.parsePath(path, parsers, cache)
+        config = cls.fromContent(result.content, executor)
+        config._parseResult = result
+        return config
+
+    @classmethod
+    def fromPaths(
+        cls,
+        *paths: Path,
+        parsers: Optional[Iterable[ConfigFilePlugin]] = None,
+        cache: Optional[ConfigCache] = None,
+        environment: Optional[str] = None,
+        includeKey: str = "include",
+        executor: Optional[Executor] = None,
+    ) -> BaseConfig:
+        """Merge layered config files, following their include directives
+
+        Args:
+            *paths (Path): Layers, lowest precedence first
+            parsers (Iterable[ConfigFile], None): File parsers to use, default to fold.config
+            cache (ConfigCache, optional): Cache of parsed configs. Defaults to None.
+            environment (str, optional): Also merge the existing <stem>.<environment><suffix> overlay right after each layer. Defaults to None.
+            includeKey (str, optional): Top-level key listing the files to include. Defaults to "include".
+            executor (Executor, optional): Pool to read files on and validate sections concurrently. Defaults to None.
+
+        Raises:
+            ConfigError: A file could not be parsed, includes itself or the merged config is invalid
+
+        Returns:
+            BaseConfig: Base config model
+        """
+        layers = []
+        for path in paths:
+            layers.append(path)
+            if environment is not None:
+                overlay = environmentOverlay(path, environment)
+                if overlay.exists():
+                    layers.append(overlay)
+
+        loader = ConfigLoader(parsers, cache, executor, includeKey)
+        layered = loader.load(*layers)
+        config = cls.fromContent(layered.content, executor)
+        config._layers = layered
+        return config
+
+    @classmethod
+    def parsePath(
+        cls,
+        path: Path,
+        parsers: Optional[Iterable[ConfigFilePlugin]] = None,
+        cache: Optional[ConfigCache] = None,
+    ) -> ParseResult:
+        """Parse a config file into content without validating it
+
+        Args:
+            path (Path): Path to the config
+            parsers (Iterable[ConfigFile], None): File parsers to use, default to fold.config
+            cache (ConfigCache, optional): Cache of parsed configs to skip parsing on a hit. Defaults to None.
+
+        Raises:
+            ConfigError: None of the parsers worked
+
+        Returns:
+            ParseResult: Parsed content along with the parser used
+        """
+        path = Path(path)
         if parsers is None:
-            parsers = cls.DEFAULT_PARSERS
+            parsers = cls.PARSERS
 
-        with open(path, "r", encoding="UTF-8") as file:
-            text = file.read()
+        if cache is None:
+            with open(path, "r", encoding="UTF-8") as file:
+                text = file.read()
+            # Parsers matching the file extension are ranked first
+            try:
+                return cls.parseText(text, parsers, path.suffix)
+            except ConfigError as e:
+                raise ConfigError(f"Failed to parse {path}") from e
 
-        # Try to parse based off the file extension
-        ext = path.suffix.lower()
-        extParsers = {
-            parser
-            for parser in parsers
-            if ext in {ext.lower() for ext in parser.EXTENSIONS}
-        }
-        try:
-            return cls.fromText(text, extParsers)
-        except ConfigError:  # ext parsers failed
-            parsers = parsers - extParsers
+        parsers = {pluginPath(parser): parser for parser in parsers}
+        data = path.read_bytes()
+        key = cache.key(data, parsers.values())
+        if (entry := cache.get(key)) is not None and entry[0] in parsers:
+            name, content = entry
+            return ParseResult(content, parsers[name], attempts=0, cached=True)
 
-        # Just brute force the remaining parsers
+        text = data.decode("UTF-8")
         try:
-            return cls.fromText(text, parsers)
+            result = cls.parseText(text, parsers.values(), path.suffix)
         except ConfigError as e:
             raise ConfigError(f"Failed to parse {path}") from e
+        cache.put(key, result.parser, result.content)
+        return result
+
+    @classmethod
+    def _fromStreamedPath(
+        cls, path: Path, parsers: Optional[Iterable[ConfigFilePlugin]]
+    ) -> BaseConfig:
+        from fold.plugins.config import ParserRegistry
+
+        if parsers is None:
+            parsers = cls.PARSERS
+        if not isinstance(parsers, ParserRegistry):
+            parsers = ParserRegistry(parsers)
+
+        with open(path, "rb") as file:
+            head = file.read(cls.SNIFF_SIZE).decode("UTF-8", errors="ignore")
+            # only parsers of the file format, any other would fail with a misleading error
+            ranked = cls.rankParsers(head, parsers, path.suffix)
+            if extParsers := parsers.byExtension(path.suffix):
+                candidates = [parser for parser in ranked if parser in extParsers]
+            else:
+                candidates = [parser for parser in ranked if cls._sniff(parser, head) > 0]
+            for parser in candidates:
+                file.seek(0)
+                try:
+                    return cls.fromStream(file, parser)
+                except NotImplementedError:  # parser cannot stream
+                    continue
+        raise ConfigError(f"No parser can stream {path}")
+
+    @classmethod
+    def fromStream(cls, file: IO, parser: Optional[ConfigFilePlugin] = None) -> BaseConfig:
+        """Parse a config from a file-like object one top-level section at a time
+
+        Each section is handed to its field's config manager as soon as it is
+        complete, so peak memory is bounded by the largest section rather than
+        the whole file. Sections without a matching field are discarded.
+
+        Args:
+            file (IO): Text, binary or memory-mapped file to read from
+            parser (ConfigFilePlugin, optional): Streaming parser to use. Defaults to JSONConfig.
+
+        Raises:
+            NotImplementedError: The parser does not support streaming
+            ConfigError: The file could not be parsed or a section is invalid, including
+                a section of a type its manager does not parse
+
+        Returns:
+            BaseConfig: Base config model
+        """
+        if parser is None:
+            from fold.plugins.config import JSONConfig
+
+            parser = JSONConfig
+
+        sections = parser.iterSections(file)
+        managers = {}
+        while True:
+            try:
+                key, content = next(sections)
+            except StopIteration:
+                break
+            except ValueError as e:
+                raise ConfigError(f"Failed to parse {getattr(file, 'name', file)}") from e
+
+            if (field := cls.__fields__.get(key)) is None:
+                continue
+            try:
+                managers[key] = cls._buildManager(field, content)
+            except (ValueError, TypeError, NotImplementedError) as e:
+                # a manager that cannot parse the section must not read as a parser that cannot stream
+                raise ConfigError(f"Invalid section {key}") from e
+            del content  # release the raw section before reading the next one
+        return cls(**managers)
+
+    def reload(self, content: Dict[str, Content]) -> ConfigDiff:
+        """Apply new content, rebuilding only the managers of sections that changed
+
+        Every changed section is parsed before any manager is constructed, and
+        every manager is constructed before any is swapped in. The swap is a single update of the model, so readers see either the old or
+        the new managers. Replaced managers are closed afterwards.
+
+        Args:
+            content (Dict[str, Content]): New config content
+
+        Raises:
+            ConfigError: A changed section is invalid, the config is left untouched
+
+        Returns:
+            ConfigDiff: Sections and paths that changed
+        """
+        with self._reloadLock:
+            fields = self.__fields__
+            content = {key: value for key, value in content.items() if key in fields}
+            # Sections built from prebuilt managers have no content and show up as added
+            diff = diffContent(self._content, content)
+
+            # Parse every changed section before constructing any manager, since
+            # constructing one may have side effects, e.g. replacing log handlers
+            lazy = getattr(self.__config__, "lazy", False)
+            parsed, errors = {}, {}
+            for key in diff.sections:
+                field = fields[key]
+                section = content.get(key, field.get_default())
+                try:
+                    parsed[key] = section if lazy else field.type_.parseConfig(section)
+                except Exception as e:
+                    errors[key] = e
+            if errors:
+                raise sectionsError("Failed to reload sections", errors)
+
+            managers = {}
+            for key, config in parsed.items():
+                manager = fields[key].type_
+                try:
+                    managers[key] = LazyManager(manager, config) if lazy else manager(config)
+                except Exception as e:
+                    errors[key] = e
+            if errors:
+                for manager in managers.values():
+                    manager.close()
+                raise sectionsError("Failed to reload sections", errors)
+
+            replaced = [self.__dict__[key] for key in managers]
+            self.__dict__.update(managers)
+            self._content = content
+
+        for manager in replaced:
+            manager.close()
+        return diff
+
+    def reloadPath(
+        self, path: Path, parsers: Optional[Iterable[ConfigFilePlugin]] = None
+    ) -> ConfigDiff:
+        """Parse a config file and reload the sections that changed
+
+        Args:
+            path (Path): Path to the config
+            parsers (Iterable[ConfigFile], None): File parsers to use, default to fold.config
+
+        Raises:
+            ConfigError: The file could not be parsed or a changed section is invalid
+
+        Returns:
+            ConfigDiff: Sections and paths that changed
+        """
+        result = self.parsePath(path, parsers)
+        diff = self.reload(result.content)
+        self._parseResult = result
+        return diff
@@ -0,0 +1,217 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+if TYPE_CHECKING:
+    from fold.plugins.config import ConfigFilePlugin
+    from .cache import ConfigCache
+    from .config import Content
+
+KeyPath = Tuple[str, ...]
+
+
+@dataclass
+class LayeredContent:
+    """Content merged from several config files
+
+    Attributes:
+        content (Dict[str, Content]): Merged content
+        files (List[Path]): Files in the order they were merged, lowest precedence first
+        sources (Dict[KeyPath, Path]): File each value was taken from, keyed by the path to the value
+    """
+
+    content: Dict[str, Content] = field(default_factory=dict)
+    files: List[Path] = field(default_factory=list)
+    sources: Dict[KeyPath, Path] = field(default_factory=dict)
+
+    def origin(self, *keys: str) -> Optional[Path]:
+        """Find the file a value came from
+
+        Args:
+            *keys (str): Path to the value, e.g. ("log", "sink")
+
+        Returns:
+            Optional[Path]: File that set the value, None if no file did
+        """
+        for end in range(len(keys), 0, -1):
+            if (source := self.sources.get(keys[:end])) is not None:
+                return source
+        return None
+
+
+def environmentOverlay(path: Path, environment: str) -> Path:
+    """Name the overlay of a config file for an environment, e.g. config.prod.toml
+
+    Args:
+        path (Path): Base config file
+        environment (str): Environment name
+
+    Returns:
+        Path: Overlay path, which may not exist
+    """
+    path = Path(path)
+    return path.with_name(f"{path.stem}.{environment}{path.suffix}")
+
+
+class ConfigLoader:
+    def __init__(
+        self,
+        parsers: Optional[Iterable[ConfigFilePlugin]] = None,
+        cache: Optional[ConfigCache] = None,
+        executor: Optional[Executor] = None,
+        includeKey: str = "include",
+    ) -> None:
+        """Load layered config files with include directives
+
+        Files are merged lowest precedence first: for every layer, the files it
+        includes (recursively, in listed order) come before the layer itself, and
+        later layers override earlier ones. Dictionaries are merged key by key,
+        any other value replaces the previous one. A file included several times
+        is read, parsed and merged only once, at its first position.
+
+        Args:
+            parsers (Iterable[ConfigFile], None): File parsers to use, default to fold.config
+            cache (ConfigCache, optional): Cache of parsed configs. Defaults to None.
+            executor (Executor, optional): Pool to read files on. Defaults to None, a thread pool per load.
+            includeKey (str, optional): Top-level key listing the files to include. Defaults to "include".
+        """
+        self.parsers = parsers
+        self.cache = cache
+        self.executor = executor
+        self.includeKey = includeKey
+
+    def _parse(self, path: Path) -> Dict[str, Content]:
+        from .config import BaseConfig
+
+        return BaseConfig.parsePath(path, self.parsers, self.cache).content
+
+    def _includes(self, path: Path, content: Dict[str, Content]) -> List[Path]:
+        from .config import ConfigError
+
+        includes = content.get(self.includeKey, [])
+        if isinstance(includes, str):
+            includes = [includes]
+        if not isinstance(includes, list) or not all(isinstance(i, str) for i in includes):
+            raise ConfigError(f"{self.includeKey} must be a path or a list of paths in {path}")
+        return [(path.parent / include).resolve() for include in includes]
+
+    def _read(self, paths: List[Path], executor: Executor) -> Dict[Path, Dict[str, Content]]:
+        """Parse every file and its includes, one level of includes at a time"""
+        from .config import ConfigError
+
+        futures: Dict[Path, Future] = {}
+        contents: Dict[Path, Dict[str, Content]] = {}
+        pending = list(dict.fromkeys(paths))
+        while pending:
+            for path in pending:
+                if path not in futures:
+                    futures[path] = executor.submit(self._parse, path)
+            included = []
+            for path in pending:
+                if path in contents:
+                    continue
+                try:
+                    contents[path] = futures[path].result()
+                except ConfigError:
+                    raise
+                except Exception as e:
+                    raise ConfigError(f"Failed to read {path}") from e
+                included += self._includes(path, contents[path])
+            pending = [path for path in dict.fromkeys(included) if path not in futures]
+        return contents
+
+    def load(self, *paths: Path | str) -> LayeredContent:
+        """Read, parse and merge config files
+
+        Args:
+            *paths (Path | str): Layers, lowest precedence first
+
+        Raises:
+            ConfigError: A file could not be parsed or includes itself
+
+        Returns:
+            LayeredContent: Merged content
+        """
+        from .config import ConfigError
+
+        paths = [Path(path).resolve() for path in paths]
+        if self.executor is None:
+            with ThreadPoolExecutor(thread_name_prefix="fold-config") as executor:
+                contents = self._read(paths, executor)
+        else:
+            contents = self._read(paths, self.executor)
+
+        # Includes first, then the file itself
+        layered = LayeredContent()
+        merged = set()
+
+        def visit(path: Path, chain: Tuple[Path, ...]):
+            if path in chain:
+                cycle = " -> ".join(str(p) for p in chain + (path,))
+                raise ConfigError(f"Circular include {cycle}")
+            if path in merged:
+                return
+            for include in self._includes(path, contents[path]):
+                visit(include, chain + (path,))
+            merged.add(path)
+            layered.files.append(path)
+            content = {k: v for k, v in contents[path].items() if k != self.includeKey}
+            mergeContent(layered.content, content, path, layered.sources)
+
+        for path in paths:
+            visit(path, ())
+        return layered
+
+
+def _copyTree(value: Content) -> Content:
+    # Dictionaries are merged into, so never share them between files
+    if isinstance(value, dict):
+        return {key: _copyTree(item) for key, item in value.items()}
+    return value
+
+
+def _leaves(value: Content, prefix: KeyPath) -> Iterable[KeyPath]:
+    if isinstance(value, dict) and value:
+        for key, item in value.items():
+            yield from _leaves(item, prefix + (key,))
+    else:
+        yield prefix
+
+
+def mergeContent(
+    target: Dict[str, Content],
+    source: Dict[str, Content],
+    path: Path,
+    sources: Dict[KeyPath, Path],
+    prefix: KeyPath = (),
+) -> None:
+    """Deep merge a file's content into the merged content
+
+    Args:
+        target (Dict[str, Content]): Merged content, updated in place
+        source (Dict[str, Content]): Content of the file
+        path (Path): File the content came from
+        sources (Dict[KeyPath, Path]): Origin of each value, updated in place
+        prefix (KeyPath, optional): Path of the contents. Defaults to ().
+    """
+    for key, value in source.items():
+        keys = prefix + (key,)
+        current = target.get(key)
+        if isinstance(value, dict) and isinstance(current, dict):
+            # an empty mapping is a leaf of its own until keys are merged into it
+            if value:
+                sources.pop(keys, None)
+            mergeContent(current, value, path, sources, keys)
+            continue
+
+        # Replacing a value forgets where it, or the values under it, came from
+        if isinstance(current, dict):
+            for stale in [k for k in sources if k[: len(keys)] == keys]:
+                del sources[stale]
+        else:
+            sources.pop(keys, None)
+        target[key] = _copyTree(value)
+        for leaf in _leaves(value, keys):
+            sources[leaf] = path
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar, FrozenSet
 from abc import ABC, abstractmethod
 
 from pydantic import BaseModel
@@ -9,6 +9,10 @@ if TYPE_CHECKING:
 
 
 class Plugin(ABC):
+    # Names of the plugins that must be constructed first. A plugin requiring others
+    # receives their instances as the dependencies keyword argument, {name: instance}.
+    REQUIRES: ClassVar[FrozenSet[str]] = frozenset()
+
     def __init__(self, config: BaseModel, *args, **kwargs) -> None:
         self.config = config
 
@@ -0,0 +1,270 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Condition, Event, Thread
+from weakref import WeakSet
+import os
+
+from fold.utils.imp import getResolver
+from fold.utils.plugin import PluginManager, ReloadReport
+
+if TYPE_CHECKING:
+    from .config import BaseConfig, ConfigManager, Content
+
+# Live config managers, candidates for swapping reloaded plugins
+_managers: WeakSet = WeakSet()
+
+
+@dataclass
+class ConfigDiff:
+    """Structural difference between two config contents
+
+    Attributes:
+        added (Set[str]): Top-level sections only in the new content
+        removed (Set[str]): Top-level sections only in the old content
+        changed (Set[str]): Top-level sections in both contents that differ
+        paths (List[Tuple[str | int, ...]]): Path to every value that differs
+    """
+
+    added: Set[str] = field(default_factory=set)
+    removed: Set[str] = field(default_factory=set)
+    changed: Set[str] = field(default_factory=set)
+    paths: List[Tuple[str | int, ...]] = field(default_factory=list)
+
+    @property
+    def sections(self) -> Set[str]:
+        """Every top-level section that differs"""
+        return self.added | self.removed | self.changed
+
+    def __bool__(self) -> bool:
+        return bool(self.sections)
+
+
+def diffPaths(
+    old: Content, new: Content, path: Tuple[str | int, ...] = ()
+) -> Iterator[Tuple[str | int, ...]]:
+    """Walk two contents and yield the path to every value that differs
+
+    Args:
+        old (Content): Old content
+        new (Content): New content
+        path (Tuple[str | int, ...], optional): Path of the contents. Defaults to ().
+
+    Yields:
+        Tuple[str | int, ...]: Path to a value that was added, removed or changed
+    """
+    # 1, 1.0 and True compare equal but do not validate the same
+    if type(old) is not type(new):
+        yield path
+    elif isinstance(old, dict):
+        for key in sorted(old.keys() | new.keys(), key=str):
+            if key in old and key in new:
+                yield from diffPaths(old[key], new[key], path + (key,))
+            else:
+                yield path + (key,)
+    elif isinstance(old, list):
+        for index, (a, b) in enumerate(zip(old, new)):
+            yield from diffPaths(a, b, path + (index,))
+        for index in range(min(len(old), len(new)), max(len(old), len(new))):
+            yield path + (index,)
+    elif old != new:
+        yield path
+
+
+def diffContent(
+    old: Optional[Dict[str, Content]], new: Dict[str, Content]
+) -> ConfigDiff:
+    """Compare two config contents section by section
+
+    Args:
+        old (Dict[str, Content], None): Old content, None if unknown in which case every section changed
+        new (Dict[str, Content]): New content
+
+    Returns:
+        ConfigDiff: Difference between the contents
+    """
+    if old is None:
+        return ConfigDiff(changed=set(new), paths=[(key,) for key in sorted(new)])
+
+    diff = ConfigDiff(added=new.keys() - old.keys(), removed=old.keys() - new.keys())
+    diff.paths = list(diffPaths(old, new))
+    diff.changed = {path[0] for path in diff.paths} - diff.added - diff.removed
+    return diff
+
+
+class ConfigWatcher:
+    def __init__(
+        self,
+        config: BaseConfig,
+        path: Path | str,
+        interval: float = 1.0,
+        onReload: Optional[Callable[[ConfigDiff], None]] = None,
+        onError: Optional[Callable[[Exception], None]] = None,
+    ) -> None:
+        """Poll a config file and reload the config whenever the file changes
+
+        Args:
+            config (BaseConfig): Config to reload
+            path (Path | str): Path to the config file
+            interval (float, optional): Seconds between polls. Defaults to 1.0.
+            onReload (Callable[[ConfigDiff], None], optional): Called after a reload that changed sections. Defaults to None.
+            onError (Callable[[Exception], None], optional): Called when a reload fails, the old config is kept. Defaults to None.
+        """
+        self.config = config
+        self.path = Path(path)
+        self.interval = interval
+        self.onReload = onReload
+        self.onError = onError
+        self._stamp = self._stat()
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    def __enter__(self) -> ConfigWatcher:
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def poll(self) -> Optional[ConfigDiff]:
+        """Reload the config if the file changed since the last poll
+
+        Returns:
+            Optional[ConfigDiff]: Difference applied, None if the file did not change or the reload failed
+        """
+        stamp = self._stat()
+        if stamp is None or stamp == self._stamp:
+            return None
+        self._stamp = stamp
+
+        try:
+            diff = self.config.reloadPath(self.path)
+        except Exception as e:
+            if self.onError is not None:
+                self.onError(e)
+            return None
+        if diff and self.onReload is not None:
+            self.onReload(diff)
+        return diff
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def start(self) -> None:
+        """Start polling in a daemon thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="fold-config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+
+class CallGate:
+    def __init__(self) -> None:
+        """Track calls in flight so that a swap can wait for them to finish
+
+        While a drain is in progress, new calls wait until it is over.
+        """
+        self._condition = Condition()
+        self._active = 0
+        self._draining = False
+
+    @contextmanager
+    def call(self) -> Iterator[None]:
+        """Context of one call"""
+        with self._condition:
+            while self._draining:
+                self._condition.wait()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                if not self._active:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def drain(self, timeout: Optional[float] = None) -> Iterator[None]:
+        """Hold new calls back and wait for the calls in flight to finish
+
+        Args:
+            timeout (float, optional): Seconds to wait for the calls in flight. Defaults to None, forever.
+
+        Raises:
+            TimeoutError: Calls still in flight after the timeout
+        """
+        with self._condition:
+            while self._draining:
+                self._condition.wait()
+            self._draining = True
+            try:
+                if not self._condition.wait_for(lambda: not self._active, timeout):
+                    raise TimeoutError("Calls still in flight")
+            except BaseException:
+                self._draining = False
+                self._condition.notify_all()
+                raise
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._draining = False
+                self._condition.notify_all()
+
+
+def trackManager(manager: ConfigManager) -> None:
+    """Register a config manager so that reloadPlugins can swap its plugins"""
+    _managers.add(manager)
+
+
+def reloadPlugins(
+    modules: Optional[Iterable[str]] = None, plugins: Optional[PluginManager] = None
+) -> ReloadReport:
+    """Import changed plugin modules again and swap the plugins of every live config manager
+
+    Each manager drains the calls in flight on its old plugin instances before
+    swapping them for instances of the new plugins. Objects of the reloaded
+    modules are dropped from the shared import resolver.
+
+    Args:
+        modules (Iterable[str], optional): Absolute names of the modules to reload. Defaults to None, the cached modules whose file changed.
+        plugins (PluginManager, optional): Manager whose importer cache is reloaded. Defaults to None, the shared cache.
+
+    Returns:
+        ReloadReport: Modules reloaded, plugins replaced and the managers affected
+    """
+    if plugins is None:
+        from .plugin import Plugin
+
+        plugins = PluginManager(Plugin)
+    report = plugins.reload(modules)
+    # import strings resolved before the reload would still give the old objects
+    getResolver().invalidate(report.modules)
+    if not report.plugins:
+        return report
+    for manager in list(_managers):
+        try:
+            if manager.swapPlugins(report.plugins):
+                report.managers.append(manager)
+        except Exception as e:
+            report.failed.append((manager, e))
+    return report
@@ -1 +1,4 @@
 from .common import ConfigFilePlugin
+from .json import JSONConfig
+from .toml import TOMLConfig
+from .registry import ParserRegistry
@@ -1,4 +1,4 @@
-from typing import Dict, Iterable
+from typing import IO, Dict, Iterable, Iterator, Tuple
 from abc import abstractmethod
 
 from fold.core import Plugin, Content
@@ -11,3 +11,30 @@ class ConfigFilePlugin(Plugin):
     @abstractmethod
     def fromText(cls, text: str) -> Dict[str, Content]:
         pass
+
+    @classmethod
+    def sniff(cls, head: str) -> float:
+        """Score how likely a text is in this parser's format without parsing it
+
+        Args:
+            head (str): The first few kilobytes of the text
+
+        Returns:
+            float: Confidence between 0 (no opinion) and 1 (certain)
+        """
+        return 0.0
+
+    @classmethod
+    def iterSections(cls, file: IO) -> Iterator[Tuple[str, Content]]:
+        """Incrementally parse the top-level sections of a config file
+
+        Args:
+            file (IO): File-like object to read from
+
+        Raises:
+            NotImplementedError: The format does not support streaming
+
+        Yields:
+            Tuple[str, Content]: (key, content) of each top-level section once it is complete
+        """
+        raise NotImplementedError(f"{cls.__name__} does not support streaming")
@@ -1,9 +1,97 @@
-from typing import Dict
+from typing import IO, Dict, Iterator, Tuple
+import codecs
 import json
+import re
 
 from fold.core import Content
 from .common import ConfigFilePlugin
 
+CHUNK_SIZE = 1 << 16
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class JSONSectionReader:
+    def __init__(self, file: IO, chunkSize: int = CHUNK_SIZE) -> None:
+        """Incrementally decode the top-level members of a JSON object
+
+        Only the member being decoded is held in memory. The buffer grows
+        geometrically while a member is incomplete, so each byte is decoded a
+        bounded number of times.
+
+        Args:
+            file (IO): Text or binary file-like object, including memory-mapped files
+            chunkSize (int, optional): Minimum number of characters read at once. Defaults to CHUNK_SIZE.
+        """
+        self._file = file
+        self._chunkSize = chunkSize
+        self._decoder = json.JSONDecoder()
+        self._bytes = codecs.getincrementaldecoder("utf-8-sig")()
+        self._text = ""
+        self._pos = 0
+        self._eof = False
+
+    def _read(self, size: int) -> None:
+        chunk = self._file.read(size)
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = self._bytes.decode(chunk, final=not chunk)
+        if not chunk:
+            self._eof = True
+        # drop everything that was already consumed
+        self._text = self._text[self._pos :] + chunk
+        self._pos = 0
+
+    def _grow(self) -> None:
+        self._read(max(self._chunkSize, len(self._text) - self._pos))
+
+    def _peek(self) -> str:
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            self._pos = WHITESPACE.match(self._text, self._pos).end()
+            if self._pos < len(self._text):
+                return self._text[self._pos]
+            if self._eof:
+                return ""
+            self._grow()
+
+    def _expect(self, chars: str) -> str:
+        char = self._peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(
+                f"Expecting one of {chars!r}", self._text, self._pos
+            )
+        self._pos += 1
+        return char
+
+    def _value(self) -> Content:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._text, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._grow()
+                continue
+            # a number at the end of the buffer may continue in the next chunk
+            if end == len(self._text) and not self._eof:
+                self._grow()
+                continue
+            self._pos = end
+            return value
+
+    def __iter__(self) -> Iterator[Tuple[str, Content]]:
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            if self._peek() != '"':
+                raise json.JSONDecodeError("Expecting property name", self._text, self._pos)
+            key = self._value()
+            self._expect(":")
+            yield key, self._value()
+            if self._expect(",}") == "}":
+                return
+
 
 class JSONConfig(ConfigFilePlugin):
     EXTENSIONS = {"json"}
@@ -11,3 +99,18 @@ class JSONConfig(ConfigFilePlugin):
     @classmethod
     def fromText(cls, text: str) -> Dict[str, Content]:
         return json.loads(text)
+
+    @classmethod
+    def iterSections(
+        cls, file: IO, chunkSize: int = CHUNK_SIZE
+    ) -> Iterator[Tuple[str, Content]]:
+        return iter(JSONSectionReader(file, chunkSize))
+
+    @classmethod
+    def sniff(cls, head: str) -> float:
+        head = head.lstrip("\ufeff \t\r\n")
+        if head.startswith("{"):
+            return 1.0
+        if head.startswith("["):  # could also be a TOML table header
+            return 0.25
+        return 0.0
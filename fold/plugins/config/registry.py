@@ -0,0 +1,65 @@
+from __future__ import annotations
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from fold.utils.plugin import PluginRegistry
+from fold.utils.pluginIndex import PluginIndex
+from .common import ConfigFilePlugin
+
+
+def normalizeExtension(ext: str) -> str:
+    """Lower case an extension and strip the leading dot"""
+    return ext.lower().lstrip(".")
+
+
+class ParserRegistry(PluginRegistry):
+    def __init__(
+        self,
+        plugins: Iterable[ConfigFilePlugin] = (),
+        modules: Iterable[str] = (),
+        lazy: bool = False,
+        index: Optional[PluginIndex] = None,
+    ) -> None:
+        """Memoized config file parsers with an extension index
+
+        Args:
+            plugins (Iterable[ConfigFilePlugin], optional): Parsers to register. Defaults to ().
+            modules (Iterable[str], optional): Modules to discover parsers in. Defaults to ().
+            lazy (bool, optional): Import a discovered parser only once it is used. Defaults to False.
+            index (PluginIndex, optional): Index lazy discovery reads, e.g. one loaded from disk. Defaults to the shared index.
+        """
+        self._extensions: Dict[str, FrozenSet[ConfigFilePlugin]] = {}
+        self._ordered: Tuple[ConfigFilePlugin, ...] = ()
+        super().__init__(ConfigFilePlugin, modules, plugins, lazy, index)
+
+    def _index(self, plugins: FrozenSet[ConfigFilePlugin]) -> None:
+        super()._index(plugins)
+        extensions: Dict[str, set] = {}
+        for parser in plugins:
+            for ext in parser.EXTENSIONS:
+                extensions.setdefault(normalizeExtension(ext), set()).add(parser)
+        self._extensions = {ext: frozenset(parsers) for ext, parsers in extensions.items()}
+        self._ordered = tuple(sorted(plugins, key=lambda parser: parser.__name__))
+
+    @property
+    def ordered(self) -> Tuple[ConfigFilePlugin, ...]:
+        """Parsers sorted by name
+
+        Returns:
+            Tuple[ConfigFilePlugin, ...]: Parsers
+        """
+        self.plugins  # rebuild if needed
+        return self._ordered
+
+    def byExtension(self, ext: Optional[str]) -> FrozenSet[ConfigFilePlugin]:
+        """Look up the parsers of a file extension
+
+        Args:
+            ext (str, None): Extension with or without the leading dot
+
+        Returns:
+            FrozenSet[ConfigFilePlugin]: Parsers declaring the extension
+        """
+        self.plugins  # rebuild if needed
+        if not ext:
+            return frozenset()
+        return self._extensions.get(normalizeExtension(ext), frozenset())
@@ -1,10 +1,15 @@
 from typing import Dict
+import re
 
 import toml
 
 from fold.core import Content
 from .common import ConfigFilePlugin
 
+# Structure markers that only appear at the start of a TOML line
+KEY_PATTERN = re.compile(r"""^[\w\-."' ]+=""")
+TABLE_PATTERN = re.compile(r"""^\[\[?[\w\-."' ]+\]\]?\s*(#.*)?$""")
+
 
 class TOMLConfig(ConfigFilePlugin):
     EXTENSIONS = {"toml"}
@@ -12,3 +17,15 @@ class TOMLConfig(ConfigFilePlugin):
     @classmethod
     def fromText(cls, text: str) -> Dict[str, Content]:
         return toml.loads(text)
+
+    @classmethod
+    def sniff(cls, head: str) -> float:
+        # Inspect the first line that is not blank or a comment
+        for line in head.lstrip("\ufeff").splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if TABLE_PATTERN.match(line) or KEY_PATTERN.match(line):
+                return 0.9
+            return 0.0
+        return 0.5  # empty documents are valid TOML
@@ -1 +1,5 @@
 from .logger import LogHandlerConfig, LogManager, logger
+from .sinks import AsyncSink, AsyncSinkConfig, FileSink, FileSinkConfig, SinkStats
+from .binary import BinaryRecord, BinarySink, BinarySinkConfig, readRecords
+from .filters import FilterRule, FilterSpec, compileFilter
+from .collector import CollectorClient, CollectorSinkConfig, LogCollector
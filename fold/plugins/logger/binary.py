@@ -0,0 +1,319 @@
+"""Compact binary log format
+
+A file starts with MAGIC and is followed by frames, each made of a kind byte,
+the payload length as a little-endian uint32, and the payload:
+
+- STRING: utf-8 text of the next interned string, whose ids count up from 0
+- RECORD: time (float64, epoch seconds), level number (uint16), then the ids of
+  the level name, logger name, function and file (uint32 each), the line
+  (uint32), and the message, exception and extra (JSON) as uint32 length-prefixed
+  utf-8, empty when absent
+- RESET: forget the interned strings, written when a writer appends to a file
+
+Time and level come first in a record, so readers filter records without
+decoding the rest of them.
+"""
+from __future__ import annotations
+from typing import IO, Any, Dict, Iterator, List, Optional
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import Lock
+import argparse
+import json
+import struct
+import sys
+import traceback
+
+from pydantic import BaseModel, PositiveFloat, PositiveInt
+
+from .sinks import PeriodicFlush
+
+MAGIC = b"FOLDLOG\x01"
+STRING, RECORD, RESET = 0, 1, 2
+
+FRAME = struct.Struct("<BI")
+RECORD_HEAD = struct.Struct("<dHIIIII")
+FILTER_HEAD = struct.Struct("<dH")
+LENGTH = struct.Struct("<I")
+
+
+class BinarySinkConfig(BaseModel):
+    path: Path
+    # Bytes buffered before writing to disk
+    buffer_size: PositiveInt = 1 << 20
+    # Seconds between flushes of the buffer, so that readers see recent records
+    flush_interval: PositiveFloat = 1.0
+
+    class Config:
+        extra = "forbid"
+
+
+@dataclass
+class BinaryRecord:
+    """Log record read from a binary log
+
+    Attributes:
+        time (float): Epoch seconds
+        level (int): Level number
+        levelName (str): Level name
+        name (str): Logger name, usually the module
+        function (str): Function that logged
+        file (str): Path of the file that logged
+        line (int): Line that logged
+        message (str): Formatted message
+        exception (str, optional): Formatted exception, if any
+        extra (Dict[str, Any]): Bound extra values
+    """
+
+    time: float
+    level: int
+    levelName: str
+    name: str
+    function: str
+    file: str
+    line: int
+    message: str
+    exception: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+class BinaryEncoder:
+    def __init__(self) -> None:
+        """Encode loguru records into frames, interning repeated strings
+
+        An encoder writes the strings it interns the first time they appear, so its
+        output must be read from the start, or after a RESET frame.
+        """
+        self._strings: Dict[str, int] = {}
+
+    def _intern(self, text: str, frames: List[bytes]) -> int:
+        if (index := self._strings.get(text)) is None:
+            index = self._strings[text] = len(self._strings)
+            data = text.encode()
+            frames.append(FRAME.pack(STRING, len(data)))
+            frames.append(data)
+        return index
+
+    def encode(self, record: Dict[str, Any]) -> bytes:
+        """Encode a record, preceded by the strings it interns
+
+        Args:
+            record (Dict[str, Any]): Loguru record
+
+        Returns:
+            bytes: Frames
+        """
+        exception = record["exception"]
+        exceptionText = "".join(traceback.format_exception(*exception)) if exception else ""
+        extra = json.dumps(record["extra"], default=str) if record["extra"] else ""
+        variable = b"".join(
+            LENGTH.pack(len(data)) + data
+            for data in (record["message"].encode(), exceptionText.encode(), extra.encode())
+        )
+        frames: List[bytes] = []
+        head = RECORD_HEAD.pack(
+            record["time"].timestamp(),
+            record["level"].no,
+            self._intern(record["level"].name, frames),
+            self._intern(record["name"] or "", frames),
+            self._intern(record["function"], frames),
+            self._intern(record["file"].path, frames),
+            record["line"],
+        )
+        frames.append(FRAME.pack(RECORD, len(head) + len(variable)))
+        frames.append(head)
+        frames.append(variable)
+        return b"".join(frames)
+
+
+class BinarySink:
+    def __init__(self, config: BinarySinkConfig) -> None:
+        """Loguru sink writing records in the binary log format
+
+        Records are buffered and the buffer is flushed every flush_interval by a
+        background thread, between frames. A full buffer may still be written in
+        the middle of a frame, which readers treat as the end of the log. A sink
+        appending to such a log first truncates it to its last complete frame.
+
+        Args:
+            config (BinarySinkConfig): File options
+        """
+        self.config = config
+        self._lock = Lock()
+        self._encoder = BinaryEncoder()
+        path = Path(config.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            # drop the partial frame of a writer that did not stop, readers would run into it
+            with open(path, "r+b") as file:
+                file.truncate(_completeLength(file))
+        self._file = open(path, "ab", buffering=config.buffer_size)
+        if self._file.tell():
+            self._file.write(FRAME.pack(RESET, 0))
+        else:
+            self._file.write(MAGIC)
+        self._flusher = PeriodicFlush(self.sync, config.flush_interval, "fold-log-binary-flush")
+
+    def write(self, message: Any) -> None:
+        with self._lock:
+            self._file.write(self._encoder.encode(message.record))
+
+    def sync(self) -> None:
+        """Write the buffer to disk"""
+        with self._lock:
+            self._file.flush()
+
+    def stop(self) -> None:
+        """Close the file, called by loguru when the handler is removed"""
+        self._flusher.stop()
+        with self._lock:
+            self._file.close()
+
+
+def _completeLength(file: IO[bytes]) -> int:
+    # length of a log up to its last complete frame, 0 if it ends within MAGIC
+    size = file.seek(0, 2)
+    file.seek(0)
+    if (magic := file.read(len(MAGIC))) != MAGIC:
+        if MAGIC.startswith(magic):
+            return 0
+        raise ValueError("Not a fold binary log")
+    end = len(MAGIC)
+    while len(header := file.read(FRAME.size)) == FRAME.size:
+        _, length = FRAME.unpack(header)
+        if end + FRAME.size + length > size:
+            break
+        end += FRAME.size + length
+        file.seek(end)
+    return end
+
+
+def readRecords(
+    file: IO[bytes],
+    level: Optional[int] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+) -> Iterator[BinaryRecord]:
+    """Stream the records of a binary log, skipping filtered records undecoded
+
+    Args:
+        file (IO[bytes]): Binary log opened in binary mode
+        level (int, optional): Minimum level number. Defaults to None, every level.
+        since (float, optional): Earliest epoch time, inclusive. Defaults to None.
+        until (float, optional): Latest epoch time, exclusive. Defaults to None.
+
+    A log that ends in the middle of a frame, whose writer did not stop or is
+    still writing, ends after its last complete frame.
+
+    Raises:
+        ValueError: Not a binary log, or the log is corrupt
+
+    Yields:
+        BinaryRecord: Matching records, in file order
+    """
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a fold binary log")
+    strings: List[str] = []
+    while header := file.read(FRAME.size):
+        if len(header) < FRAME.size:
+            return  # truncated by a writer that did not stop
+        kind, length = FRAME.unpack(header)
+        if kind == RECORD:
+            if length < RECORD_HEAD.size + 3 * LENGTH.size:
+                raise ValueError(f"Record frame of {length} bytes is too short")
+            if len(head := file.read(FILTER_HEAD.size)) < FILTER_HEAD.size:
+                return
+            time, number = FILTER_HEAD.unpack(head)
+            if (
+                (level is not None and number < level)
+                or (since is not None and time < since)
+                or (until is not None and time >= until)
+            ):
+                file.seek(length - FILTER_HEAD.size, 1)
+                continue
+            if len(payload := file.read(length - FILTER_HEAD.size)) < length - FILTER_HEAD.size:
+                return
+            yield _decode(time, number, payload, strings)
+        elif kind == STRING:
+            if len(data := file.read(length)) < length:
+                return
+            strings.append(data.decode())
+        elif kind == RESET:
+            strings = []
+        else:
+            raise ValueError(f"Unknown frame kind {kind}")
+
+
+def _decode(time: float, level: int, payload: bytes, strings: List[str]) -> BinaryRecord:
+    try:
+        return _decodeRecord(time, level, payload, strings)
+    except (struct.error, IndexError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Corrupt record: {e}") from e
+
+
+def _decodeRecord(time: float, level: int, payload: bytes, strings: List[str]) -> BinaryRecord:
+    offset = RECORD_HEAD.size - FILTER_HEAD.size
+    levelName, name, function, file, line = struct.unpack_from("<IIIII", payload)
+    texts = []
+    for _ in range(3):
+        (length,) = LENGTH.unpack_from(payload, offset)
+        offset += LENGTH.size
+        if offset + length > len(payload):
+            raise ValueError("Text runs past the end of the record")
+        texts.append(payload[offset : offset + length].decode())
+        offset += length
+    message, exception, extra = texts
+    return BinaryRecord(
+        time,
+        level,
+        strings[levelName],
+        strings[name],
+        strings[function],
+        strings[file],
+        line,
+        message,
+        exception or None,
+        json.loads(extra) if extra else {},
+    )
+
+
+def convert(source: IO[bytes], target: IO[str], **filters) -> int:
+    """Convert a binary log to JSON lines
+
+    Args:
+        source (IO[bytes]): Binary log opened in binary mode
+        target (IO[str]): Text file receiving one JSON object per record
+        **filters: level, since and until, as for readRecords
+
+    Returns:
+        int: Number of records written
+    """
+    count = 0
+    for record in readRecords(source, **filters):
+        data = asdict(record)
+        data["time"] = datetime.fromtimestamp(record.time, timezone.utc).isoformat()
+        target.write(json.dumps(data) + "\n")
+        count += 1
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Convert a fold binary log to JSON lines")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--level", type=int, help="minimum level number")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="earliest ISO time")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="latest ISO time")
+    args = parser.parse_args(argv)
+    with open(args.path, "rb") as source:
+        convert(
+            source,
+            sys.stdout,
+            level=args.level,
+            since=args.since and args.since.timestamp(),
+            until=args.until and args.until.timestamp(),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Aggregate the logs of several processes in one collector process
+
+The collector owns the real sinks and listens on a Unix domain socket. Other
+processes log through a batching client sink that streams records to it in the
+binary log format, see fold.plugins.logger.binary. Starting a collector exports
+its socket path in the FOLD_LOG_COLLECTOR environment variable, so that
+LogManager in child processes logs through the collector instead of its own sinks.
+"""
+from __future__ import annotations
+from typing import Any, List, Optional
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import Lock, Thread
+from time import monotonic
+import os
+import socket
+import socketserver
+import struct
+
+from loguru import logger
+from pydantic import PositiveFloat, PositiveInt
+
+from .binary import MAGIC, BinaryEncoder, BinaryRecord, readRecords
+from .sinks import AsyncSink, AsyncSinkConfig
+
+COLLECTOR_ENV = "FOLD_LOG_COLLECTOR"
+
+# Collectors running in this process
+_collectors: List[LogCollector] = []
+
+
+class CollectorSinkConfig(AsyncSinkConfig):
+    path: Path
+    # Records kept while the collector is unreachable, the oldest are dropped beyond
+    buffer_size: PositiveInt = 100000
+    # Seconds between connection attempts
+    reconnect_interval: PositiveFloat = 1.0
+    flush_interval: PositiveFloat = 0.1
+
+
+def collectorPath() -> Optional[str]:
+    """Socket of the collector this process should log through
+
+    Returns:
+        Optional[str]: Socket path, None if there is no collector or this process runs it
+    """
+    path = os.environ.get(COLLECTOR_ENV)
+    if not path or any(c.pid == os.getpid() and str(c.path) == path for c in _collectors):
+        return None
+    return path
+
+
+class CollectorClient:
+    def __init__(self, config: CollectorSinkConfig) -> None:
+        """Send batches of records to a collector, buffering them while it is unreachable
+
+        Delivery is at least once: a batch interrupted by a disconnection is sent
+        again, in full, after reconnecting. Buffered records are retried with the
+        next batch and when the sink stops.
+
+        Args:
+            config (CollectorSinkConfig): Collector socket and buffering options
+        """
+        self.config = config
+        self.dropped = 0
+        self._pending: deque = deque()
+        self._socket: Optional[socket.socket] = None
+        self._encoder: Optional[BinaryEncoder] = None
+        self._retryAt = 0.0
+        self._lock = Lock()
+
+    def _connect(self) -> bool:
+        if self._socket is not None:
+            return True
+        if monotonic() < self._retryAt:
+            return False
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(str(self.config.path))
+            connection.sendall(MAGIC)
+        except OSError:
+            connection.close()
+            self._retryAt = monotonic() + self.config.reconnect_interval
+            return False
+        # string ids are per connection
+        self._socket, self._encoder = connection, BinaryEncoder()
+        return True
+
+    def _disconnect(self) -> None:
+        self._socket.close()
+        self._socket = self._encoder = None
+        self._retryAt = monotonic() + self.config.reconnect_interval
+
+    def _send(self) -> None:
+        if not self._pending or not self._connect():
+            return
+        payload = b"".join(self._encoder.encode(record) for record in self._pending)
+        try:
+            self._socket.sendall(payload)
+        except OSError:
+            self._disconnect()
+            return
+        self._pending.clear()
+
+    def writeBatch(self, messages: List[Any]) -> None:
+        """Queue a batch of loguru messages and send every pending record
+
+        Args:
+            messages (List[Any]): Messages, carrying their record
+        """
+        with self._lock:
+            for message in messages:
+                if len(self._pending) >= self.config.buffer_size:
+                    self._pending.popleft()
+                    self.dropped += 1
+                self._pending.append(message.record)
+            self._send()
+
+    def stop(self) -> None:
+        """Send what is pending, if the collector is reachable, and disconnect"""
+        with self._lock:
+            self._retryAt = 0.0
+            self._send()
+            if self._socket is not None:
+                self._socket.close()
+                self._socket = None
+
+
+def collectorSink(config: CollectorSinkConfig) -> AsyncSink:
+    """Client sink batching records to a collector on a background thread"""
+    return AsyncSink(CollectorClient(config), config)
+
+
+class _ConnectionHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            for record in readRecords(self.rfile):
+                self.server.collector.emit(record)
+        except (ValueError, struct.error, OSError):
+            pass  # garbage or a client that died mid-record, drop the connection
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class LogCollector:
+    def __init__(self, path: Path | str, export: bool = True) -> None:
+        """Receive records from client processes and log them to the sinks of this process
+
+        Records keep the time, level, logger name, function, line and extra of the
+        process that logged them. Records of one client stay in order.
+
+        Args:
+            path (Path | str): Unix socket to listen on
+            export (bool, optional): Set FOLD_LOG_COLLECTOR for child processes while running. Defaults to True.
+        """
+        self.path = Path(path)
+        self.export = export
+        self.pid: Optional[int] = None
+        self._server: Optional[_Server] = None
+        self._thread: Optional[Thread] = None
+
+    def __enter__(self) -> LogCollector:
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def emit(self, record: BinaryRecord) -> None:
+        """Log a received record to the sinks of this process"""
+
+        def restore(patched: dict) -> None:
+            patched["time"] = datetime.fromtimestamp(record.time, timezone.utc).astimezone()
+            patched["name"] = record.name
+            patched["function"] = record.function
+            patched["line"] = record.line
+            patched["extra"].update(record.extra)
+
+        message = record.message
+        if record.exception:
+            message = f"{message}\n{record.exception.rstrip()}"
+        try:
+            logger.level(record.levelName)
+            level = record.levelName
+        except ValueError:  # level only registered in the client
+            level = record.level
+        logger.patch(restore).log(level, message)
+
+    def start(self) -> None:
+        """Listen in a daemon thread"""
+        if self._server is not None:
+            return
+        self.path.unlink(missing_ok=True)  # left behind by a collector that crashed
+        self._server = _Server(str(self.path), _ConnectionHandler)
+        self._server.collector = self
+        self._thread = Thread(target=self._server.serve_forever, name="fold-log-collector", daemon=True)
+        self._thread.start()
+        self.pid = os.getpid()
+        _collectors.append(self)
+        if self.export:
+            os.environ[COLLECTOR_ENV] = str(self.path)
+
+    def stop(self) -> None:
+        """Stop listening"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = self._thread = None
+        _collectors.remove(self)
+        self.path.unlink(missing_ok=True)
+        if self.export and os.environ.get(COLLECTOR_ENV) == str(self.path):
+            del os.environ[COLLECTOR_ENV]
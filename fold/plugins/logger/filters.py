@@ -0,0 +1,149 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional
+from collections import OrderedDict
+from itertools import count
+from threading import Lock
+from time import monotonic
+
+from loguru import logger
+from pydantic import BaseModel, PositiveFloat, PositiveInt
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+# Distinct messages remembered per rule for deduplication
+DEDUP_SIZE = 1024
+
+
+class FilterRule(BaseModel):
+    enabled: bool = True
+    # Minimum level, as a number or a level name
+    level: Optional[int | str] = None
+    # Token bucket: records per second, and records allowed at once (defaults to the rate, at least 1)
+    rate: Optional[PositiveFloat] = None
+    burst: Optional[PositiveInt] = None
+    # Keep 1 in sample records
+    sample: Optional[PositiveInt] = None
+    # Seconds during which repeats of a message are dropped
+    dedup: Optional[PositiveFloat] = None
+
+    class Config:
+        extra = "forbid"
+
+
+class FilterSpec(FilterRule):
+    # Rules of module prefixes, e.g. "urllib3" or "app.db". The rule of the longest
+    # matching prefix replaces the top-level rule for the records of a module.
+    modules: Dict[str, FilterRule] = {}
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int) -> None:
+        """Allow rate events per second on average and up to burst at once
+
+        Args:
+            rate (float): Tokens added per second
+            burst (int): Maximum number of tokens
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = monotonic()
+        self._lock = Lock()
+
+    def take(self) -> bool:
+        """Take a token if one is available"""
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+def _dedup(window: float) -> Predicate:
+    seen: OrderedDict = OrderedDict()
+    lock = Lock()
+
+    def check(record: Dict[str, Any]) -> bool:
+        key = (record["name"], record["message"])
+        now = monotonic()
+        with lock:
+            first = seen.get(key)
+            if first is not None and now - first < window:
+                return False
+            seen[key] = now
+            seen.move_to_end(key)
+            if len(seen) > DEDUP_SIZE:
+                seen.popitem(last=False)
+            return True
+
+    return check
+
+
+def compileRule(rule: FilterRule) -> Predicate:
+    """Compile a rule into a predicate running only the checks it configures
+
+    Args:
+        rule (FilterRule): Rule to compile
+
+    Returns:
+        Predicate: Function of a loguru record, True to keep the record
+    """
+    if not rule.enabled:
+        return lambda record: False
+
+    checks: List[Predicate] = []
+    if rule.level is not None:
+        level = rule.level if isinstance(rule.level, int) else logger.level(rule.level).no
+        checks.append(lambda record: record["level"].no >= level)
+    if rule.dedup is not None:
+        checks.append(_dedup(rule.dedup))
+    if rule.sample is not None:
+        counter, every = count(), rule.sample
+        checks.append(lambda record: not next(counter) % every)
+    # rate limit last, so that only records kept by the other checks use tokens
+    if rule.rate is not None:
+        bucket = TokenBucket(rule.rate, rule.burst or max(1, int(rule.rate)))
+        checks.append(lambda record: bucket.take())
+
+    if not checks:
+        return lambda record: True
+    if len(checks) == 1:
+        return checks[0]
+    return lambda record: all(check(record) for check in checks)
+
+
+def compileFilter(spec: FilterSpec) -> Predicate:
+    """Compile a filter spec into a single loguru filter
+
+    The rule of a module is found once and memoized, so each record costs a dict
+    lookup and the checks of its rule.
+
+    Args:
+        spec (FilterSpec): Filter spec
+
+    Returns:
+        Predicate: Function of a loguru record, True to keep the record
+    """
+    default = compileRule(spec)
+    rules = {prefix: compileRule(rule) for prefix, rule in spec.modules.items()}
+    if not rules:
+        return default
+    resolved: Dict[Optional[str], Predicate] = {}
+
+    def find(name: Optional[str]) -> Predicate:
+        parts = (name or "").split(".")
+        for end in range(len(parts), 0, -1):
+            if (rule := rules.get(".".join(parts[:end]))) is not None:
+                return rule
+        return default
+
+    def predicate(record: Dict[str, Any]) -> bool:
+        name = record["name"]
+        if (rule := resolved.get(name)) is None:
+            rule = resolved[name] = find(name)
+        return rule(record)
+
+    return predicate
@@ -1,11 +1,19 @@
 from __future__ import annotations
+import asyncio
+import hashlib
 import sys
+from dataclasses import dataclass
+from threading import RLock
 from typing import (
+    Any,
     Iterable,
+    List,
     Optional,
     Callable,
     Coroutine,
-    Dict
+    Dict,
+    Protocol,
+    runtime_checkable,
 )
 from logging import Handler
 from pathlib import Path
@@ -14,10 +22,41 @@ from pydantic import BaseModel, root_validator, validator, Field
 from loguru import logger
 
 from fold.core import ConfigManager, Content
-from fold.utils.imp import importFromString
+from fold.utils.imp import getResolver
+
+from .binary import BinarySink, BinarySinkConfig
+from .collector import CollectorSinkConfig, collectorPath, collectorSink
+from .filters import FilterSpec, compileFilter
+from .sinks import AsyncSink, AsyncSinkConfig, FileSink, FileSinkConfig
+
+CUSTOM_FIELDS = ["sink", "format", "filter"]
+# Sinks implemented by fold, configured by the <sink>_sink field
+FOLD_SINKS = {"file": FileSink, "binary": BinarySink, "collector": collectorSink}
+
+
+@dataclass
+class _Handler:
+    id: int
+    # Config kept so that the objects it refers to keep their id
+    config: LogHandlerConfig
+    sink: Optional[AsyncSink] = None
+
+
+# loguru handlers added by LogManager, by config key, shared since the logger is global
+_handlers: Dict[str, List[_Handler]] = {}
+_handlersLock = RLock()
+
+
+@runtime_checkable
+class Writable(Protocol):
+    """File-like sink"""
+
+    def write(self, message: str) -> Any:
+        ...
+
 
 class LogHandlerConfig(BaseModel):
-    sink: str | Path | Callable | Coroutine | Handler
+    sink: str | Path | Callable | Coroutine | Handler | Writable
     level: Optional[int | str]
     format: Optional[str | Callable]
     filter: Optional[str | dict | Callable]
@@ -38,6 +77,19 @@ class LogHandlerConfig(BaseModel):
     custom_filter: Optional[str] = Field(
         default=None, exclude=True
     )  # required if filter == "custom"
+    file_sink: Optional[FileSinkConfig] = Field(
+        default=None, exclude=True
+    )  # required if sink == "file"
+    binary_sink: Optional[BinarySinkConfig] = Field(
+        default=None, exclude=True
+    )  # required if sink == "binary"
+    collector_sink: Optional[CollectorSinkConfig] = Field(
+        default=None, exclude=True
+    )  # required if sink == "collector"
+    # Levels, rate limits, sampling and deduplication per module, instead of filter
+    filter_spec: Optional[FilterSpec] = Field(default=None, exclude=True)
+    # Write through a queue on a background thread instead of in the logging call
+    async_sink: Optional[AsyncSinkConfig] = Field(default=None, exclude=True)
 
     class Config:
         arbitrary_types_allowed = True
@@ -46,12 +98,14 @@ class LogHandlerConfig(BaseModel):
     @root_validator(pre=True)
     def import_custom_fields(cls, values):
         """Replace custom fields with the import path specified"""
-        CUSTOM_FIELDS = ["sink", "format", "filter"]
         for field in CUSTOM_FIELDS:
             if value := values.get(field):
                 if value == "custom":
                     name = values[f"custom_{field}"]
-                    values[field] = importFromString(name)
+                    values[field] = getResolver().resolve(name)
+        for sink in FOLD_SINKS:
+            if values.get("sink") == sink and values.get(f"{sink}_sink") is None:
+                raise ValueError(f"{sink}_sink is required if sink is {sink}")
         return values
     
     @validator('sink', pre=True)
@@ -63,24 +117,59 @@ class LogHandlerConfig(BaseModel):
                 return sys.stderr
             case _:
                 return value
-            
-    @validator("sink")
-    def filelike_sink(cls, value):
-        # if not a expected sink, test whether it contains a write method
-        if not any(isinstance(value, cls.__fields__["sink"])):
-            if hasattr(value, "write") and callable(value.write):
-                return value
-            raise TypeError("Object does not have a write method defined")
-        return value
-            
-            
+
+
     @validator("sink")
     def str_sink(cls, value):
-        # Recast str as Path
-        if isinstance(value, str):
+        # Recast str as Path, except the names of the fold sinks
+        if isinstance(value, str) and value not in FOLD_SINKS:
             return Path(value)
         return value
 
+    @validator("filter_spec")
+    def single_filter(cls, value, values):
+        if value is not None and values.get("filter") is not None:
+            raise ValueError("filter and filter_spec are exclusive")
+        return value
+
+    @validator("async_sink")
+    def threaded_sink(cls, value, values):
+        sink = values.get("sink")
+        if value is not None and (isinstance(sink, Handler) or asyncio.iscoroutinefunction(sink)):
+            raise ValueError("Coroutine and logging.Handler sinks cannot be written asynchronously")
+        return value
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return tuple((name, _freeze(field)) for name, field in value)
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _freeze(field)) for key, field in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if value is None or isinstance(value, (str, int, float, bool, Path)):
+        return value
+    # sinks, callables... are the same handler only if they are the same object
+    return ("object", id(value))
+
+
+def handlerKey(config: LogHandlerConfig) -> str:
+    """Hash every field of a handler config, including the excluded ones
+
+    Args:
+        config (LogHandlerConfig): Handler config
+
+    Returns:
+        str: Key equal for configs that make the same handler
+    """
+    return hashlib.sha256(repr(_freeze(config)).encode()).hexdigest()
+
+
+def _alive(handler: _Handler) -> bool:
+    # loguru has no public way to list handlers, assume alive if the internals change
+    handlers = getattr(getattr(logger, "_core", None), "handlers", None)
+    return handlers is None or handler.id in handlers
+
 
 class LogManager(ConfigManager):
     def __init__(self, config: LogHandlerConfig | Iterable[LogHandlerConfig], *args, **kwargs):
@@ -88,20 +177,97 @@ class LogManager(ConfigManager):
             config = [config]
         
         super().__init__(config)
-        
-        self.remove()  # clear any existing handlers
+        # Queued sinks, whose stats report the queue depth and drops
+        self.sinks: List[AsyncSink] = []
+        # loguru handler ids by config key
+        self.handlers: Dict[str, List[int]] = {}
+
         self.configure(config)
     
     @classmethod
     def parseDict(cls, config: Dict[str, Content], *args, **kwargs) -> LogHandlerConfig:
         return LogHandlerConfig(**config)
+
+    @classmethod
+    def parseBatch(cls, kind: type, config: List[Content], *args, **kwargs) -> List[LogHandlerConfig]:
+        if issubclass(kind, dict):
+            # Check and import every custom object once, before validating any handler
+            getResolver().resolveMany(
+                conf[f"custom_{field}"]
+                for conf in config
+                for field in CUSTOM_FIELDS
+                if conf.get(field) == "custom" and f"custom_{field}" in conf
+            )
+        return super().parseBatch(kind, config)
         
     def remove(self, *args, **kwargs):
-        logger.remove(*args, **kwargs)
-        
-    def add(self, *args, **kwargs):
-        logger.add(*args, **kwargs)
-        
+        with _handlersLock:
+            logger.remove(*args, **kwargs)
+            if not args and "handler_id" not in kwargs:
+                _handlers.clear()
+
+    def add(self, *args, **kwargs) -> int:
+        return logger.add(*args, **kwargs)
+
+    def _add(self, conf: LogHandlerConfig) -> _Handler:
+        options = conf.dict(exclude_none=True, exclude_unset=True)
+        if isinstance(conf.sink, str) and conf.sink in FOLD_SINKS:
+            options["sink"] = FOLD_SINKS[conf.sink](getattr(conf, f"{conf.sink}_sink"))
+        if conf.filter_spec is not None:
+            options["filter"] = compileFilter(conf.filter_spec)
+        if conf.async_sink is not None:
+            options["sink"] = AsyncSink(options["sink"], conf.async_sink)
+        sink = options["sink"] if isinstance(options["sink"], AsyncSink) else None
+        return _Handler(self.add(**options), conf, sink)
+
+    @staticmethod
+    def _collectorConfig(path: str, config: List[LogHandlerConfig]) -> LogHandlerConfig:
+        # forward everything the local handlers would have kept, the collector filters
+        levels = [
+            conf.level if isinstance(conf.level, int) else logger.level(conf.level or "DEBUG").no
+            for conf in config
+        ]
+        return LogHandlerConfig(
+            sink="collector", collector_sink={"path": path}, level=min(levels)
+        )
+
     def configure(self, config: Iterable[LogHandlerConfig]):
-        for conf in config:
-            self.add(**conf.dict(exclude_none=True, exclude_unset=True))
+        """Apply handler configs, changing only the handlers that differ
+
+        Handlers whose config did not change keep running untouched. New handlers
+        are added before the handlers no longer configured are removed, so that no
+        record is lost in between. The first configuration removes every handler
+        added outside of LogManager, e.g. the default loguru handler.
+
+        In a process started by a LogCollector, see FOLD_LOG_COLLECTOR, the handlers
+        are replaced by a single sink sending records to the collector.
+
+        Args:
+            config (Iterable[LogHandlerConfig]): Handler configs
+        """
+        config = list(config)
+        if config and (path := collectorPath()) is not None:
+            config = [self._collectorConfig(path, config)]
+        with _handlersLock:
+            if not _handlers:
+                self.remove()  # clear any existing handlers
+            previous = {
+                key: [handler for handler in handlers if _alive(handler)]
+                for key, handlers in _handlers.items()
+            }
+            current: Dict[str, List[_Handler]] = {}
+            for conf in config:
+                key = handlerKey(conf)
+                if kept := previous.get(key):
+                    handler = kept.pop(0)
+                else:
+                    handler = self._add(conf)
+                current.setdefault(key, []).append(handler)
+            for handlers in previous.values():
+                for handler in handlers:
+                    logger.remove(handler.id)
+
+            _handlers.clear()
+            _handlers.update(current)
+            self.handlers = {key: [handler.id for handler in handlers] for key, handlers in current.items()}
+            self.sinks = [handler.sink for handlers in current.values() for handler in handlers if handler.sink]
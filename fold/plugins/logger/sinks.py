@@ -0,0 +1,315 @@
+from __future__ import annotations
+from typing import Any, Callable, List, Literal, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from os import PathLike
+from pathlib import Path
+from threading import Condition, Event, Lock, Thread
+from time import monotonic
+import bz2
+import gzip
+import lzma
+import re
+import shutil
+
+from pydantic import BaseModel, PositiveFloat, PositiveInt, confloat
+
+
+class AsyncSinkConfig(BaseModel):
+    # Maximum number of records waiting to be written
+    queue_size: PositiveInt = 10000
+    # Maximum number of records written at once
+    batch_size: PositiveInt = 100
+    # Seconds a record may wait for a batch to fill up
+    flush_interval: PositiveFloat = 0.5
+    # What to do with a record when the queue is full:
+    # block the caller, drop the oldest or newest record, or sample (see below)
+    policy: Literal["block", "drop_oldest", "drop_newest", "sample"] = "block"
+    # With the sample policy, keep 1 in sample_every records once the queue is
+    # filled above sample_above, and drop new records once it is full
+    sample_every: PositiveInt = 10
+    sample_above: confloat(gt=0, le=1) = 0.5
+
+    class Config:
+        extra = "forbid"
+
+
+@dataclass
+class SinkStats:
+    """Counters of an AsyncSink
+
+    Attributes:
+        depth (int): Records waiting to be written
+        written (int): Records written
+        dropped (int): Records dropped by the backpressure policy
+        batches (int): Batches written
+        errors (int): Batches the sink failed to write
+    """
+
+    depth: int = 0
+    written: int = 0
+    dropped: int = 0
+    batches: int = 0
+    errors: int = 0
+
+
+class AsyncSink:
+    def __init__(self, sink: Any, config: Optional[AsyncSinkConfig] = None) -> None:
+        """Loguru sink that queues records and writes them in batches on a thread
+
+        Logging calls only append to a bounded queue, so a slow sink delays them
+        only when the queue is full and the policy is "block". Sinks with a
+        writeBatch method receive the list of messages, file-like sinks receive each
+        batch in a single write, paths are opened in append mode and callables are
+        called once per record.
+
+        Args:
+            sink (Any): File-like object, path or callable to write to
+            config (AsyncSinkConfig, optional): Queue and batching options. Defaults to None, the default options.
+
+        Raises:
+            TypeError: The sink cannot be written from a thread, e.g. a coroutine or a logging.Handler
+        """
+        self.config = config or AsyncSinkConfig()
+        self._file = None
+        if isinstance(sink, (str, PathLike)):
+            self._file = sink = open(sink, "a", encoding="utf8")
+        self._sink = sink
+        self._emit = self._emitter(sink)
+        self._queue: deque = deque()
+        self._condition = Condition()
+        self._closed = False
+        self._sampled = 0
+        self._stats = SinkStats()
+        self._thread = Thread(target=self._run, name="fold-log-sink", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _emitter(sink: Any) -> Callable[[List[str]], None]:
+        if callable(writeBatch := getattr(sink, "writeBatch", None)):
+            return writeBatch
+        if callable(getattr(sink, "write", None)):
+            flush = getattr(sink, "flush", None)
+
+            def emit(batch: List[str]) -> None:
+                sink.write("".join(batch))
+                if callable(flush):
+                    flush()
+
+            return emit
+        if callable(sink) and not hasattr(sink, "handle"):
+            return lambda batch: [sink(message) for message in batch]
+        raise TypeError(f"Cannot write to {sink!r} asynchronously")
+
+    @property
+    def stats(self) -> SinkStats:
+        """Snapshot of the queue depth and counters"""
+        with self._condition:
+            return SinkStats(**{**vars(self._stats), "depth": len(self._queue)})
+
+    def write(self, message: str) -> None:
+        """Queue a record, applying the backpressure policy if the queue is full
+
+        Args:
+            message (str): Formatted record
+        """
+        config = self.config
+        with self._condition:
+            if self._closed:
+                return
+            if len(self._queue) >= config.queue_size:
+                if config.policy == "block":
+                    self._condition.wait_for(
+                        lambda: len(self._queue) < config.queue_size or self._closed
+                    )
+                elif config.policy == "drop_oldest":
+                    self._queue.popleft()
+                    self._stats.dropped += 1
+                else:
+                    self._stats.dropped += 1
+                    return
+            elif (
+                config.policy == "sample"
+                and len(self._queue) >= config.sample_above * config.queue_size
+            ):
+                self._sampled += 1
+                if self._sampled % config.sample_every:
+                    self._stats.dropped += 1
+                    return
+            self._queue.append(message)
+            if len(self._queue) >= config.batch_size:
+                self._condition.notify_all()
+
+    def _run(self) -> None:
+        config = self.config
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: len(self._queue) >= config.batch_size or self._closed,
+                    config.flush_interval,
+                )
+                count = min(config.batch_size, len(self._queue))
+                batch = [self._queue.popleft() for _ in range(count)]
+                if not batch and self._closed:
+                    return
+                # wake up callers blocked on a full queue
+                self._condition.notify_all()
+            if not batch:
+                continue
+            try:
+                self._emit(batch)
+            except Exception:
+                with self._condition:
+                    self._stats.errors += 1
+            else:
+                with self._condition:
+                    self._stats.written += len(batch)
+                    self._stats.batches += 1
+
+    def stop(self) -> None:
+        """Write the queued records and stop the thread, called by loguru when the handler is removed"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        if self._file is not None:
+            self._file.close()
+        elif callable(stop := getattr(self._sink, "stop", None)):
+            stop()
+
+
+COMPRESSORS = {"gz": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+
+class PeriodicFlush:
+    def __init__(self, flush: Callable[[], None], interval: float, name: str) -> None:
+        """Call flush every interval seconds on a daemon thread, until stopped
+
+        Args:
+            flush (Callable[[], None]): Flushes a buffer
+            interval (float): Seconds between flushes
+            name (str): Thread name
+        """
+        self.interval = interval
+        self._flush = flush
+        self._stopped = Event()
+        self._thread = Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self._flush()
+
+    def stop(self) -> None:
+        """Stop flushing, waiting for a running flush"""
+        self._stopped.set()
+        self._thread.join()
+
+
+class FileSinkConfig(BaseModel):
+    path: Path
+    # Bytes buffered before writing to disk
+    buffer_size: PositiveInt = 1 << 20
+    # Seconds between flushes of the buffer
+    flush_interval: PositiveFloat = 1.0
+    # Rotate once the file would exceed rotation_size bytes or is older than rotation_interval seconds
+    rotation_size: Optional[PositiveInt] = None
+    rotation_interval: Optional[PositiveFloat] = None
+    # Compress rotated files in the background
+    compression: Optional[Literal["gz", "bz2", "xz"]] = None
+    # Number of rotated files to keep, all by default
+    retention: Optional[PositiveInt] = None
+    encoding: str = "utf8"
+
+    class Config:
+        extra = "forbid"
+
+
+class FileSink:
+    def __init__(self, config: FileSinkConfig) -> None:
+        """Loguru sink appending to a file through a large buffer, with rotation
+
+        Rotating only renames the file and opens a new one. Compressing rotated
+        files and deleting the ones beyond retention happen on a background thread.
+        The sink has no flush method on purpose, so that loguru does not flush the
+        buffer after every record. A background thread flushes it every
+        flush_interval instead, so records reach the file when logging goes idle.
+
+        Args:
+            config (FileSinkConfig): File and rotation options
+        """
+        self.config = config
+        self.path = Path(config.path)
+        self._lock = Lock()
+        self._background = ThreadPoolExecutor(1, thread_name_prefix="fold-log-rotate")
+        self._rotated = 0
+        self._open()
+        self._flusher = PeriodicFlush(self.sync, config.flush_interval, "fold-log-flush")
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab", buffering=self.config.buffer_size)
+        self._size = self._file.tell()
+        self._opened = monotonic()
+
+    def _due(self, size: int, now: float) -> bool:
+        config = self.config
+        if not self._size:
+            return False
+        if config.rotation_size is not None and self._size + size > config.rotation_size:
+            return True
+        return config.rotation_interval is not None and now - self._opened >= config.rotation_interval
+
+    def _rotate(self) -> None:
+        self._file.close()
+        self._rotated += 1
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        rotated = self.path.with_name(f"{self.path.name}.{stamp}-{self._rotated}")
+        self.path.rename(rotated)
+        self._open()
+        self._background.submit(self._finish, rotated)
+
+    def _finish(self, rotated: Path) -> None:
+        if (compression := self.config.compression) is not None:
+            with open(rotated, "rb") as source, COMPRESSORS[compression](f"{rotated}.{compression}", "wb") as target:
+                shutil.copyfileobj(source, target)
+            rotated.unlink()
+        if (retention := self.config.retention) is not None:
+            # rotated names start with a timestamp, so they sort oldest first
+            files = sorted(self.rotatedFiles(), key=lambda path: path.name, reverse=True)
+            for path in files[retention:]:
+                path.unlink(missing_ok=True)
+
+    def rotatedFiles(self) -> List[Path]:
+        """Rotated files, compressed or not"""
+        # only names _rotate gives, other files may share the prefix, e.g. app.log.bin
+        suffixes = "|".join(COMPRESSORS)
+        pattern = re.compile(rf"{re.escape(self.path.name)}\.\d{{8}}-\d{{6}}-\d{{6}}-\d+(\.({suffixes}))?")
+        return [
+            path
+            for path in self.path.parent.glob(f"{self.path.name}.*")
+            if pattern.fullmatch(path.name) and path.is_file()
+        ]
+
+    def write(self, message: str) -> None:
+        data = message.encode(self.config.encoding)
+        now = monotonic()
+        with self._lock:
+            if self._due(len(data), now):
+                self._rotate()
+            self._file.write(data)
+            self._size += len(data)
+
+    def sync(self) -> None:
+        """Write the buffer to disk"""
+        with self._lock:
+            self._file.flush()
+
+    def stop(self) -> None:
+        """Close the file and wait for background compression, called by loguru when the handler is removed"""
+        self._flusher.stop()
+        with self._lock:
+            self._file.close()
+        self._background.shutdown()
@@ -1,17 +1,28 @@
 from __future__ import annotations
-from typing import Any, Iterable, Optional, Mapping, TypeVar, Dict
+from typing import Any, Iterable, List, Literal, Optional, Mapping, TypeVar, Dict
 from abc import abstractmethod
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from threading import Lock
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PositiveInt
 
-from fold.core import Plugin, ConfigManager, Content
-from fold.utils.plugin import PluginManager
+from fold.core import Plugin, CallGate, ConfigManager, Content
+from fold.utils.dag import DependencyError, runGraph
+from fold.utils.plugin import PluginRegistry
+
+from .process import ProcessHandler
 
 T_Config = TypeVar("T_Config")
 
+# Default output plugin registry, created on first use
+_plugins: Optional[PluginRegistry] = None
+
 
 class OutputPluginConfig(BaseModel):
     name: str
+    # "process" runs the plugin in a pool of worker processes, whose write returns a Future
+    mode: Literal["inline", "process"] = "inline"
+    workers: PositiveInt = 1
 
     class Config:
         extra = "forbid"
@@ -38,9 +49,25 @@ class OutputManager(ConfigManager):
         self,
         config: OutputPluginConfig | Iterable[OutputPluginConfig],
         plugins: Optional[Mapping[str, OutputPlugin]] = None,
+        executor: Optional[Executor] = None,
         *args,
         **kwargs
     ) -> None:
+        """Construct a handler for every output config
+
+        Handlers are constructed once the handlers of the plugins they require are,
+        independent handlers concurrently.
+
+        Args:
+            config (OutputPluginConfig | Iterable[OutputPluginConfig]): Output configs
+            plugins (Mapping[str, OutputPlugin], optional): Plugin of each name. Defaults to the default plugins.
+            executor (Executor, optional): Pool to construct handlers on. Defaults to None, a pool per manager.
+
+        Raises:
+            KeyError: A plugin requires a plugin that is not configured
+            DependencyCycleError: Plugins require each other
+            DependencyError: Some handlers failed to construct, the others were closed
+        """
         super().__init__(config, *args, **kwargs)
         if plugins is None:
             plugins = self.DEFAULT_PLUGINS
@@ -48,13 +75,79 @@ class OutputManager(ConfigManager):
         if isinstance(config, OutputPluginConfig):
             config = [config]
 
-        self.handlers = [plugins[conf.name] for conf in config]
+        self._config = list(config)
+        self._plugins = dict(plugins)
+        self.handlers = self._construct(self._config, self._plugins, executor)
+        # writes of process handlers that failed after write returned
+        self.failures = 0
+        self.lastError: Optional[BaseException] = None
+        self._gate = CallGate()
+        self._lock = Lock()
+
+    @staticmethod
+    def _graph(config: List[OutputPluginConfig], plugins: Mapping[str, OutputPlugin]) -> Dict[int, List[int]]:
+        # a handler depends on every handler of the plugins it requires
+        graph = {}
+        for index, conf in enumerate(config):
+            requires = getattr(plugins[conf.name], "REQUIRES", ())
+            graph[index] = [i for i, other in enumerate(config) if other.name in requires]
+            if missing := set(requires) - {config[i].name for i in graph[index]}:
+                raise KeyError(f"{conf.name} requires {', '.join(sorted(missing))} which is not configured")
+        return graph
+
+    @classmethod
+    def _construct(
+        cls,
+        config: List[OutputPluginConfig],
+        plugins: Mapping[str, OutputPlugin],
+        executor: Optional[Executor],
+        keep: Optional[Mapping[int, OutputPlugin]] = None,
+    ) -> List[OutputPlugin]:
+        graph = cls._graph(config, plugins)
+        keep = keep or {}
+
+        def construct(index: int, dependencies: Dict[int, OutputPlugin]) -> OutputPlugin:
+            if index in keep:
+                return keep[index]
+            plugin = plugins[config[index].name]
+            if config[index].mode == "process":
+                if getattr(plugin, "REQUIRES", ()):
+                    raise ValueError(f"{config[index].name} requires other plugins and cannot run in a process")
+                return ProcessHandler(plugin, config[index], config[index].workers)
+            if not dependencies:
+                return plugin(config[index])
+            named = {}
+            for i, handler in dependencies.items():
+                named.setdefault(config[i].name, handler)
+            return plugin(config[index], dependencies=named)
+
+        pool = executor
+        if pool is None and len(config) - len(keep) > 1:
+            pool = ThreadPoolExecutor(thread_name_prefix="fold-outputs")
+        try:
+            return list(runGraph(graph, construct, pool).values())
+        except DependencyError as e:
+            for index, handler in e.results.items():
+                if index not in keep and callable(close := getattr(handler, "close", None)):
+                    close()
+            raise
+        finally:
+            if executor is None and pool is not None:
+                pool.shutdown()
+
+    @classmethod
+    @property
+    def PLUGINS(cls) -> PluginRegistry:
+        """Registry of the default output plugins, discovered once and shared by every manager"""
+        global _plugins
+        if _plugins is None:
+            _plugins = PluginRegistry(OutputPlugin, ["fold.plugins.outputs"])
+        return _plugins
 
     @classmethod
     @property
     def DEFAULT_PLUGINS(cls) -> Dict[str, OutputPlugin]:
-        plugins = PluginManager(OutputPlugin).discover("fold.plugins.outputs")
-        return {plugin.__name__: plugin for plugin in plugins}
+        return dict(cls.PLUGINS.byName)
 
     @classmethod
     def parseDict(
@@ -70,6 +163,81 @@ class OutputManager(ConfigManager):
         config: OutputPluginConfig = OutputPluginConfig(**config)
         return plugins[config.name].parseConfig(config)
 
-    def write(self, data: Any):
+    @classmethod
+    def parseBatch(
+        cls,
+        kind: type,
+        config: List[Content],
+        plugins: Optional[Mapping[str, OutputPlugin]] = None,
+        *args,
+        **kwargs
+    ) -> List[OutputPluginConfig]:
+        if not issubclass(kind, dict):
+            return super().parseBatch(kind, config)
+
+        # Discover the plugins once for the whole list
+        if plugins is None:
+            plugins = cls.DEFAULT_PLUGINS
+        return [cls.parseDict(conf, plugins) for conf in config]
+
+    def close(self) -> None:
         for handler in self.handlers:
-            handler.write(data)
+            if callable(close := getattr(handler, "close", None)):
+                close()
+
+    def swapPlugins(self, plugins: Mapping[Plugin, Plugin]) -> bool:
+        """Rebuild the handlers of replaced plugins and of every handler requiring them
+
+        Dependents are rebuilt too, so that they receive the new instances rather
+        than the replaced ones, which are closed once in-flight writes drained.
+
+        Args:
+            plugins (Mapping[Plugin, Plugin]): New class of each replaced plugin class
+
+        Raises:
+            KeyError: A new plugin requires a plugin that is not configured
+            DependencyCycleError: New plugins require each other
+            DependencyError: Some handlers failed to rebuild, the current ones are kept
+
+        Returns:
+            bool: Whether any handler was rebuilt
+        """
+        swapped = {name: plugins.get(plugin, plugin) for name, plugin in self._plugins.items()}
+        rebuild = {i for i, conf in enumerate(self._config) if swapped[conf.name] is not self._plugins[conf.name]}
+        if not rebuild:
+            return False
+
+        graph = self._graph(self._config, swapped)
+        while dependents := {i for i, deps in graph.items() if i not in rebuild and rebuild.intersection(deps)}:
+            rebuild |= dependents
+
+        keep = {i: handler for i, handler in enumerate(self.handlers) if i not in rebuild}
+        handlers = self._construct(self._config, swapped, None, keep)
+        replaced = [self.handlers[i] for i in sorted(rebuild)]
+        with self._gate.drain():
+            self.handlers = handlers
+            self._plugins = swapped
+        for handler in replaced:
+            if callable(close := getattr(handler, "close", None)):
+                close()
+        return True
+
+    def _done(self, future: Future) -> None:
+        if not future.cancelled() and (error := future.exception()) is not None:
+            with self._lock:
+                self.failures += 1
+                self.lastError = error
+
+    def write(self, data: Any):
+        """Write data to every output
+
+        Handlers running in processes return a Future, whose failure is counted in
+        failures and kept in lastError rather than raised.
+
+        Args:
+            data (Any): Data to publish
+        """
+        with self._gate.call():
+            for handler in self.handlers:
+                if isinstance(result := handler.write(data), Future):
+                    result.add_done_callback(self._done)
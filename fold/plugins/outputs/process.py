@@ -0,0 +1,149 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Deque, Optional, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
+from multiprocessing import get_context
+from threading import Condition, Lock
+import pickle
+
+if TYPE_CHECKING:
+    from .common import OutputPlugin, OutputPluginConfig
+
+# Handler of a worker process, constructed when the worker starts
+_handler: Optional[OutputPlugin] = None
+
+
+def _startWorker(plugin: type, config: OutputPluginConfig) -> None:
+    global _handler
+    _handler = plugin(config)
+
+
+def _writeWorker(payload: bytes) -> Any:
+    return _handler.write(pickle.loads(payload))
+
+
+class ProcessHandler:
+    def __init__(self, plugin: type, config: OutputPluginConfig, workers: int = 1) -> None:
+        """Run an output plugin in a pool of worker processes
+
+        Every worker constructs its own instance of the plugin from the config, so
+        the plugin and its config must be picklable and the plugin importable. Data
+        is pickled once with the highest protocol.
+
+        A crashed worker breaks the whole pool and fails every write it held. The
+        pool is restarted and those writes are replayed one at a time, new writes
+        queueing behind them, so a write that crashes again on its own is the one
+        that broke the pool and fails alone while the others go through.
+
+        Args:
+            plugin (type): Output plugin class
+            config (OutputPluginConfig): Plugin config
+            workers (int, optional): Number of worker processes. Defaults to 1.
+        """
+        self.plugin = plugin
+        self.config = config
+        self.workers = workers
+        self.restarts = 0
+        self.failures = 0
+        self._lock = Lock()
+        self._idle = Condition(self._lock)
+        self._replay: Deque[Tuple[Future, bytes]] = deque()
+        self._replaying = False
+        self._pending = 0
+        self._closed = False
+        self._pool = self._start()
+
+    def _start(self) -> ProcessPoolExecutor:
+        # spawn rather than fork, the host may hold locks in other threads
+        return ProcessPoolExecutor(
+            self.workers,
+            mp_context=get_context("spawn"),
+            initializer=_startWorker,
+            initargs=(self.plugin, self.config),
+        )
+
+    def _restart(self, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            # another write may have restarted the pool already
+            if self._closed or self._pool is not pool:
+                return
+            # the broken pool has failed its futures already, they are replayed
+            pool.shutdown(wait=False)
+            self._pool = self._start()
+            self.restarts += 1
+
+    def _submit(self, future: Future, payload: bytes, replay: bool = False) -> None:
+        pool = self._pool
+        try:
+            inner = pool.submit(_writeWorker, payload)
+        except BrokenProcessPool:
+            self._restart(pool)
+            pool = self._pool
+            inner = pool.submit(_writeWorker, payload)
+        inner.add_done_callback(lambda inner: self._done(pool, inner, future, payload, replay))
+
+    def _done(self, pool: ProcessPoolExecutor, inner: Future, future: Future, payload: bytes, replay: bool) -> None:
+        error = inner.exception()
+        if isinstance(error, BrokenProcessPool):
+            self._restart(pool)
+            if not replay and not self._closed:
+                self._enqueue(future, payload)
+                return
+        with self._lock:
+            self._pending -= 1
+            if error is not None:
+                self.failures += 1
+            self._idle.notify_all()
+        if error is None:
+            future.set_result(inner.result())
+        else:
+            future.set_exception(error)
+        if replay:
+            self._replayNext()
+
+    def _enqueue(self, future: Future, payload: bytes) -> None:
+        with self._lock:
+            self._replay.append((future, payload))
+            if self._replaying:
+                return
+            self._replaying = True
+        self._replayNext()
+
+    def _replayNext(self) -> None:
+        with self._lock:
+            if not self._replay:
+                self._replaying = False
+                return
+            future, payload = self._replay.popleft()
+        self._submit(future, payload, replay=True)
+
+    def write(self, data: Any) -> Future:
+        """Write data to output in a worker process
+
+        Args:
+            data (Any): Data to publish, must be picklable
+
+        Returns:
+            Future: Result of the plugin write
+        """
+        payload = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+        future = Future()
+        future.set_running_or_notify_cancel()
+        with self._lock:
+            self._pending += 1
+            # writes wait for the replay after a crash, so that it runs each write alone
+            if self._replaying:
+                self._replay.append((future, payload))
+                return future
+        self._submit(future, payload)
+        return future
+
+    def close(self) -> None:
+        """Wait for pending writes, replayed ones included, and stop the workers"""
+        with self._lock:
+            while self._pending:
+                self._idle.wait()
+            self._closed = True
+            pool = self._pool
+        pool.shutdown()
@@ -0,0 +1,164 @@
+from __future__ import annotations
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import RLock
+from types import ModuleType
+import hashlib
+import os
+import sys
+
+_MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    """Counters of an ImportCache
+
+    Attributes:
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups not in the cache, including invalidated entries
+        evictions (int): Entries dropped to stay within the size limit
+        invalidations (int): Entries dropped because their module file changed
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+def sourceFile(obj: Any) -> Optional[str]:
+    """Find the file a module, or the module of an object, was loaded from
+
+    Args:
+        obj (Any): Module, class or function
+
+    Returns:
+        Optional[str]: Path of the file, None for builtins and dynamic objects
+    """
+    if not isinstance(obj, ModuleType):
+        obj = sys.modules.get(getattr(obj, "__module__", None) or "")
+    return getattr(obj, "__file__", None)
+
+
+class ImportCache(OrderedDict):
+    def __init__(self, maxsize: Optional[int] = None, validate: Optional[str] = "mtime") -> None:
+        """LRU cache of imported modules and objects that drops entries whose file changed
+
+        Args:
+            maxsize (int, optional): Maximum number of entries. Defaults to None, unbounded.
+            validate (str, optional): How to detect changed files on lookup, "mtime", "hash" or None to never check. Defaults to "mtime".
+        """
+        if validate not in ("mtime", "hash", None):
+            raise ValueError(f"Unknown validation {validate}")
+        super().__init__()
+        self.maxsize = maxsize
+        self.validate = validate
+        self.stats = CacheStats()
+        self._fingerprints = {}
+        self._stale: Set[Hashable] = set()
+        self._lock = RLock()
+
+    def _fingerprint(self, value: Any, previous: Optional[Tuple] = None) -> Optional[Tuple]:
+        if self.validate is None or (path := sourceFile(value)) is None:
+            return None
+        try:
+            stat = os.stat(path)
+            if self.validate == "hash":
+                # hash again only once the file was touched, a hit costs a stat as with mtime
+                if previous is not None and previous[0] == path and previous[2:] == (stat.st_mtime_ns, stat.st_size):
+                    return previous
+                with open(path, "rb") as file:
+                    digest = hashlib.sha256(file.read()).hexdigest()
+                return (path, digest, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return (path, None)
+        return (path, stat.st_mtime_ns, stat.st_size)
+
+    def _changed(self, key: Hashable, value: Any) -> bool:
+        previous = self._fingerprints.get(key)
+        current = self._fingerprint(value, previous)
+        if self.validate != "hash" or previous is None or current is None:
+            return current != previous
+        # a file touched without changing keeps its entry, under the new timestamp
+        self._fingerprints[key] = current
+        return current[:2] != previous[:2]
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            self._fingerprints[key] = self._fingerprint(value)
+            self._stale.discard(key)
+            while self.maxsize is not None and len(self) > self.maxsize:
+                evicted, _ = self.popitem(last=False)
+                self._fingerprints.pop(evicted, None)
+                self.stats.evictions += 1
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            super().__delitem__(key)
+            self._fingerprints.pop(key, None)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Look up an entry, counting the hit or miss and dropping it if its file changed
+
+        Args:
+            key (Hashable): Import name
+            default (Any, optional): Returned on a miss. Defaults to None.
+
+        Returns:
+            Any: Cached module or object, default if missing or invalidated
+        """
+        with self._lock:
+            value = super().get(key, _MISSING)
+            if value is not _MISSING and self._changed(key, value):
+                del self[key]
+                self._stale.add(key)
+                self.stats.invalidations += 1
+                value = _MISSING
+            if value is _MISSING:
+                self.stats.misses += 1
+                return default
+            self.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def invalidate(self) -> Dict[Hashable, Any]:
+        """Drop every entry whose file changed
+
+        Returns:
+            Dict[Hashable, Any]: Entries dropped, with the value cached before the change
+        """
+        with self._lock:
+            changed = {
+                key: value
+                for key, value in self.items()
+                if self._changed(key, value)
+            }
+            for key in changed:
+                del self[key]
+            self.stats.invalidations += len(changed)
+            return changed
+
+    def popStale(self, key: Hashable) -> bool:
+        """Check whether an entry was dropped because its file changed, forgetting it
+
+        Args:
+            key (Hashable): Import name
+
+        Returns:
+            bool: True if the module must be reloaded rather than imported
+        """
+        with self._lock:
+            if key in self._stale:
+                self._stale.discard(key)
+                return True
+            return False
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            self._fingerprints.clear()
+            self._stale.clear()
@@ -0,0 +1,184 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, TypeVar
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+
+K = TypeVar("K", bound=Hashable)
+
+
+class DependencyCycleError(ValueError):
+    def __init__(self, cycle: List[Hashable]) -> None:
+        """Dependencies that require each other
+
+        Args:
+            cycle (List[Hashable]): Nodes of the cycle, starting and ending with the same node
+        """
+        super().__init__("Dependency cycle: " + " -> ".join(map(str, cycle)))
+        self.cycle = cycle
+
+
+class DependencyError(RuntimeError):
+    def __init__(
+        self,
+        errors: Dict[Hashable, Exception],
+        skipped: Dict[Hashable, Hashable],
+        results: Dict[Hashable, Any],
+    ) -> None:
+        """Some nodes of a dependency graph failed to run
+
+        Args:
+            errors (Dict[Hashable, Exception]): Error of each failed node, in the order they failed
+            skipped (Dict[Hashable, Hashable]): Failed node that prevented each dependent node from running
+            results (Dict[Hashable, Any]): Result of each node that ran, e.g. to release them
+        """
+        details = "; ".join(f"{node}: {error!r}" for node, error in errors.items())
+        message = f"{len(errors)} failed ({details})"
+        if skipped:
+            message += f", {len(skipped)} skipped ({', '.join(map(str, skipped))})"
+        super().__init__(message)
+        self.errors = errors
+        self.skipped = skipped
+        self.results = results
+
+
+def findCycle(graph: Mapping[K, Iterable[K]]) -> Optional[List[K]]:
+    """Find a dependency cycle
+
+    Args:
+        graph (Mapping[K, Iterable[K]]): Dependencies of each node
+
+    Returns:
+        Optional[List[K]]: Nodes of a cycle, starting and ending with the same node, None if there is no cycle
+    """
+    state: Dict[K, int] = {}  # 1 while visiting, 2 once done
+    for start in graph:
+        if start in state:
+            continue
+        path, stack = [], [(start, iter(graph[start]))]
+        state[start] = 1
+        path.append(start)
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if state.get(child) == 1:
+                    return path[path.index(child):] + [child]
+                if child not in state:
+                    state[child] = 1
+                    path.append(child)
+                    stack.append((child, iter(graph.get(child, ()))))
+                    break
+            else:
+                state[node] = 2
+                path.pop()
+                stack.pop()
+    return None
+
+
+def dependencyLevels(graph: Mapping[K, Iterable[K]]) -> List[List[K]]:
+    """Group nodes so that each node comes after all of its dependencies
+
+    Nodes of a level only depend on nodes of earlier levels and keep the order of the graph.
+
+    Args:
+        graph (Mapping[K, Iterable[K]]): Dependencies of each node
+
+    Raises:
+        KeyError: A node depends on a node not in the graph
+        DependencyCycleError: Nodes depend on each other
+
+    Returns:
+        List[List[K]]: Levels of nodes
+    """
+    remaining = {node: set(dependencies) for node, dependencies in graph.items()}
+    for node, dependencies in remaining.items():
+        if unknown := dependencies - remaining.keys():
+            raise KeyError(f"{node} depends on unknown {', '.join(map(str, unknown))}")
+
+    levels, done = [], set()
+    while remaining:
+        level = [node for node, dependencies in remaining.items() if dependencies <= done]
+        if not level:
+            raise DependencyCycleError(findCycle(remaining))
+        for node in level:
+            del remaining[node]
+        done.update(level)
+        levels.append(level)
+    return levels
+
+
+def runGraph(
+    graph: Mapping[K, Iterable[K]],
+    run: Callable[[K, Dict[K, Any]], Any],
+    executor: Optional[Executor] = None,
+) -> Dict[K, Any]:
+    """Run every node once its dependencies ran, independent nodes concurrently
+
+    A node whose dependency failed is skipped. Nodes that do not depend on a
+    failure still run, so that every error is reported at once.
+
+    Args:
+        graph (Mapping[K, Iterable[K]]): Dependencies of each node
+        run (Callable[[K, Dict[K, Any]], Any]): Called with a node and the result of each of its dependencies
+        executor (Executor, optional): Pool to run nodes on. Defaults to None, run serially in dependency order.
+
+    Raises:
+        KeyError: A node depends on a node not in the graph
+        DependencyCycleError: Nodes depend on each other, detected before anything runs
+        DependencyError: Some nodes failed
+
+    Returns:
+        Dict[K, Any]: Result of each node, in graph order
+    """
+    graph = {node: list(dependencies) for node, dependencies in graph.items()}
+    if not graph:
+        return {}
+    levels = dependencyLevels(graph)
+    results: Dict[K, Any] = {}
+    errors: Dict[K, Exception] = {}
+
+    def inputs(node: K) -> Dict[K, Any]:
+        return {dependency: results[dependency] for dependency in graph[node]}
+
+    if executor is None:
+        for level in levels:
+            for node in level:
+                if all(dependency in results for dependency in graph[node]):
+                    try:
+                        results[node] = run(node, inputs(node))
+                    except Exception as e:
+                        errors[node] = e
+    else:
+        waiting = {node: set(dependencies) for node, dependencies in graph.items()}
+        dependents: Dict[K, List[K]] = {node: [] for node in graph}
+        for node, dependencies in waiting.items():
+            for dependency in dependencies:
+                dependents[dependency].append(node)
+
+        running: Dict[Future, K] = {}
+        for node in levels[0]:
+            running[executor.submit(run, node, {})] = node
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                try:
+                    results[node] = future.result()
+                except Exception as e:
+                    errors[node] = e
+                    continue
+                for dependent in dependents[node]:
+                    waiting[dependent].discard(node)
+                    if not waiting[dependent]:
+                        running[executor.submit(run, dependent, inputs(dependent))] = dependent
+
+    if errors:
+        skipped: Dict[K, K] = {}
+        for level in levels:
+            for node in level:
+                if node in results or node in errors:
+                    continue
+                for dependency in graph[node]:
+                    if dependency in errors or dependency in skipped:
+                        skipped[node] = skipped.get(dependency, dependency)
+                        break
+        raise DependencyError(errors, skipped, {node: results[node] for node in graph if node in results})
+    return {node: results[node] for node in graph}
@@ -1,7 +1,19 @@
-from typing import Optional, Any
+from typing import Dict, Iterable, Optional, Any
+from types import ModuleType
 import importlib
+import importlib.util
+import sys
+
+from .cache import CacheStats, ImportCache
+from .pluginIndex import findSpec
+from .profile import span
 from .stringParser import parseModuleObjectString, parseObjectAttrString
 
+_MISSING = object()
+
+# Shared resolver, created on first use
+_resolver: Optional["ImportResolver"] = None
+
 
 def importFromString(name: str, package: Optional[str] = None) -> Any:
     """Dynamically load a module or object in <module>:<object> notation
@@ -21,12 +33,175 @@ def importFromString(name: str, package: Optional[str] = None) -> Any:
 
     moduleName, objectString = parseModuleObjectString(name)
 
-    m = importlib.import_module(moduleName, package)
+    with span(name, "import"):
+        m = importlib.import_module(moduleName, package)
 
     if objectString is None:
         return m
     objectName, attrs = parseObjectAttrString(objectString)
     obj = getattr(m, objectName)
     for attr in attrs:
-        obj = getattr(m, attr)
+        obj = getattr(obj, attr)
     return obj
+
+
+def _moduleExists(name: str) -> bool:
+    if name in sys.modules:
+        return True
+    parent = name.rpartition(".")[0]
+    if not parent or parent in sys.modules:
+        # nothing left to import to look the module up, builtins included
+        return importlib.util.find_spec(name) is not None
+    return findSpec(name) is not None
+
+
+class ImportResolver:
+    def __init__(self, cache: Optional[ImportCache] = None) -> None:
+        """Memoized importFromString that resolves each unique import string once
+
+        Resolved objects are not re-imported when their module changes, call
+        invalidate or clear after reloading modules. reloadPlugins invalidates the
+        shared resolver.
+
+        Args:
+            cache (ImportCache, optional): Cache of resolved objects. Defaults to None, an unvalidated LRU cache of 4096 entries.
+        """
+        if cache is None:
+            cache = ImportCache(maxsize=4096, validate=None)
+        self._cache = cache
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit, miss and eviction counters"""
+        return self._cache.stats
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def invalidate(self, modules: Iterable[str]) -> int:
+        """Drop the objects resolved from modules, e.g. after they were reloaded
+
+        An object is dropped if its import string names one of the modules or if it
+        is defined in one of them, as a class re-exported by a package is.
+
+        Args:
+            modules (Iterable[str]): Absolute module names
+
+        Returns:
+            int: Number of objects dropped
+        """
+        modules = set(modules)
+        stale = []
+        for (name, package), obj in list(self._cache.items()):
+            moduleName, _ = parseModuleObjectString(name)
+            try:
+                moduleName = importlib.util.resolve_name(moduleName, package)
+            except (ImportError, ValueError):
+                pass
+            defined = obj.__name__ if isinstance(obj, ModuleType) else getattr(obj, "__module__", None)
+            if moduleName in modules or defined in modules:
+                stale.append((name, package))
+        for key in stale:
+            try:
+                del self._cache[key]
+            except KeyError:  # evicted meanwhile
+                pass
+        return len(stale)
+
+    def resolve(self, name: str, package: Optional[str] = None) -> Any:
+        """Load a module or object in <module>:<object> notation, from the cache if resolved before
+
+        Args:
+            name (str): Path to object in <module>:<object> notation
+            package (str, optional): Required only if the module name is relative. Defaults to None.
+
+        Returns:
+            Any: Object loaded
+
+        Raises:
+            ImportError: Failed to load module
+            AttributeError: Object does not exist in module
+        """
+        key = (name, package)
+        if (obj := self._cache.get(key, _MISSING)) is _MISSING:
+            obj = self._cache[key] = importFromString(name, package)
+        return obj
+
+    def validate(self, names: Iterable[str], package: Optional[str] = None) -> Dict[str, Exception]:
+        """Check that the modules of import strings exist, without executing them
+
+        Modules are located on sys.path without importing their parent packages,
+        the objects themselves can only be checked by resolving them.
+
+        Args:
+            names (Iterable[str]): Paths to objects in <module>:<object> notation
+            package (str, optional): Required only if the module names are relative. Defaults to None.
+
+        Returns:
+            Dict[str, Exception]: Error of each import string whose module cannot be found
+        """
+        errors = {}
+        for name in dict.fromkeys(names):
+            if (name, package) in self._cache:
+                continue
+            try:
+                moduleName, _ = parseModuleObjectString(name)
+                moduleName = importlib.util.resolve_name(moduleName, package)
+                if not _moduleExists(moduleName):
+                    raise ModuleNotFoundError(f"No module named {moduleName!r}", name=moduleName)
+            except (ImportError, ValueError) as e:
+                errors[name] = e
+        return errors
+
+    def resolveMany(
+        self, names: Iterable[str], package: Optional[str] = None, validate: bool = True
+    ) -> Dict[str, Any]:
+        """Load a batch of import strings, each unique string once
+
+        Args:
+            names (Iterable[str]): Paths to objects in <module>:<object> notation
+            package (str, optional): Required only if the module names are relative. Defaults to None.
+            validate (bool, optional): Check every module exists before executing any. Defaults to True.
+
+        Returns:
+            Dict[str, Any]: Object loaded for each import string
+
+        Raises:
+            ImportError: Some import strings failed, listed in the message and kept in the errors attribute
+        """
+        names = list(dict.fromkeys(names))
+        errors = self.validate(names, package) if validate else {}
+        objects = {}
+        if not errors:
+            for name in names:
+                try:
+                    objects[name] = self.resolve(name, package)
+                except (ImportError, AttributeError, ValueError) as e:
+                    errors[name] = e
+        if errors:
+            raise importErrors(errors)
+        return objects
+
+
+def importErrors(errors: Dict[str, Exception]) -> ImportError:
+    """Combine the errors of several import strings into one ImportError
+
+    Args:
+        errors (Dict[str, Exception]): Error of each import string
+
+    Returns:
+        ImportError: Error listing every import string, chained to the first error
+    """
+    details = "; ".join(f"{name}: {error}" for name, error in errors.items())
+    error = ImportError(f"Failed to import {len(errors)} object(s): {details}")
+    error.errors = errors
+    error.__cause__ = next(iter(errors.values()))
+    return error
+
+
+def getResolver() -> ImportResolver:
+    """Shared import resolver"""
+    global _resolver
+    if _resolver is None:
+        _resolver = ImportResolver()
+    return _resolver
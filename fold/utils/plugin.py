@@ -1,23 +1,93 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, Any, Optional, Dict, Set
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, List, Optional, Dict, Set, FrozenSet, Tuple
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from importlib import import_module
+from importlib.util import resolve_name
+from threading import Lock, RLock
+import sys
+from time import perf_counter
+from types import ModuleType
 
+from .cache import CacheStats, ImportCache
 from .imp import importFromString
+from .stringParser import parseModuleObjectString
+from .pluginIndex import PluginIndex, PluginSpec, walkModules
+from .profile import span
 
 if TYPE_CHECKING:
     from fold.core import Plugin
 
 
+@dataclass
+class DiscoveryResult:
+    """Outcome of discovering plugins across package trees
+
+    Attributes:
+        plugins (List[Plugin]): Plugins found, sorted by module and name
+        timings (Dict[str, float]): Seconds spent importing each module
+        errors (Dict[str, Exception]): Error raised by each module that failed to import
+    """
+
+    plugins: List[Plugin] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+
+
+_MISSING = object()
+
+
+@dataclass
+class ReloadReport:
+    """Outcome of reloading plugin modules
+
+    Attributes:
+        modules (List[str]): Modules imported again, in order
+        plugins (Dict[Plugin, Plugin]): New version of each plugin that was replaced
+        errors (Dict[str, Exception]): Error raised by each module that failed to import, which keeps its previous version
+        managers (List[Any]): Config managers that swapped plugin instances
+        failed (List[Tuple[Any, Exception]]): Config managers that failed to swap, with the error raised
+    """
+
+    modules: List[str] = field(default_factory=list)
+    plugins: Dict[Plugin, Plugin] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+    managers: List[Any] = field(default_factory=list)
+    failed: List[Tuple[Any, Exception]] = field(default_factory=list)
+
+
+def _deepestFirst(name: str) -> Tuple[int, str]:
+    return -name.count("."), name
+
+
 class PluginManager:
-    _cache: Dict[str, Any] = {}
+    # Importer cache shared by managers created without a cache of their own
+    _cache: Dict[str, Any] = ImportCache(maxsize=1024)
+    # Shared index of plugin metadata, scanned from sources on demand
+    _index = PluginIndex()
+    # Incremented whenever cached plugins may have changed so that registries rebuild
+    generation: int = 0
 
-    def __init__(self, obj: Plugin) -> None:
+    def __init__(
+        self,
+        obj: Plugin,
+        cache: Optional[ImportCache] = None,
+        index: Optional[PluginIndex] = None,
+    ) -> None:
         """Create a plugin manager
 
         Args:
             obj (Plugin): The plugin class to manage
+            cache (ImportCache, optional): Importer cache private to this manager. Defaults to None, the shared cache.
+            index (PluginIndex, optional): Index read by lazy discovery and scans, e.g. one loaded from disk.
+                Modules whose source changed since they were indexed are rescanned. Defaults to None, the shared index.
         """
         self._plugin = obj
+        if cache is not None:
+            self._cache = cache
+        if index is not None:
+            index.refresh()
+            self._index = index
 
     @property
     def cache(self) -> Dict[str, Any]:
@@ -28,9 +98,40 @@ class PluginManager:
         """
         return self._cache
 
+    @property
+    def stats(self) -> Optional[CacheStats]:
+        """Hit, miss, eviction and invalidation counters of the importer cache
+
+        Returns:
+            Optional[CacheStats]: Counters, None if the cache does not keep any
+        """
+        return getattr(self._cache, "stats", None)
+
     def flushCache(self):
-        """Flush plugin cache"""
-        self._cache = {}
+        """Flush plugin cache
+
+        The shared cache is cleared for every manager using it.
+        """
+        self._cache.clear()
+        PluginManager.generation += 1
+
+    def _cached(self, name: str, module: str) -> Any:
+        """Look up the importer cache, reloading the module if its file changed
+
+        Args:
+            name (str): Cache key
+            module (str): Absolute name of the module the key imports from
+
+        Returns:
+            Any: Cached value, _MISSING on a miss
+        """
+        obj = self._cache.get(name, _MISSING)
+        if obj is _MISSING and isinstance(self._cache, ImportCache) and self._cache.popStale(name):
+            # the entry was dropped because its file changed, import the new source from scratch
+            # rather than reloading so that names removed from the module do not linger
+            sys.modules.pop(module, None)
+            PluginManager.generation += 1
+        return obj
 
     def load(
         self, name: str, package: Optional[str] = None, cache: bool = True
@@ -50,16 +151,16 @@ class PluginManager:
             ImportError: Failed to load the module
         """
 
-        if cache and name in self.cache:
-            obj = self.cache[name]
-        else:
-            try:
-                obj = importFromString(name, package)
-            except AttributeError as e:
-                raise ImportError("Plugin does not exist") from e
-            # cache the result
-            if cache:
-                self._cache[name] = obj
+        with span(name, "load"):
+            obj = self._cached(name, resolve_name(parseModuleObjectString(name)[0], package)) if cache else _MISSING
+            if obj is _MISSING:
+                try:
+                    obj = importFromString(name, package)
+                except AttributeError as e:
+                    raise ImportError("Plugin does not exist") from e
+                # cache the result
+                if cache:
+                    self._cache[name] = obj
 
         # return only strict, subclass of Plugin
         if issubclass(obj, self._plugin) and obj is not self._plugin:
@@ -67,7 +168,11 @@ class PluginManager:
         raise TypeError("Object is not a plugin")
 
     def discover(
-        self, name: str, package: Optional[str] = None, cache: bool = True
+        self,
+        name: str,
+        package: Optional[str] = None,
+        cache: bool = True,
+        lazy: bool = False,
     ) -> Set[Plugin]:
         """Dynamically load a module and return a set of all plugin objects found
 
@@ -75,20 +180,95 @@ class PluginManager:
             name (str): Path to module in dot notation
             package (str, optional): Required only if the module name is relative. Defaults to None.
             cache (bool, optional): Use cache result. Defaults to True.
+            lazy (bool, optional): Return LazyPlugin proxies found from the module source instead of importing it. Defaults to False.
 
         Returns:
             Set[Plugin]: Dictionary of plugins discovered in the module in {name: Plugin} format
         """
+        if lazy:
+            return {LazyPlugin(spec, self) for spec in self.scan(name, package)}
 
-        # import from the importer cache
-        if cache and name in self.cache:
-            module = self.cache[name]
-        else:  # cache missed or disabled
-            module = import_module(name, package)
-            # update cache
-            if cache:
-                self.cache[name] = module
+        with span(name, "discover"):
+            # import from the importer cache
+            module = self._cached(name, resolve_name(name, package)) if cache else _MISSING
+            if module is _MISSING:  # cache missed or disabled
+                module = import_module(name, package)
+                # update cache
+                if cache:
+                    self.cache[name] = module
+
+            return self._members(module)
 
+    def _reimport(self, name: str, report: ReloadReport) -> None:
+        old = sys.modules.pop(name, None)
+        try:
+            new = import_module(name)
+        except Exception as e:
+            if old is not None:
+                sys.modules[name] = old
+            report.errors[name] = e
+            return
+        report.modules.append(name)
+        if old is None:
+            return
+        for plugin in self._members(old):
+            replacement = getattr(new, plugin.__name__, None)
+            if replacement is not None and replacement is not plugin:
+                report.plugins[plugin] = replacement
+
+    def reload(self, modules: Optional[Iterable[str]] = None) -> ReloadReport:
+        """Import plugin modules again and map their previous plugins to the new ones
+
+        Without modules, the cached modules whose file changed are reloaded. Cached
+        modules still holding a replaced plugin, e.g. a package re-exporting it, are
+        imported again as well. The importer cache is updated and registries rebuild.
+
+        Args:
+            modules (Iterable[str], optional): Absolute names of the modules to reload. Defaults to None, the changed modules.
+
+        Returns:
+            ReloadReport: Modules reloaded, plugins replaced and import errors
+        """
+        report = ReloadReport()
+        changed = self._cache.invalidate() if isinstance(self._cache, ImportCache) else {}
+        if modules is None:
+            modules = {
+                value.__name__ if isinstance(value, ModuleType) else value.__module__
+                for value in changed.values()
+            }
+        entries = {**self._cache, **changed}
+
+        # submodules first, so that a package imports their new plugins again
+        pending = sorted(modules, key=_deepestFirst)
+        while pending:
+            for name in pending:
+                self._reimport(name, report)
+            done = set(report.modules) | set(report.errors)
+            pending = sorted(
+                {
+                    value.__name__
+                    for value in entries.values()
+                    if isinstance(value, ModuleType)
+                    and value.__name__ not in done
+                    and any(
+                        isinstance(obj, type) and obj in report.plugins
+                        for obj in vars(value).values()
+                    )
+                },
+                key=_deepestFirst,
+            )
+
+        # point the cache at the new modules and plugins
+        for key, value in entries.items():
+            if isinstance(value, ModuleType) and value.__name__ in report.modules:
+                self._cache[key] = sys.modules[value.__name__]
+            elif isinstance(value, type) and value in report.plugins:
+                self._cache[key] = report.plugins[value]
+        if report.modules:
+            PluginManager.generation += 1
+        return report
+
+    def _members(self, module: Any) -> Set[Plugin]:
         # return only non-private plugin objects, ommitting the plugin class itself
         plugins = set()
         for object in [getattr(module, name) for name in dir(module)]:
@@ -102,3 +282,302 @@ class PluginManager:
             except TypeError:
                 pass
         return plugins
+
+    def _timedImport(self, name: str) -> tuple:
+        start = perf_counter()
+        try:
+            with span(name, "import"):
+                module = import_module(name)
+        except Exception as e:
+            return None, perf_counter() - start, e
+        return module, perf_counter() - start, None
+
+    def discoverPackage(
+        self,
+        roots: str | Iterable[str],
+        executor: Optional[Executor] = None,
+        cache: bool = True,
+    ) -> DiscoveryResult:
+        """Import every module of one or more package trees and collect their plugins
+
+        Modules are imported one package level at a time so that parents are
+        always imported before their children, and the modules of a level are
+        imported concurrently. A module whose import deadlocks with another
+        thread, e.g. because of circular imports, is retried serially.
+
+        Args:
+            roots (str | Iterable[str]): Absolute names of the packages or modules to walk
+            executor (Executor, optional): Thread pool to import on. Defaults to None, a pool per call.
+            cache (bool, optional): Use and update the importer cache. Defaults to True.
+
+        Returns:
+            DiscoveryResult: Plugins, in a deterministic order, and the import time or error of each module
+        """
+        if isinstance(roots, str):
+            roots = [roots]
+        names = sorted({module for root in roots for module in walkModules(root)})
+        levels: Dict[int, List[str]] = {}
+        for name in names:
+            levels.setdefault(name.count("."), []).append(name)
+
+        result = DiscoveryResult()
+        modules = {}
+        pool = executor or ThreadPoolExecutor(thread_name_prefix="fold-discover")
+        try:
+            for depth in sorted(levels):
+                pending = []
+                for name in levels[depth]:
+                    if cache and (module := self._cached(name, name)) is not _MISSING:
+                        modules[name] = module
+                        result.timings[name] = 0.0
+                    else:
+                        pending.append(name)
+                retry = []
+                for name, (module, elapsed, error) in zip(
+                    pending, pool.map(self._timedImport, pending)
+                ):
+                    if type(error).__name__ == "_DeadlockError":
+                        retry.append(name)
+                        continue
+                    result.timings[name] = elapsed
+                    if error is not None:
+                        result.errors[name] = error
+                    else:
+                        modules[name] = module
+                for name in retry:
+                    module, result.timings[name], error = self._timedImport(name)
+                    if error is not None:
+                        result.errors[name] = error
+                    else:
+                        modules[name] = module
+        finally:
+            if executor is None:
+                pool.shutdown()
+
+        plugins = set()
+        for name, module in modules.items():
+            if cache:
+                self.cache[name] = module
+            plugins |= self._members(module)
+        result.plugins = sorted(plugins, key=lambda p: (p.__module__, p.__qualname__))
+        return result
+
+    def scan(
+        self,
+        name: str,
+        package: Optional[str] = None,
+        index: Optional[PluginIndex] = None,
+    ) -> Set[PluginSpec]:
+        """Find the plugins of a module from its source, without importing it
+
+        Use load(spec.path) to import one of the plugins found.
+
+        Args:
+            name (str): Path to module in dot notation
+            package (str, optional): Required only if the module name is relative. Defaults to None.
+            index (PluginIndex, optional): Index to read, e.g. one loaded from disk. Defaults to the manager index.
+
+        Returns:
+            Set[PluginSpec]: Metadata of the plugins visible at the top level of the module
+        """
+        if index is None:
+            index = self._index
+        return index.lookup(resolve_name(name, package), self._plugin)
+
+    def scanGroup(self, group: str, index: Optional[PluginIndex] = None) -> Set[PluginSpec]:
+        """Find the plugins published under a package entry point group, without importing them
+
+        Args:
+            group (str): Entry point group
+            index (PluginIndex, optional): Index to read. Defaults to the manager index.
+
+        Returns:
+            Set[PluginSpec]: Metadata of the plugins in the group
+        """
+        if index is None:
+            index = self._index
+        return index.lookupGroup(group, self._plugin)
+
+
+def pluginPath(plugin: Plugin | LazyPlugin) -> str:
+    """Name a plugin class or proxy in <module>:<object> notation"""
+    if isinstance(plugin, LazyPlugin):
+        return plugin.spec.path
+    return f"{plugin.__module__}:{plugin.__qualname__}"
+
+
+class LazyPlugin:
+    def __init__(self, spec: PluginSpec, manager: PluginManager) -> None:
+        """Stand-in for a plugin class that imports it on first use
+
+        The name, module and declared attributes (e.g. EXTENSIONS) of the plugin are
+        available without importing it. Calling the proxy or accessing any other
+        attribute imports the plugin once, thread-safely, and forwards to it.
+        Proxies of the same plugin compare equal, a proxy and the class it stands
+        for do not, so collections mixing them should key them by pluginPath, as
+        PluginRegistry does.
+
+        Args:
+            spec (PluginSpec): Metadata of the plugin
+            manager (PluginManager): Manager used to load the plugin
+        """
+        self.spec = spec
+        self._manager = manager
+        self._plugin: Optional[Plugin] = None
+        self._lock = Lock()
+        self.__name__ = self.__qualname__ = spec.name
+        self.__module__ = spec.module
+        for name, value in spec.attributes.items():
+            setattr(self, name, value)
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the plugin was imported"""
+        return self._plugin is not None
+
+    def resolve(self) -> Plugin:
+        """Import the plugin if it was not yet
+
+        Returns:
+            Plugin: Plugin class
+        """
+        if (plugin := self._plugin) is None:
+            with self._lock:
+                if self._plugin is None:
+                    self._plugin = self._manager.load(self.spec.path)
+                plugin = self._plugin
+        return plugin
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyPlugin):
+            return self.spec.path == other.spec.path
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.spec.path)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "pending"
+        return f"<LazyPlugin {self.spec.path} ({state})>"
+
+
+class PluginRegistry:
+    def __init__(
+        self,
+        obj: Plugin,
+        modules: Iterable[str] = (),
+        plugins: Iterable[Plugin] = (),
+        lazy: bool = False,
+        index: Optional[PluginIndex] = None,
+    ) -> None:
+        """Memoized set of plugins discovered from modules or registered explicitly
+
+        Discovery runs once and is repeated only after the registry is invalidated,
+        either explicitly or because the plugin manager cache changed.
+
+        Args:
+            obj (Plugin): The plugin class to manage
+            modules (Iterable[str], optional): Modules to discover plugins in. Defaults to ().
+            plugins (Iterable[Plugin], optional): Plugins to register. Defaults to ().
+            lazy (bool, optional): Discover LazyPlugin proxies instead of importing the modules. Defaults to False.
+            index (PluginIndex, optional): Index lazy discovery reads, e.g. one loaded from disk. Defaults to the shared index.
+        """
+        self._manager = PluginManager(obj, index=index)
+        self._modules = tuple(modules)
+        self._lazy = lazy
+        self._names: Dict[str, Plugin] = {}
+        # keyed by pluginPath, so that a LazyPlugin and its class are the same plugin
+        self._registered: Dict[str, Plugin] = {pluginPath(plugin): plugin for plugin in plugins}
+        self._unregistered: Set[str] = set()
+        self._paths: FrozenSet[str] = frozenset()
+        self._lock = RLock()
+        self._plugins: Optional[FrozenSet[Plugin]] = None
+        self._generation = PluginManager.generation
+
+    def __iter__(self) -> Iterator[Plugin]:
+        return iter(self.plugins)
+
+    def __len__(self) -> int:
+        return len(self.plugins)
+
+    def __contains__(self, plugin: Plugin) -> bool:
+        self.plugins  # rebuild if needed
+        return pluginPath(plugin) in self._paths
+
+    @property
+    def plugins(self) -> FrozenSet[Plugin]:
+        """Plugins in the registry, rebuilt only if the registry was invalidated
+
+        Returns:
+            FrozenSet[Plugin]: Registered plugins
+        """
+        plugins = self._plugins
+        if plugins is not None and self._generation == PluginManager.generation:
+            return plugins
+
+        with self._lock:
+            if self._plugins is None or self._generation != PluginManager.generation:
+                generation = PluginManager.generation
+                discovered = dict(self._registered)
+                for module in self._modules:
+                    for plugin in self._manager.discover(module, lazy=self._lazy):
+                        discovered.setdefault(pluginPath(plugin), plugin)
+                for path in self._unregistered:
+                    discovered.pop(path, None)
+                plugins = frozenset(discovered.values())
+                self._index(plugins)
+                self._paths = frozenset(discovered)
+                self._plugins, self._generation = plugins, generation
+            return self._plugins
+
+    def _index(self, plugins: FrozenSet[Plugin]) -> None:
+        """Hook to precompute lookups whenever the plugins are rebuilt
+
+        Args:
+            plugins (FrozenSet[Plugin]): Plugins in the registry
+        """
+        self._names = {plugin.__name__: plugin for plugin in plugins}
+
+    @property
+    def byName(self) -> Dict[str, Plugin]:
+        """Plugins keyed by class name
+
+        Returns:
+            Dict[str, Plugin]: Shared mapping, do not modify it
+        """
+        self.plugins  # rebuild if needed
+        return self._names
+
+    def register(self, plugin: Plugin) -> None:
+        """Add a plugin to the registry
+
+        Args:
+            plugin (Plugin): Plugin to add
+        """
+        with self._lock:
+            path = pluginPath(plugin)
+            self._registered[path] = plugin
+            self._unregistered.discard(path)
+            self.invalidate()
+
+    def unregister(self, plugin: Plugin) -> None:
+        """Remove a plugin from the registry, including discovered ones
+
+        Args:
+            plugin (Plugin): Plugin to remove
+        """
+        with self._lock:
+            path = pluginPath(plugin)
+            self._registered.pop(path, None)
+            self._unregistered.add(path)
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Rebuild the registry on next access"""
+        self._plugins = None
@@ -0,0 +1,425 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from importlib.machinery import ModuleSpec, PathFinder
+from importlib.metadata import entry_points
+from pathlib import Path
+from threading import RLock
+import ast
+import json
+import os
+import pkgutil
+
+# (module, name) of a class, or of a re-exported name to follow
+Reference = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class PluginSpec:
+    """Metadata of a plugin class, read without importing its module
+
+    Attributes:
+        name (str): Class name
+        module (str): Module defining the class
+        base (str): Plugin base class in <module>:<object> notation
+        attributes (Dict[str, Any]): Upper case class attributes with literal values, e.g. EXTENSIONS
+    """
+
+    name: str
+    module: str
+    base: str
+    attributes: Dict[str, Any] = field(default_factory=dict, compare=False, hash=False)
+
+    @property
+    def path(self) -> str:
+        """Import path in <module>:<object> notation"""
+        return f"{self.module}:{self.name}"
+
+    @property
+    def extensions(self) -> Set[str]:
+        """Config file extensions declared by the plugin"""
+        return set(self.attributes.get("EXTENSIONS", ()))
+
+
+@dataclass
+class ClassInfo:
+    name: str
+    bases: List[Reference]
+    attributes: Dict[str, Any]
+
+
+@dataclass
+class ModuleInfo:
+    name: str
+    source: Optional[str] = None
+    mtime: Optional[int] = None
+    classes: Dict[str, ClassInfo] = field(default_factory=dict)
+    # Names imported with "from x import y", local name -> (x, y)
+    imports: Dict[str, Reference] = field(default_factory=dict)
+
+
+def findSpec(module: str) -> Optional[ModuleSpec]:
+    """Find the spec of a module on sys.path without importing it or its parents
+
+    Args:
+        module (str): Absolute module name
+
+    Returns:
+        Optional[ModuleSpec]: Module spec, None if the module is not found on sys.path
+    """
+    parts = module.split(".")
+    spec = PathFinder.find_spec(parts[0])
+    for end in range(2, len(parts) + 1):
+        if spec is None or spec.submodule_search_locations is None:
+            return None
+        spec = PathFinder.find_spec(".".join(parts[:end]), spec.submodule_search_locations)
+    return spec
+
+
+def findSource(module: str) -> Optional[Path]:
+    """Locate the source file of a module without importing it or its parents
+
+    Args:
+        module (str): Absolute module name
+
+    Returns:
+        Optional[Path]: Source file, None for builtin, compiled or missing modules
+    """
+    spec = findSpec(module)
+    if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+        return None
+    return Path(spec.origin)
+
+
+def walkModules(root: str) -> List[str]:
+    """List a module and, if it is a package, all of its submodules, without importing them
+
+    Args:
+        root (str): Absolute module name
+
+    Returns:
+        List[str]: Module names, sorted
+    """
+    if (spec := findSpec(root)) is None:
+        return []
+    modules = [root]
+    if spec.submodule_search_locations is not None:
+        for info in pkgutil.iter_modules(spec.submodule_search_locations, f"{root}."):
+            modules += walkModules(info.name) if info.ispkg else [info.name]
+    return sorted(modules)
+
+
+def _dotted(node: ast.expr) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute) and (value := _dotted(node.value)):
+        return f"{value}.{node.attr}"
+    return None
+
+
+def scanModule(module: str) -> ModuleInfo:
+    """Read the classes and imports of a module from its source
+
+    Args:
+        module (str): Absolute module name
+
+    Returns:
+        ModuleInfo: Classes and imported names, empty if the source is not available
+    """
+    source = findSource(module)
+    if source is None:
+        return ModuleInfo(module)
+
+    tree = ast.parse(source.read_bytes(), str(source))
+    info = ModuleInfo(module, str(source), os.stat(source).st_mtime_ns)
+    package = module if source.name == "__init__.py" else module.rpartition(".")[0]
+    aliases: Dict[str, str] = {}  # "import x.y as z" -> z: x.y
+
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom):
+            base = package
+            for _ in range(node.level - 1):
+                base = base.rpartition(".")[0]
+            origin = ".".join(filter(None, [base if node.level else "", node.module]))
+            for alias in node.names:
+                info.imports[alias.asname or alias.name] = (origin, alias.name)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                aliases[alias.asname or alias.name] = alias.name
+        elif isinstance(node, ast.ClassDef):
+            info.classes[node.name] = ClassInfo(node.name, [], {})
+
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        cls = info.classes[node.name]
+        for base in node.bases:
+            if (dotted := _dotted(base)) is None:
+                continue
+            head, _, attr = dotted.rpartition(".")
+            if not head:
+                cls.bases.append((module, attr))
+            elif head in aliases:
+                cls.bases.append((aliases[head], attr))
+            elif head in info.imports:  # "from pkg import submodule"
+                cls.bases.append((".".join(info.imports[head]), attr))
+            else:
+                cls.bases.append((head, attr))
+        for statement in node.body:
+            if isinstance(statement, ast.Assign):
+                targets = statement.targets
+            elif isinstance(statement, ast.AnnAssign) and statement.value is not None:
+                targets = [statement.target]
+            else:
+                continue
+            for target in targets:
+                if isinstance(target, ast.Name) and target.id.isupper():
+                    try:
+                        cls.attributes[target.id] = ast.literal_eval(statement.value)
+                    except (ValueError, TypeError, SyntaxError):
+                        pass
+    return info
+
+
+class PluginIndex:
+    def __init__(self) -> None:
+        """Plugin metadata gathered from module sources, without importing them
+
+        Modules are scanned on first use, so looking up a module that is not in
+        the index yet scans it and every module it imports plugins from.
+        """
+        self._modules: Dict[str, ModuleInfo] = {}
+        self._groups: Dict[str, List[str]] = {}
+        self._lock = RLock()
+
+    def module(self, name: str) -> ModuleInfo:
+        """Scanned information of a module
+
+        Args:
+            name (str): Absolute module name
+
+        Returns:
+            ModuleInfo: Module information
+        """
+        if (info := self._modules.get(name)) is None:
+            with self._lock:
+                if (info := self._modules.get(name)) is None:
+                    info = self._modules[name] = scanModule(name)
+        return info
+
+    def resolve(self, reference: Reference) -> Optional[Reference]:
+        """Follow re-exports to the module defining a class
+
+        Args:
+            reference (Reference): (module, name) of the class as imported
+
+        Returns:
+            Optional[Reference]: (module, name) of the class definition, None if it is not a known class
+        """
+        seen = set()
+        while reference not in seen:
+            seen.add(reference)
+            module, name = reference
+            info = self.module(module)
+            if name in info.classes:
+                return reference
+            if name not in info.imports:
+                return None
+            reference = info.imports[name]
+        return None
+
+    def isSubclass(self, reference: Reference, base: Reference) -> bool:
+        """Check if a class inherits from a base, both given by their definitions
+
+        Args:
+            reference (Reference): (module, name) of the class
+            base (Reference): (module, name) of the base class
+
+        Returns:
+            bool: True if the class is the base or inherits from it
+        """
+        pending, seen = [reference], set()
+        while pending:
+            current = pending.pop()
+            if current == base:
+                return True
+            if current in seen:
+                continue
+            seen.add(current)
+            module, name = current
+            for parent in self.module(module).classes[name].bases:
+                if (resolved := self.resolve(parent)) is not None:
+                    pending.append(resolved)
+        return False
+
+    def _specs(self, references: Iterable[Reference], base: type) -> Set[PluginSpec]:
+        target = (base.__module__, base.__qualname__)
+        basePath = f"{base.__module__}:{base.__qualname__}"
+        specs = set()
+        for reference in references:
+            if (resolved := self.resolve(reference)) is None or resolved == target:
+                continue
+            module, name = resolved
+            if name.startswith("_") or not self.isSubclass(resolved, target):
+                continue
+            attributes = self.module(module).classes[name].attributes
+            specs.add(PluginSpec(name, module, basePath, attributes))
+        return specs
+
+    def lookup(self, module: str, base: type) -> Set[PluginSpec]:
+        """Find the plugins visible at the top level of a module
+
+        Args:
+            module (str): Absolute module name
+            base (type): Plugin base class, only strict subclasses are returned
+
+        Returns:
+            Set[PluginSpec]: Plugins defined or imported in the module
+        """
+        info = self.module(module)
+        references = [(module, name) for name in info.classes]
+        references += list(info.imports.values())
+        return self._specs(references, base)
+
+    def addEntryPoints(self, group: str) -> None:
+        """Index the classes published under a package entry point group
+
+        Args:
+            group (str): Entry point group, e.g. "fold.plugins"
+        """
+        with self._lock:
+            self._groups[group] = [ep.value for ep in entry_points(group=group)]
+
+    def lookupGroup(self, group: str, base: type) -> Set[PluginSpec]:
+        """Find the plugins published under an entry point group
+
+        Args:
+            group (str): Entry point group, indexed first if it was not yet
+            base (type): Plugin base class, only strict subclasses are returned
+
+        Returns:
+            Set[PluginSpec]: Plugins of the group
+        """
+        if group not in self._groups:
+            self.addEntryPoints(group)
+        references = []
+        for value in self._groups[group]:
+            module, _, name = value.partition(":")
+            references.append((module.strip(), name.strip()))
+        return self._specs(references, base)
+
+    def stale(self) -> Set[str]:
+        """Modules whose source changed since they were scanned
+
+        Returns:
+            Set[str]: Module names
+        """
+        stale = set()
+        for name, info in list(self._modules.items()):
+            try:
+                mtime = os.stat(info.source).st_mtime_ns if info.source else None
+            except OSError:
+                mtime = None
+            if mtime != info.mtime:
+                stale.add(name)
+        return stale
+
+    def refresh(self) -> Set[str]:
+        """Rescan the modules whose source changed
+
+        Returns:
+            Set[str]: Modules rescanned
+        """
+        stale = self.stale()
+        with self._lock:
+            for name in stale:
+                self._modules[name] = scanModule(name)
+        return stale
+
+    def dump(self, path: Path | str) -> None:
+        """Write the index as JSON
+
+        Args:
+            path (Path | str): File to write
+        """
+        data = {
+            "modules": {
+                name: {
+                    "source": info.source,
+                    "mtime": info.mtime,
+                    "imports": info.imports,
+                    "classes": {
+                        cls.name: {"bases": cls.bases, "attributes": _jsonable(cls.attributes)}
+                        for cls in info.classes.values()
+                    },
+                }
+                for name, info in self._modules.items()
+            },
+            "groups": self._groups,
+        }
+        with open(path, "w", encoding="UTF-8") as file:
+            json.dump(data, file)
+
+    @classmethod
+    def load(cls, path: Path | str) -> PluginIndex:
+        """Read an index written by dump
+
+        Args:
+            path (Path | str): File to read
+
+        Returns:
+            PluginIndex: Index
+        """
+        with open(path, "r", encoding="UTF-8") as file:
+            data = json.load(file)
+
+        index = cls()
+        for name, module in data["modules"].items():
+            index._modules[name] = ModuleInfo(
+                name,
+                module["source"],
+                module["mtime"],
+                {
+                    className: ClassInfo(
+                        className,
+                        [tuple(base) for base in info["bases"]],
+                        info["attributes"],
+                    )
+                    for className, info in module["classes"].items()
+                },
+                {local: tuple(ref) for local, ref in module["imports"].items()},
+            )
+        index._groups = data["groups"]
+        return index
+
+    @classmethod
+    def build(cls, modules: Iterable[str] = (), groups: Iterable[str] = ()) -> PluginIndex:
+        """Scan modules and entry point groups into a new index
+
+        Args:
+            modules (Iterable[str], optional): Modules to scan. Defaults to ().
+            groups (Iterable[str], optional): Entry point groups to index. Defaults to ().
+
+        Returns:
+            PluginIndex: Index
+        """
+        index = cls()
+        for module in modules:
+            info = index.module(module)
+            # scan the modules plugins are imported from as well
+            for reference in info.imports.values():
+                index.resolve(reference)
+        for group in groups:
+            index.addEntryPoints(group)
+        return index
+
+
+def _jsonable(value: Any) -> Any:
+    # Sets are stored as sorted lists
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if isinstance(value, tuple):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    return value
@@ -0,0 +1,213 @@
+from __future__ import annotations
+from typing import IO, Any, ContextManager, Dict, Iterator, List, Optional
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from importlib.util import resolve_name
+from threading import Lock, current_thread, local
+from time import perf_counter
+import builtins
+import json
+import sys
+
+# Profiler recording spans, None when profiling is off
+_active: Optional[Profiler] = None
+
+
+@dataclass
+class Span:
+    """Timed section of work, e.g. a plugin import or a parser attempt
+
+    Attributes:
+        name (str): What ran, e.g. an import string
+        category (str): Kind of work, e.g. "import", "load", "discover" or "parse"
+        start (float): perf_counter value when the span started
+        duration (float): Wall time in seconds, including children
+        thread (str): Name of the thread the span ran on
+        children (List[Span]): Spans nested in this one
+        error (str, optional): Exception that ended the span, if any
+    """
+
+    name: str
+    category: str
+    start: float
+    duration: float = 0.0
+    thread: str = ""
+    children: List[Span] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def selfTime(self) -> float:
+        """Wall time not spent in children"""
+        return max(self.duration - sum(child.duration for child in self.children), 0.0)
+
+    def toDict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "category": self.category,
+            "start": self.start,
+            "duration": self.duration,
+            "self": self.selfTime,
+            "thread": self.thread,
+            "error": self.error,
+            "children": [child.toDict() for child in self.children],
+        }
+
+
+class Profiler:
+    def __init__(self) -> None:
+        """Collect nested spans from every thread
+
+        Each thread keeps its own stack, so spans nest within a thread and the
+        outermost span of each thread is a root.
+        """
+        self.roots: List[Span] = []
+        self._local = local()
+        self._lock = Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str = "") -> Iterator[Span]:
+        """Time a block as a span nested in the current span of the thread
+
+        Args:
+            name (str): What runs
+            category (str, optional): Kind of work. Defaults to "".
+
+        Yields:
+            Span: Span being recorded
+        """
+        stack: List[Span] = self._local.__dict__.setdefault("stack", [])
+        span = Span(name, category, perf_counter(), thread=current_thread().name)
+        if stack:
+            stack[-1].children.append(span)
+        else:
+            with self._lock:
+                self.roots.append(span)
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = repr(e)
+            raise
+        finally:
+            span.duration = perf_counter() - span.start
+            stack.pop()
+
+    def walk(self) -> Iterator[Span]:
+        """Iterate over every span, depth first"""
+        pending = list(reversed(self.roots))
+        while pending:
+            span = pending.pop()
+            yield span
+            pending.extend(reversed(span.children))
+
+    def clear(self) -> None:
+        with self._lock:
+            self.roots = []
+
+    def toJSON(self, indent: Optional[int] = None) -> str:
+        """Serialize the span trees
+
+        Args:
+            indent (int, optional): JSON indentation. Defaults to None, compact.
+
+        Returns:
+            str: JSON list of the root spans with their children
+        """
+        return json.dumps([root.toDict() for root in self.roots], indent=indent)
+
+    def collapsed(self) -> str:
+        """Serialize the spans as collapsed stacks, the input of flamegraph.pl and speedscope
+
+        Each line is a semicolon separated stack of "category:name" frames followed
+        by the self time of its innermost frame in microseconds. Identical stacks
+        are summed.
+
+        Returns:
+            str: One stack per line
+        """
+        totals: Dict[str, int] = {}
+
+        def visit(span: Span, prefix: str) -> None:
+            frame = f"{span.category}:{span.name}" if span.category else span.name
+            stack = prefix + frame.replace(";", ",").replace(" ", "_")
+            totals[stack] = totals.get(stack, 0) + round(span.selfTime * 1e6)
+            for child in span.children:
+                visit(child, stack + ";")
+
+        for root in self.roots:
+            visit(root, "")
+        return "".join(f"{stack} {micros}\n" for stack, micros in totals.items())
+
+    def dump(self, file: IO[str], format: str = "json") -> None:
+        """Write the spans to a text file
+
+        Args:
+            file (IO[str]): Destination
+            format (str, optional): "json" or "collapsed". Defaults to "json".
+        """
+        if format == "json":
+            file.write(self.toJSON(indent=2))
+        elif format == "collapsed":
+            file.write(self.collapsed())
+        else:
+            raise ValueError(f"Unknown profile format {format}")
+
+
+def span(name: str, category: str = "") -> ContextManager[Optional[Span]]:
+    """Time a block if profiling is on, costing one global lookup otherwise
+
+    Args:
+        name (str): What runs
+        category (str, optional): Kind of work. Defaults to "".
+
+    Returns:
+        ContextManager[Optional[Span]]: Context yielding the span, None when profiling is off
+    """
+    if _active is None:
+        return nullcontext()
+    return _active.span(name, category)
+
+
+def _profiledImport(profiler: Profiler, original):
+    def __import__(name, globals=None, locals=None, fromlist=(), level=0):
+        absolute = name
+        if level:
+            try:
+                absolute = resolve_name("." * level + name, (globals or {}).get("__package__"))
+            except (ImportError, ValueError):
+                pass
+        # only modules imported for the first time cost anything worth a span
+        if absolute in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+        with profiler.span(absolute, "module"):
+            return original(name, globals, locals, fromlist, level)
+
+    return __import__
+
+
+@contextmanager
+def profile(imports: bool = True) -> Iterator[Profiler]:
+    """Record plugin loads, discoveries and parser attempts made within the block
+
+    Args:
+        imports (bool, optional): Also record every module imported for the first time,
+            nested under the span that imported it. Defaults to True.
+
+    Yields:
+        Profiler: Profiler holding the spans, readable after the block
+
+    Raises:
+        RuntimeError: Profiling is already on
+    """
+    global _active
+    if _active is not None:
+        raise RuntimeError("Profiling is already on")
+    profiler = _active = Profiler()
+    original = builtins.__import__
+    if imports:
+        builtins.__import__ = _profiledImport(profiler, original)
+    try:
+        yield profiler
+    finally:
+        builtins.__import__ = original
+        _active = None
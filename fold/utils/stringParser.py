@@ -1,7 +1,15 @@
 import re
+from functools import lru_cache
 from typing import Tuple, List
 
+# This regex pattern seperates the captures the module and object name. The names must be alpha-numeric, "_", or "."
+# The object name is optional
+MODULE_OBJECT_PATTERN = re.compile(r"([\w\.]+):?([\w\.]+)?")
+LEADING_DOTS_PATTERN = re.compile(r"^\.+")
+WORD_PATTERN = re.compile(r"\w+")
 
+
+@lru_cache(maxsize=4096)
 def parseModuleObjectString(string: str) -> Tuple[str, str]:
     """Parse a string using the notation <module>:<object>
 
@@ -24,10 +32,7 @@ def parseModuleObjectString(string: str) -> Tuple[str, str]:
     """
 
     # Use regex for character enforcement/filtering
-    # This regex pattern seperates the captures the module and object name. The names must be alpha-numeric, "_", or "."
-    # The object name is optional
-    pattern = r"([\w\.]+):?([\w\.]+)?"
-    if not (match := re.match(pattern, string)):
+    if not (match := MODULE_OBJECT_PATTERN.match(string)):
         raise ValueError(f"Unable to parse string {string}")
 
     moduleName, objectName = match.group(1, 2)
@@ -35,16 +40,16 @@ def parseModuleObjectString(string: str) -> Tuple[str, str]:
     # Names can still be invalid such as "module.:object" and "module..submodule". This step corrects these issues
     # We can use the re.findall to preserve only the words and add properly formatted dots afterwards.
     # Preserve the leading dots
-    if match := re.match(r"^\.+", moduleName):
+    if match := LEADING_DOTS_PATTERN.match(moduleName):
         leadingDots = match.group(0)
     else:
         leadingDots = ""
-    matches = re.findall(r"\w+", moduleName)
+    matches = WORD_PATTERN.findall(moduleName)
     moduleName = leadingDots + ".".join(matches)
 
     # If object exists, fix invlaid names
     if objectName:
-        matches = re.findall(r"\w+", objectName)
+        matches = WORD_PATTERN.findall(objectName)
         objectName = ".".join(matches)
 
     return (moduleName, objectName)
@@ -59,7 +64,10 @@ def parseObjectAttrString(string: str) -> Tuple[str, List[str]]:
     Returns:
         Tuple[str, List[str]]: (objectName, List[attrName])
     """
-    pattern = re.compile(r"\w+")
-    matches = pattern.findall(string)
+    name, *attrs = _parseObjectAttrString(string)
+    return (name, attrs)
+
 
-    return (matches[0], matches[1:])
+@lru_cache(maxsize=4096)
+def _parseObjectAttrString(string: str) -> Tuple[str, ...]:
+    return tuple(WORD_PATTERN.findall(string))
@@ -0,0 +1,57 @@
+"""Config-load benchmarks
+
+Usage:
+    python -m test.benchmark run [-k PATTERN] [--save PATH]
+    python -m test.benchmark check BASELINE [-k PATTERN] [--threshold 0.1] [--save PATH]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from . import cases  # registers the benchmarks
+from .harness import compare, run
+
+
+def printResult(name: str, result: dict):
+    if "error" in result:
+        print(f"{name:<48} ERROR {result['error']}")
+    else:
+        print(f"{name:<48} {result['min'] * 1e6:>12.2f} us  (median {result['median'] * 1e6:.2f} us)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m test.benchmark")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runParser = commands.add_parser("run", help="Run the benchmarks")
+    checkParser = commands.add_parser("check", help="Fail if a benchmark regressed against a baseline")
+    checkParser.add_argument("baseline", help="Results saved by a previous run")
+    checkParser.add_argument(
+        "--threshold", type=float, default=0.1, help="Allowed relative slowdown (default: 0.1)"
+    )
+    for sub in (runParser, checkParser):
+        sub.add_argument("-k", dest="pattern", default="*", help="Glob selecting benchmarks")
+        sub.add_argument("--repeat", type=int, default=5, help="Timed rounds per benchmark")
+        sub.add_argument("--save", help="Write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, args.repeat, printResult)
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.save, "w", encoding="UTF-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+
+    if args.command == "check":
+        with open(args.baseline, "r", encoding="UTF-8") as file:
+            baseline = json.load(file)
+        regressions = compare(baseline, results, args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before * 1e6:.2f} us -> {after * 1e6:.2f} us ({after / before - 1:+.0%})")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
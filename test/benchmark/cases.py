@@ -0,0 +1,161 @@
+import atexit
+import io
+import json
+import tempfile
+from pathlib import Path
+
+import toml
+
+from fold.core import BaseConfig, ConfigManager
+from fold.plugins.config import JSONConfig, TOMLConfig
+from fold.plugins.logger import LogHandlerConfig, LogManager
+from fold.plugins.outputs import OutputManager, OutputPlugin, OutputPluginConfig
+from fold.utils.cache import ImportCache
+from fold.utils.plugin import PluginManager
+
+from .harness import benchmark
+
+SIZES = {"small": 10, "medium": 1_000, "large": 50_000}
+FORMATS = {"json": (JSONConfig, json.dumps), "toml": (TOMLConfig, toml.dumps)}
+
+_directory = tempfile.TemporaryDirectory()
+atexit.register(_directory.cleanup)
+
+
+class EchoManager(ConfigManager):
+    @classmethod
+    def parseDict(cls, config):
+        return config
+
+    @classmethod
+    def parseList(cls, config):
+        return config
+
+
+class Config(BaseConfig):
+    routes: EchoManager
+    settings: EchoManager
+
+
+def makeContent(entries: int) -> dict:
+    return {
+        "routes": [
+            {"name": f"route{i}", "path": f"/api/v1/route/{i}", "weight": i % 7}
+            for i in range(entries)
+        ],
+        "settings": {"debug": False, "workers": 4, "name": "benchmark"},
+    }
+
+
+def makeText(fmt: str, size: str) -> str:
+    return FORMATS[fmt][1](makeContent(SIZES[size]))
+
+
+def makeFile(fmt: str, size: str, suffix: str) -> Path:
+    path = Path(_directory.name) / f"{fmt}-{size}{suffix}"
+    path.write_text(makeText(fmt, size), encoding="UTF-8")
+    return path
+
+
+def register():
+    for fmt, (parser, _) in FORMATS.items():
+        other = TOMLConfig if parser is JSONConfig else JSONConfig
+        for size in SIZES:
+
+            @benchmark(f"config/fromText/{fmt}/{size}")
+            def fromText(fmt=fmt, size=size):
+                text = makeText(fmt, size)
+                return lambda: Config.fromText(text)
+
+            # Parser order only matters if sniffing is broken
+            @benchmark(f"config/parseText/{fmt}/{size}/own-first")
+            def ownFirst(fmt=fmt, size=size, parsers=(parser, other)):
+                text = makeText(fmt, size)
+                return lambda: BaseConfig.parseText(text, parsers)
+
+            @benchmark(f"config/parseText/{fmt}/{size}/other-first")
+            def otherFirst(fmt=fmt, size=size, parsers=(other, parser)):
+                text = makeText(fmt, size)
+                return lambda: BaseConfig.parseText(text, parsers)
+
+            @benchmark(f"config/fromPath/{fmt}/{size}/right-extension")
+            def rightExtension(fmt=fmt, size=size):
+                path = makeFile(fmt, size, f".{fmt}")
+                return lambda: Config.fromPath(path)
+
+            @benchmark(f"config/fromPath/{fmt}/{size}/wrong-extension")
+            def wrongExtension(fmt=fmt, size=size, other=other):
+                path = makeFile(fmt, size, f".{next(iter(other.EXTENSIONS))}")
+                return lambda: Config.fromPath(path)
+
+
+register()
+
+
+# Modules stay imported, so a miss times the importer cache, not a cold import.
+# The caches are private so that clearing them leaves the shared one and the
+# registries of other benchmarks untouched.
+@benchmark("plugins/discover/miss")
+def discoverMiss():
+    cache = ImportCache(maxsize=1024)
+    manager = PluginManager(OutputPlugin, cache)
+
+    def discover():
+        cache.clear()
+        manager.discover("fold.plugins.outputs")
+
+    return discover
+
+
+@benchmark("plugins/discover/warm")
+def discoverWarm():
+    manager = PluginManager(OutputPlugin)
+    manager.discover("fold.plugins.outputs")
+    return lambda: manager.discover("fold.plugins.outputs")
+
+
+@benchmark("plugins/load/miss")
+def loadMiss():
+    cache = ImportCache(maxsize=1024)
+    manager = PluginManager(OutputPlugin, cache)
+
+    def load():
+        cache.clear()
+        manager.load("fold.plugins.outputs.stdout:Stdout")
+
+    return load
+
+
+@benchmark("plugins/load/warm")
+def loadWarm():
+    manager = PluginManager(OutputPlugin)
+    manager.load("fold.plugins.outputs.stdout:Stdout")
+    return lambda: manager.load("fold.plugins.outputs.stdout:Stdout")
+
+
+@benchmark("logger/setup")
+def logSetup():
+    # Skip validation to time the handler setup only
+    config = [LogHandlerConfig.construct(sink=io.StringIO(), level="INFO") for _ in range(4)]
+
+    def setup():
+        LogManager(config)
+        LogManager([])  # leave no handler behind
+
+    return setup
+
+
+class NullOutput(OutputPlugin):
+    @classmethod
+    def parseConfig(cls, config, *args, **kwargs):
+        return config
+
+    def write(self, data):
+        pass
+
+
+@benchmark("outputs/write")
+def outputWrite():
+    manager = OutputManager([], plugins={})
+    manager.handlers = [NullOutput(OutputPluginConfig(name="NullOutput")) for _ in range(8)]
+    return lambda: manager.write("benchmark")
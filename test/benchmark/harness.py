@@ -0,0 +1,108 @@
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional, Tuple
+import fnmatch
+import platform
+import statistics
+import sys
+import timeit
+
+import fold
+
+# Benchmark name -> setup function returning the callable to time
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark
+
+    The decorated function runs once, untimed, and returns the callable to time.
+
+    Args:
+        name (str): Unique name, use "/" to group related benchmarks
+    """
+
+    def decorator(setup: Callable[[], Callable[[], object]]):
+        if name in BENCHMARKS:
+            raise ValueError(f"Benchmark {name} is already registered")
+        BENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+
+def measure(func: Callable[[], object], repeat: int = 5) -> Dict[str, float]:
+    """Time a callable
+
+    Args:
+        func (Callable[[], object]): Callable to time
+        repeat (int, optional): Number of timed rounds. Defaults to 5.
+
+    Returns:
+        Dict[str, float]: Best and median seconds per call, and loops per round
+    """
+    timer = timeit.Timer(func)
+    loops, _ = timer.autorange()
+    times = [t / loops for t in timer.repeat(repeat=repeat, number=loops)]
+    return {"min": min(times), "median": statistics.median(times), "loops": loops}
+
+
+def run(
+    pattern: str = "*",
+    repeat: int = 5,
+    progress: Optional[Callable[[str, Dict], None]] = None,
+) -> Dict:
+    """Run the registered benchmarks
+
+    Args:
+        pattern (str, optional): Glob selecting benchmarks by name. Defaults to "*".
+        repeat (int, optional): Number of timed rounds per benchmark. Defaults to 5.
+        progress (Callable[[str, Dict], None], optional): Called with every result. Defaults to None.
+
+    Returns:
+        Dict: Machine-readable results with the environment they were measured in
+    """
+    results = {}
+    for name in sorted(fnmatch.filter(BENCHMARKS, pattern)):
+        try:
+            result = measure(BENCHMARKS[name](), repeat)
+        except Exception as e:
+            result = {"error": repr(e)}
+        results[name] = result
+        if progress is not None:
+            progress(name, result)
+
+    return {
+        "environment": {
+            "fold": fold.__version__,
+            "python": sys.version,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict, current: Dict, threshold: float = 0.1
+) -> List[Tuple[str, float, float]]:
+    """Find the benchmarks that got slower than a baseline
+
+    The best time of each benchmark is compared since it is the least sensitive
+    to noise. Benchmarks missing from either run, or that failed, are skipped.
+
+    Args:
+        baseline (Dict): Results of run() to compare against
+        current (Dict): Results of run() to check
+        threshold (float, optional): Allowed relative slowdown. Defaults to 0.1, i.e. 10%.
+
+    Returns:
+        List[Tuple[str, float, float]]: (name, baseline seconds, current seconds) of every regression
+    """
+    regressions = []
+    for name, result in sorted(current["results"].items()):
+        before = baseline["results"].get(name, {})
+        if "min" not in result or "min" not in before:
+            continue
+        if result["min"] > before["min"] * (1 + threshold):
+            regressions.append((name, before["min"], result["min"]))
+    return regressions
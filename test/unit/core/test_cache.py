@@ -0,0 +1,73 @@
+import unittest
+import tempfile
+import datetime
+from pathlib import Path
+
+from fold.core.cache import ConfigCache
+from fold.plugins.config import JSONConfig, TOMLConfig
+
+from .test_config import EchoConfig
+
+
+class TestConfigCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ConfigCache(self.directory.name)
+        self.parsers = {JSONConfig, TOMLConfig}
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def testKeyContent(self):
+        self.assertNotEqual(
+            self.cache.key(b"a", self.parsers), self.cache.key(b"b", self.parsers)
+        )
+
+    def testKeyParsers(self):
+        self.assertNotEqual(
+            self.cache.key(b"a", self.parsers), self.cache.key(b"a", {JSONConfig})
+        )
+
+    def testMiss(self):
+        self.assertIsNone(self.cache.get("foo"))
+
+    def testRoundTrip(self):
+        content = {"foo": ["bar", 1, 2.5, True, None]}
+        self.cache.put("foo", JSONConfig, content)
+        expected = ("fold.plugins.config.json:JSONConfig", content)
+        self.assertTupleEqual(expected, self.cache.get("foo"))
+
+    def testRoundTripPickle(self):
+        """Objects that marshal does not support are still cached"""
+        content = {"date": datetime.date(2022, 1, 1)}
+        self.cache.put("foo", TOMLConfig, content)
+        self.assertDictEqual(content, self.cache.get("foo")[1])
+
+    def testCorrupted(self):
+        Path(self.directory.name, "foo.cache").write_bytes(b"M\x00garbage")
+        self.assertIsNone(self.cache.get("foo"))
+
+    def testClear(self):
+        self.cache.put("foo", JSONConfig, {})
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("foo"))
+
+
+class TestCachedFromPath(unittest.TestCase):
+    def testWarmStart(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ConfigCache(Path(directory) / "cache")
+            path = Path(directory) / "config.json"
+            path.write_text('{"section": {"foo": "bar"}}')
+
+            cold = EchoConfig.fromPath(path, cache=cache)
+            warm = EchoConfig.fromPath(path, cache=cache)
+
+        with self.subTest("cold"):
+            self.assertFalse(cold.parseResult.cached)
+        with self.subTest("warm"):
+            self.assertTrue(warm.parseResult.cached)
+            self.assertEqual(0, warm.parseResult.attempts)
+            self.assertEqual(JSONConfig, warm.parseResult.parser)
+        with self.subTest("content"):
+            self.assertDictEqual(cold.section.config, warm.section.config)
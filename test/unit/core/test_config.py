@@ -0,0 +1,281 @@
+import unittest
+import io
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from decimal import Decimal
+import tempfile
+from pathlib import Path
+
+from fold.core.config import BaseConfig, ConfigError, ConfigManager
+from fold.plugins.config import ConfigFilePlugin, JSONConfig, ParserRegistry, TOMLConfig
+
+
+class EchoManager(ConfigManager):
+    """Config manager that keeps the raw content"""
+
+    @classmethod
+    def parseDict(cls, config):
+        return config
+
+
+class EchoConfig(BaseConfig):
+    section: EchoManager
+
+
+class CountingParser(ConfigFilePlugin):
+    """Parser that records how often it was called and always fails"""
+
+    calls = 0
+
+    @classmethod
+    def parseConfig(cls, config):
+        return config
+
+    @classmethod
+    def fromText(cls, text):
+        CountingParser.calls += 1
+        raise ValueError("Not my format")
+
+    @classmethod
+    def sniff(cls, head):
+        return 0.1
+
+
+class TestParserRanking(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.parsers = {JSONConfig, TOMLConfig}
+
+    def _test(self, expected, text, extension=None):
+        ranked = BaseConfig.rankParsers(text, self.parsers, extension)
+        self.assertEqual(expected, ranked[0])
+
+    def testJSON(self):
+        self._test(JSONConfig, '{"foo": "bar"}')
+
+    def testTOMLKey(self):
+        self._test(TOMLConfig, 'foo = "bar"')
+
+    def testTOMLTable(self):
+        self._test(TOMLConfig, '# comment\n[foo]\nbar = 1')
+
+    def testExtensionFirst(self):
+        """The extension hint wins over the sniffed format"""
+        self._test(TOMLConfig, '{"foo": "bar"}', ".TOML")
+
+    def testLazyNotSniffed(self):
+        """Ranking lazy parsers does not import them"""
+        registry = ParserRegistry(modules=["fold.plugins.config"], lazy=True)
+        ranked = BaseConfig.rankParsers('{"foo": "bar"}', registry, ".json")
+        self.assertEqual("JSONConfig", ranked[0].__name__)
+        self.assertFalse(any(parser.loaded for parser in ranked))
+
+    def testDeterministic(self):
+        ranked = BaseConfig.rankParsers("???", self.parsers)
+        self.assertListEqual([JSONConfig, TOMLConfig], ranked)
+
+
+class TestParseText(unittest.TestCase):
+    def setUp(self) -> None:
+        CountingParser.calls = 0
+
+    def testSingleAttempt(self):
+        parsers = {CountingParser, JSONConfig, TOMLConfig}
+        result = BaseConfig.parseText('{"foo": "bar"}', parsers)
+        with self.subTest("parser"):
+            self.assertEqual(JSONConfig, result.parser)
+        with self.subTest("attempts"):
+            self.assertEqual(1, result.attempts)
+        with self.subTest("skipped"):
+            self.assertEqual(0, CountingParser.calls)
+
+    def testFallback(self):
+        """A misleading sniff still falls back to the remaining parsers"""
+        parsers = {CountingParser, TOMLConfig}
+        result = BaseConfig.parseText("foo = 1", parsers, extension="json")
+        self.assertEqual(TOMLConfig, result.parser)
+
+    def testNoParser(self):
+        self.assertRaises(ConfigError, BaseConfig.parseText, "foo", {CountingParser})
+
+
+class TestFromText(unittest.TestCase):
+    def testSubclass(self):
+        config = EchoConfig.fromText('{"section": {"foo": "bar"}}')
+        with self.subTest("type"):
+            self.assertIsInstance(config, EchoConfig)
+        with self.subTest("content"):
+            self.assertDictEqual({"foo": "bar"}, config.section.config)
+        with self.subTest("result"):
+            self.assertEqual(JSONConfig, config.parseResult.parser)
+
+    def testFromPath(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "config.toml"
+            path.write_text("[section]\nfoo = 'bar'\n")
+            config = EchoConfig.fromPath(path)
+        self.assertEqual(TOMLConfig, config.parseResult.parser)
+        self.assertEqual(1, config.parseResult.attempts)
+
+
+class TestFromStream(unittest.TestCase):
+    def testStream(self):
+        stream = io.StringIO('{"unused": [1, 2, 3], "section": {"foo": "bar"}}')
+        config = EchoConfig.fromStream(stream)
+        self.assertDictEqual({"foo": "bar"}, config.section.config)
+
+    def testInvalid(self):
+        stream = io.StringIO('{"section": {"foo": ')
+        self.assertRaises(ConfigError, EchoConfig.fromStream, stream)
+
+    def testNotStreamable(self):
+        stream = io.StringIO("[section]")
+        self.assertRaises(NotImplementedError, EchoConfig.fromStream, stream, TOMLConfig)
+
+    def testFromPath(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "config.json"
+            path.write_text('{"section": {"foo": "bar"}}')
+            config = EchoConfig.fromPath(path, stream=True)
+        self.assertDictEqual({"foo": "bar"}, config.section.config)
+
+    def testOtherFormat(self):
+        """Parsers of another format are not tried"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "config.toml"
+            path.write_text("[section]\nfoo = 'bar'\n")
+            with self.assertRaisesRegex(ConfigError, "No parser can stream"):
+                EchoConfig.fromPath(path, stream=True)
+
+    def testUnsupportedSection(self):
+        """A manager unable to parse a section is a config error, not a parser unable to stream"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "config.json"
+            path.write_text('{"unused": {}, "section": 5}')
+            with self.assertRaisesRegex(ConfigError, "Invalid section section") as context:
+                EchoConfig.fromPath(path, stream=True)
+        self.assertIsInstance(context.exception.__cause__, NotImplementedError)
+
+
+class LazyConfig(EchoConfig):
+    other: EchoManager
+
+    class Config:
+        lazy = True
+
+
+class TestLazyConfig(unittest.TestCase):
+    def setUp(self) -> None:
+        self.config = LazyConfig(section={"foo": "bar"}, other="invalid")
+
+    def testDeferred(self):
+        with self.subTest("pending"):
+            self.assertFalse(self.config.section.materialized)
+        with self.subTest("isinstance"):
+            self.assertIsInstance(self.config.section, EchoManager)
+
+    def testFirstAccess(self):
+        self.assertDictEqual({"foo": "bar"}, self.config.section.config)
+        self.assertTrue(self.config.section.materialized)
+
+    def testInvalidAccess(self):
+        """Errors surface on first use"""
+        self.assertRaises(NotImplementedError, getattr, self.config.other, "config")
+
+    def testMaterialize(self):
+        self.assertRaises(ConfigError, self.config.materialize)
+        with self.subTest("unwrapped"):
+            self.assertIs(EchoManager, type(self.config.section))
+
+
+class EagerConfig(EchoConfig):
+    other: EchoManager
+
+
+class TestFromContentParallel(unittest.TestCase):
+    def setUp(self) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=2)
+
+    def tearDown(self) -> None:
+        self.executor.shutdown()
+
+    def testMatchesSerial(self):
+        content = {"section": {"foo": "bar"}, "other": {"hello": "world"}}
+        expected = EagerConfig(**content)
+        result = EagerConfig.fromContent(content, self.executor)
+        for key in content:
+            with self.subTest(key):
+                self.assertDictEqual(getattr(expected, key).config, getattr(result, key).config)
+
+    def testCollectErrors(self):
+        content = {"section": "invalid", "other": 1}
+        with self.assertRaises(ConfigError) as context:
+            EagerConfig.fromContent(content, self.executor)
+        self.assertSetEqual({"section", "other"}, set(context.exception.errors))
+
+    def testFromText(self):
+        config = EagerConfig.fromText(
+            '{"section": {"foo": "bar"}, "other": {}}', executor=self.executor
+        )
+        self.assertEqual(JSONConfig, config.parseResult.parser)
+
+
+class DispatchManager(ConfigManager):
+    """Config manager that records which parse method handled each value"""
+
+    DISPATCH = {**ConfigManager.DISPATCH, Decimal: "parseDecimal"}
+    batches = []
+
+    @classmethod
+    def parseBool(cls, config):
+        return ("bool", config)
+
+    @classmethod
+    def parseInt(cls, config):
+        return ("int", config)
+
+    @classmethod
+    def parseDecimal(cls, config):
+        return ("decimal", config)
+
+    @classmethod
+    def parseDict(cls, config):
+        return ("dict", config)
+
+    @classmethod
+    def parseBatch(cls, kind, config):
+        cls.batches.append((kind, len(config)))
+        return super().parseBatch(kind, config)
+
+
+class TestConfigManagerDispatch(unittest.TestCase):
+    def setUp(self) -> None:
+        DispatchManager.batches = []
+
+    def _test(self, expected, config):
+        self.assertEqual(expected, DispatchManager.parseConfig(config))
+
+    def testBool(self):
+        """Booleans are not treated as integers"""
+        self._test(("bool", True), True)
+
+    def testInt(self):
+        self._test(("int", 1), 1)
+
+    def testExtended(self):
+        self._test(("decimal", Decimal("1.5")), Decimal("1.5"))
+
+    def testSubclass(self):
+        """Subclasses of content types use the base type's method"""
+        self._test(("dict", {"foo": 1}), OrderedDict(foo=1))
+
+    def testUnsupported(self):
+        self.assertRaises(TypeError, DispatchManager.parseConfig, object())
+
+    def testHomogeneousList(self):
+        self._test([("int", 1), ("int", 2)], [1, 2])
+        self.assertListEqual([(int, 2)], DispatchManager.batches)
+
+    def testMixedList(self):
+        self._test([("int", 1), ("bool", False)], [1, False])
+        self.assertListEqual([], DispatchManager.batches)
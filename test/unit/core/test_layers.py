@@ -0,0 +1,87 @@
+import unittest
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from fold.core.config import BaseConfig, ConfigError
+from fold.core.layers import ConfigLoader, environmentOverlay
+
+from .test_config import EagerConfig
+
+
+class TestConfigLoader(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name).resolve()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _write(self, name: str, text: str) -> Path:
+        path = self.root / name
+        path.write_text(text)
+        return path
+
+    def testOverlay(self):
+        base = self._write("base.json", '{"section": {"foo": 1, "bar": [1, 2]}}')
+        overlay = self._write("overlay.toml", "[section]\nbar = [3]\n")
+        layered = ConfigLoader().load(base, overlay)
+        with self.subTest("content"):
+            self.assertDictEqual({"section": {"foo": 1, "bar": [3]}}, layered.content)
+        with self.subTest("origin"):
+            self.assertEqual(base, layered.origin("section", "foo"))
+            self.assertEqual(overlay, layered.origin("section", "bar"))
+
+    def testScalarReplacedByMapping(self):
+        """The file that set a scalar is forgotten once a mapping replaces it"""
+        base = self._write("base.json", '{"section": 1}')
+        overlay = self._write("overlay.json", '{"section": {"foo": 2}}')
+        layered = ConfigLoader().load(base, overlay)
+        self.assertEqual(overlay, layered.origin("section", "foo"))
+        self.assertIsNone(layered.origin("section"))
+        self.assertIsNone(layered.origin("section", "bar"))
+
+    def testEmptyMappingFilled(self):
+        base = self._write("base.json", '{"section": {}}')
+        overlay = self._write("overlay.json", '{"section": {"foo": 2}}')
+        layered = ConfigLoader().load(base, overlay)
+        self.assertIsNone(layered.origin("section", "bar"))
+
+    def testInclude(self):
+        """Included files have a lower precedence than the file including them"""
+        self._write("common.json", '{"section": {"foo": 1, "bar": 1}}')
+        base = self._write("base.json", '{"include": "common.json", "section": {"foo": 2}}')
+        layered = ConfigLoader().load(base)
+        self.assertDictEqual({"section": {"foo": 2, "bar": 1}}, layered.content)
+        self.assertEqual(self.root / "common.json", layered.origin("section", "bar"))
+
+    def testSharedIncludeParsedOnce(self):
+        self._write("common.json", '{"section": {"foo": 1}}')
+        a = self._write("a.json", '{"include": ["common.json"], "a": 1}')
+        b = self._write("b.json", '{"include": ["common.json"], "b": 1}')
+        with patch.object(BaseConfig, "parsePath", wraps=BaseConfig.parsePath) as parsePath:
+            layered = ConfigLoader().load(a, b)
+        with self.subTest("parsed"):
+            self.assertEqual(3, parsePath.call_count)
+        with self.subTest("merged"):
+            self.assertListEqual([self.root / "common.json", a, b], layered.files)
+
+    def testCycle(self):
+        a = self._write("a.json", '{"include": "b.json"}')
+        self._write("b.json", '{"include": "a.json"}')
+        self.assertRaises(ConfigError, ConfigLoader().load, a)
+
+    def testMissing(self):
+        a = self._write("a.json", '{"include": "missing.json"}')
+        self.assertRaises(ConfigError, ConfigLoader().load, a)
+
+
+class TestFromPaths(unittest.TestCase):
+    def testEnvironment(self):
+        with tempfile.TemporaryDirectory() as directory:
+            base = Path(directory, "config.json")
+            base.write_text('{"section": {"foo": 1}, "other": {}}')
+            environmentOverlay(base, "prod").write_text('{"section": {"foo": 2}}')
+            config = EagerConfig.fromPaths(base, environment="prod")
+        self.assertDictEqual({"foo": 2}, config.section.config)
+        self.assertEqual(2, len(config.layers.files))
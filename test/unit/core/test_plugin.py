@@ -1,8 +1,13 @@
 import unittest
+import sys
+import tempfile
+import textwrap
+from pathlib import Path
+from unittest.mock import patch
 
 from fold.core.plugin import Plugin
 
-from fold.utils.plugin import PluginManager
+from fold.utils.plugin import PluginManager, PluginRegistry
 
 
 class TestPlugin(unittest.TestCase):
@@ -109,3 +114,176 @@ class TestPluginManagerDiscovery(unittest.TestCase):
         self.manager.discover(path, cache=True)
         expected = {path: test.unit.sample_plugins}
         self.assertDictEqual(expected, self.manager.cache)
+
+
+class TestPluginRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        from .sample_plugins import P1, P2
+
+        self.P1, self.P2 = P1, P2
+        self.registry = PluginRegistry(Plugin, ["test.unit.core.sample_plugins"])
+
+    def testDiscover(self):
+        self.assertSetEqual({self.P1, self.P2}, set(self.registry))
+
+    def testMemoized(self):
+        self.registry.plugins
+        with patch.object(PluginManager, "discover") as discover:
+            self.registry.plugins
+        discover.assert_not_called()
+
+    def testUnregister(self):
+        self.registry.unregister(self.P1)
+        self.assertSetEqual({self.P2}, set(self.registry))
+
+    def testRegister(self):
+        class P3(Plugin):
+            @classmethod
+            def parseConfig(cls, config):
+                return config
+
+        self.registry.register(P3)
+        self.assertIn(P3, self.registry)
+
+    def testInvalidateOnFlush(self):
+        self.registry.plugins
+        PluginManager(Plugin).flushCache()
+        with patch.object(PluginManager, "discover", return_value=set()) as discover:
+            self.registry.plugins
+        discover.assert_called_once()
+
+
+class TestLazyPlugin(unittest.TestCase):
+    PACKAGE = "fold_lazy_sample"
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.directory = tempfile.TemporaryDirectory()
+        root = Path(cls.directory.name, cls.PACKAGE)
+        root.mkdir()
+        (root / "__init__.py").write_text(
+            textwrap.dedent(
+                """
+                from fold.core.plugin import Plugin
+
+                class Lazy(Plugin):
+                    EXTENSIONS = {"lazy"}
+
+                    def __init__(self, config, *args, **kwargs):
+                        super().__init__(config, *args, **kwargs)
+
+                    @classmethod
+                    def parseConfig(cls, config):
+                        return {"parsed": config}
+                """
+            )
+        )
+        sys.path.insert(0, cls.directory.name)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        sys.path.remove(cls.directory.name)
+        sys.modules.pop(cls.PACKAGE, None)
+        cls.directory.cleanup()
+
+    def setUp(self) -> None:
+        sys.modules.pop(self.PACKAGE, None)
+        manager = PluginManager(Plugin)
+        manager._cache = {}
+        (self.plugin,) = manager.discover(self.PACKAGE, lazy=True)
+
+    def testMetadata(self):
+        with self.subTest("name"):
+            self.assertEqual("Lazy", self.plugin.__name__)
+        with self.subTest("attributes"):
+            self.assertSetEqual({"lazy"}, self.plugin.EXTENSIONS)
+        with self.subTest("not imported"):
+            self.assertNotIn(self.PACKAGE, sys.modules)
+            self.assertFalse(self.plugin.loaded)
+
+    def testMethodCall(self):
+        self.assertDictEqual({"parsed": 1}, self.plugin.parseConfig(1))
+        self.assertIn(self.PACKAGE, sys.modules)
+
+    def testInstantiate(self):
+        instance = self.plugin("config")
+        self.assertEqual("config", instance.config)
+        self.assertIs(self.plugin.resolve(), type(instance))
+        self.assertNotEqual(self.plugin, type(instance))
+
+    def testLazyRegistry(self):
+        registry = PluginRegistry(Plugin, [self.PACKAGE], lazy=True)
+        self.assertIn("Lazy", registry.byName)
+        self.assertNotIn(self.PACKAGE, sys.modules)
+
+    def testLazyRegistryClass(self):
+        """The class a proxy stands for is the same plugin in a registry"""
+        registry = PluginRegistry(Plugin, [self.PACKAGE], lazy=True)
+        plugin = self.plugin.resolve()
+        self.assertIn(plugin, registry)
+        registry.register(plugin)
+        self.assertEqual(1, len(registry))
+        registry.unregister(plugin)
+        self.assertNotIn(plugin, registry)
+        self.assertEqual(0, len(registry))
+
+
+class TestPluginManagerDiscoverPackage(unittest.TestCase):
+    PACKAGE = "fold_tree_sample"
+    PLUGIN = textwrap.dedent(
+        """
+        from fold.core.plugin import Plugin
+
+        class {name}(Plugin):
+            @classmethod
+            def parseConfig(cls, config):
+                return config
+        """
+    )
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.directory = tempfile.TemporaryDirectory()
+        root = Path(cls.directory.name, cls.PACKAGE)
+        (root / "sub").mkdir(parents=True)
+        (root / "__init__.py").write_text("")
+        (root / "a.py").write_text(cls.PLUGIN.format(name="A"))
+        (root / "broken.py").write_text("raise ImportError('broken')\n")
+        (root / "sub" / "__init__.py").write_text("")
+        (root / "sub" / "b.py").write_text(cls.PLUGIN.format(name="B"))
+        (root / "sub" / "c.py").write_text("from ..a import A as C\n")
+        sys.path.insert(0, cls.directory.name)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        sys.path.remove(cls.directory.name)
+        for name in list(sys.modules):
+            if name.startswith(cls.PACKAGE):
+                del sys.modules[name]
+        cls.directory.cleanup()
+
+    def setUp(self) -> None:
+        self.manager = PluginManager(Plugin)
+        self.result = self.manager.discoverPackage(self.PACKAGE, cache=False)
+
+    def testPlugins(self):
+        names = [plugin.__qualname__ for plugin in self.result.plugins]
+        self.assertListEqual(["A", "B"], names)
+
+    def testErrors(self):
+        self.assertSetEqual({f"{self.PACKAGE}.broken"}, set(self.result.errors))
+
+    def testTimings(self):
+        expected = {
+            self.PACKAGE,
+            f"{self.PACKAGE}.a",
+            f"{self.PACKAGE}.broken",
+            f"{self.PACKAGE}.sub",
+            f"{self.PACKAGE}.sub.b",
+            f"{self.PACKAGE}.sub.c",
+        }
+        self.assertSetEqual(expected, set(self.result.timings))
+
+    def testDeterministic(self):
+        again = self.manager.discoverPackage(self.PACKAGE, cache=False)
+        self.assertListEqual(self.result.plugins, again.plugins)
@@ -0,0 +1,288 @@
+import unittest
+import io
+import tempfile
+import os
+import sys
+import textwrap
+import threading
+from pathlib import Path
+
+from fold.core.config import BaseConfig, ConfigError, ConfigManager
+from fold.core.reload import CallGate, ConfigWatcher, diffContent, reloadPlugins
+from fold.plugins.logger import LogManager, logger
+from fold.plugins.outputs import OutputManager, OutputPlugin, OutputPluginConfig
+from fold.utils.cache import ImportCache
+from fold.utils.imp import getResolver
+from fold.utils.plugin import PluginManager
+
+
+class CountingManager(ConfigManager):
+    """Config manager that counts constructions and closes"""
+
+    built = 0
+    closed = 0
+
+    def __init__(self, config, *args, **kwargs) -> None:
+        super().__init__(config, *args, **kwargs)
+        CountingManager.built += 1
+
+    def close(self) -> None:
+        CountingManager.closed += 1
+
+    @classmethod
+    def parseDict(cls, config):
+        if "invalid" in config:
+            raise ValueError("Invalid section")
+        return config
+
+
+class ReloadConfig(BaseConfig):
+    log: CountingManager
+    outputs: CountingManager
+
+
+class LogConfig(BaseConfig):
+    log: LogManager
+    outputs: CountingManager
+
+
+class TestDiffContent(unittest.TestCase):
+    def testUnchanged(self):
+        content = {"log": {"sink": "stdout"}}
+        self.assertFalse(diffContent(content, content))
+
+    def testSections(self):
+        old = {"log": {"sink": "stdout"}, "outputs": {"name": "a"}, "gone": {}}
+        new = {"log": {"sink": "stderr"}, "outputs": {"name": "a"}, "new": {}}
+        diff = diffContent(old, new)
+        with self.subTest("added"):
+            self.assertSetEqual({"new"}, diff.added)
+        with self.subTest("removed"):
+            self.assertSetEqual({"gone"}, diff.removed)
+        with self.subTest("changed"):
+            self.assertSetEqual({"log"}, diff.changed)
+
+    def testPaths(self):
+        old = {"outputs": [{"name": "a"}, {"name": "b"}]}
+        new = {"outputs": [{"name": "a"}, {"name": "c"}, {"name": "d"}]}
+        expected = [("outputs", 1, "name"), ("outputs", 2)]
+        self.assertListEqual(expected, diffContent(old, new).paths)
+
+    def testTypeChange(self):
+        """Equal values of a different type still differ"""
+        diff = diffContent({"log": {"level": 1}}, {"log": {"level": True}})
+        self.assertListEqual([("log", "level")], diff.paths)
+
+    def testUnknown(self):
+        self.assertSetEqual({"log"}, diffContent(None, {"log": {}}).changed)
+
+
+class TestReload(unittest.TestCase):
+    def setUp(self) -> None:
+        self.content = {"log": {"sink": "stdout"}, "outputs": {"name": "a"}}
+        self.config = ReloadConfig(**self.content)
+        CountingManager.built = CountingManager.closed = 0
+
+    def testPartialRebuild(self):
+        outputs = self.config.outputs
+        diff = self.config.reload({**self.content, "log": {"sink": "stderr"}})
+        with self.subTest("diff"):
+            self.assertSetEqual({"log"}, diff.sections)
+        with self.subTest("rebuilt"):
+            self.assertEqual(1, CountingManager.built)
+            self.assertEqual(1, CountingManager.closed)
+            self.assertDictEqual({"sink": "stderr"}, self.config.log.config)
+        with self.subTest("kept"):
+            self.assertIs(outputs, self.config.outputs)
+
+    def testNoChange(self):
+        self.assertFalse(self.config.reload(dict(self.content)))
+        self.assertEqual(0, CountingManager.built)
+
+    def testInvalid(self):
+        """A failed reload leaves every section untouched"""
+        log = self.config.log
+        content = {"log": {"sink": "stderr"}, "outputs": {"invalid": True}}
+        self.assertRaises(ConfigError, self.config.reload, content)
+        self.assertIs(log, self.config.log)
+        self.assertEqual(0, CountingManager.built)
+
+    def testInvalidKeepsLogHandlers(self):
+        """A section failing to parse stops the managers of other sections from being built"""
+        stream, other = io.StringIO(), io.StringIO()
+        config = LogConfig(log={"sink": stream}, outputs={"name": "a"})
+        try:
+            handlers = dict(logger._core.handlers)
+            content = {"log": {"sink": other}, "outputs": {"invalid": True}}
+            self.assertRaises(ConfigError, config.reload, content)
+            self.assertDictEqual(handlers, dict(logger._core.handlers))
+            logger.info("kept")
+            self.assertIn("kept", stream.getvalue())
+            self.assertEqual("", other.getvalue())
+        finally:
+            logger.remove()
+
+    def testReloadPath(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "config.json"
+            path.write_text('{"log": {"sink": "stdout"}, "outputs": {"name": "b"}}')
+            diff = self.config.reloadPath(path)
+        self.assertSetEqual({"outputs"}, diff.changed)
+
+
+class TestConfigWatcher(unittest.TestCase):
+    def testPoll(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "config.json"
+            path.write_text('{"log": {}, "outputs": {}}')
+            config = ReloadConfig.fromPath(path)
+            diffs = []
+            watcher = ConfigWatcher(config, path, onReload=diffs.append)
+
+            with self.subTest("unchanged"):
+                self.assertIsNone(watcher.poll())
+
+            path.write_text('{"log": {"sink": "stderr"}, "outputs": {}}')
+            os.utime(path, ns=(0, 1))  # guarantee a different mtime
+            with self.subTest("changed"):
+                self.assertSetEqual({"log"}, watcher.poll().changed)
+                self.assertEqual(1, len(diffs))
+
+
+class TestCallGate(unittest.TestCase):
+    def testDrainWaitsForCalls(self):
+        gate = CallGate()
+        entered, release = threading.Event(), threading.Event()
+
+        def call():
+            with gate.call():
+                entered.set()
+                release.wait()
+
+        thread = threading.Thread(target=call)
+        thread.start()
+        entered.wait()
+        with self.assertRaises(TimeoutError):
+            with gate.drain(timeout=0.01):
+                pass
+        release.set()
+        thread.join()
+        with gate.drain(timeout=1):
+            pass
+
+
+class TestReloadPackage(unittest.TestCase):
+    PACKAGE = "fold_reload_package"
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name, self.PACKAGE)
+        self.root.mkdir()
+        self._write(1)
+        sys.path.insert(0, self.directory.name)
+        self.plugins = PluginManager(OutputPlugin, ImportCache())
+
+    def tearDown(self) -> None:
+        sys.path.remove(self.directory.name)
+        for name in (self.PACKAGE, f"{self.PACKAGE}.mod"):
+            sys.modules.pop(name, None)
+        self.directory.cleanup()
+
+    def _write(self, version: int) -> None:
+        sources = {
+            "__init__.py": f"from .mod import Sample\nVERSION = {version}\n",
+            "mod.py": textwrap.dedent(
+                f"""
+                from fold.plugins.outputs import OutputPlugin
+
+                class Sample(OutputPlugin):
+                    VERSION = {version}
+                """
+            ),
+        }
+        for name, source in sources.items():
+            path = self.root / name
+            path.write_text(source)
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + version * 10**9))
+
+    def testPackageAndSubmodule(self):
+        """A changed package re-exports the plugin of its changed submodule"""
+        self.plugins.discover(f"{self.PACKAGE}.mod")
+        self.plugins.discover(self.PACKAGE)
+        self._write(2)
+        report = self.plugins.reload()
+        self.assertListEqual([f"{self.PACKAGE}.mod", self.PACKAGE], report.modules)
+        (plugin,) = self.plugins.discover(self.PACKAGE)
+        self.assertEqual(2, plugin.VERSION)
+
+
+class TestReloadPlugins(unittest.TestCase):
+    MODULE = "fold_reload_sample"
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = Path(self.directory.name, f"{self.MODULE}.py")
+        self._write(1)
+        sys.path.insert(0, self.directory.name)
+        self.plugins = PluginManager(OutputPlugin, ImportCache())
+
+    def tearDown(self) -> None:
+        sys.path.remove(self.directory.name)
+        sys.modules.pop(self.MODULE, None)
+        self.directory.cleanup()
+
+    def _write(self, version: int) -> None:
+        self.source.write_text(
+            textwrap.dedent(
+                f"""
+                from fold.plugins.outputs import OutputPlugin
+
+                class Sample(OutputPlugin):
+                    VERSION = {version}
+                    written = []
+
+                    @classmethod
+                    def parseConfig(cls, config):
+                        return config
+
+                    def write(self, data):
+                        self.written.append((self.VERSION, data))
+                """
+            )
+        )
+        stat = self.source.stat()
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + version * 10**9))
+
+    def testSwapInstances(self):
+        plugin = self.plugins.load(f"{self.MODULE}:Sample")
+        manager = OutputManager(OutputPluginConfig(name="Sample"), {"Sample": plugin})
+        manager.write("old")
+        self._write(2)
+
+        report = reloadPlugins(plugins=self.plugins)
+        self.assertListEqual([self.MODULE], report.modules)
+        self.assertIn(manager, report.managers)
+        manager.write("new")
+        self.assertListEqual([(2, "new")], manager.handlers[0].written)
+        self.assertEqual(2, self.plugins.load(f"{self.MODULE}:Sample").VERSION)
+
+    def testResolverInvalidated(self):
+        """Import strings resolve to the reloaded objects"""
+        self.plugins.load(f"{self.MODULE}:Sample")
+        self.assertEqual(1, getResolver().resolve(f"{self.MODULE}:Sample").VERSION)
+        self._write(2)
+        reloadPlugins(plugins=self.plugins)
+        self.assertEqual(2, getResolver().resolve(f"{self.MODULE}:Sample").VERSION)
+
+    def testUnchanged(self):
+        self.plugins.load(f"{self.MODULE}:Sample")
+        report = reloadPlugins(plugins=self.plugins)
+        self.assertListEqual([], report.modules)
+
+    def testImportErrorKeepsPlugin(self):
+        plugin = self.plugins.load(f"{self.MODULE}:Sample")
+        self.source.write_text("raise RuntimeError")
+        report = reloadPlugins([self.MODULE], self.plugins)
+        self.assertIsInstance(report.errors[self.MODULE], RuntimeError)
+        self.assertIs(plugin, sys.modules[self.MODULE].Sample)
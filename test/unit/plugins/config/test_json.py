@@ -1,4 +1,6 @@
 import unittest
+import io
+import json
 
 from fold.plugins.config.json import JSONConfig
 
@@ -129,3 +131,54 @@ class TestJSONConfigParser(unittest.TestCase):
             ]
         }
         self._test(content, expected)
+
+
+class TestJSONConfigSniff(unittest.TestCase):
+    def _test(self, expected: float, head: str):
+        self.assertEqual(expected, JSONConfig.sniff(head))
+
+    def testOwnFormat(self):
+        self._test(1.0, '{"foo": 1}')
+
+    def testOtherFormat(self):
+        self._test(0.0, "foo = 1")
+
+
+class TestJSONConfigStream(unittest.TestCase):
+    def _test(self, content: str, chunkSize: int = 3):
+        expected = json.loads(content)
+        with self.subTest("text"):
+            sections = JSONConfig.iterSections(io.StringIO(content), chunkSize)
+            self.assertDictEqual(expected, dict(sections))
+        with self.subTest("binary"):
+            sections = JSONConfig.iterSections(io.BytesIO(content.encode()), chunkSize)
+            self.assertDictEqual(expected, dict(sections))
+
+    def testEmptyFile(self):
+        self._test("{}")
+
+    def testSections(self):
+        self._test(
+            """
+            {
+                "pokemon": {"pikachu": "electric", "mew": "psychic"},
+                "shapes": ["square", "circle"],
+                "count": 12345,
+                "enabled": true
+            }
+            """
+        )
+
+    def testSplitCharacter(self):
+        """Multi-byte characters split across chunks"""
+        self._test('{"name": "Pokémon ポケモン"}', chunkSize=1)
+
+    def testLazy(self):
+        """Sections are yielded before the rest of the file is read"""
+        sections = JSONConfig.iterSections(io.StringIO('{"foo": 1, "bar": '), 4)
+        self.assertTupleEqual(("foo", 1), next(sections))
+        self.assertRaises(ValueError, next, sections)
+
+    def testNotAnObject(self):
+        sections = JSONConfig.iterSections(io.StringIO("[1, 2]"))
+        self.assertRaises(ValueError, list, sections)
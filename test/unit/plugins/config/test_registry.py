@@ -0,0 +1,46 @@
+import unittest
+
+from fold.plugins.config import ConfigFilePlugin, JSONConfig, TOMLConfig
+from fold.plugins.config.registry import ParserRegistry
+
+
+class YAMLConfig(ConfigFilePlugin):
+    EXTENSIONS = {".YML", "yaml"}
+
+    @classmethod
+    def parseConfig(cls, config):
+        return config
+
+    @classmethod
+    def fromText(cls, text):
+        raise NotImplementedError
+
+
+class TestParserRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = ParserRegistry(modules=["fold.plugins.config"])
+
+    def testDiscover(self):
+        self.assertSetEqual({JSONConfig, TOMLConfig}, set(self.registry))
+
+    def testByExtension(self):
+        with self.subTest("dotted"):
+            self.assertSetEqual({JSONConfig}, self.registry.byExtension(".json"))
+        with self.subTest("upper case"):
+            self.assertSetEqual({TOMLConfig}, self.registry.byExtension("TOML"))
+        with self.subTest("unknown"):
+            self.assertSetEqual(set(), self.registry.byExtension(".ini"))
+
+    def testRegister(self):
+        self.registry.register(YAMLConfig)
+        with self.subTest("yml"):
+            self.assertSetEqual({YAMLConfig}, self.registry.byExtension("yml"))
+        with self.subTest("yaml"):
+            self.assertSetEqual({YAMLConfig}, self.registry.byExtension(".yaml"))
+
+    def testUnregister(self):
+        self.registry.unregister(JSONConfig)
+        self.assertSetEqual(set(), self.registry.byExtension("json"))
+
+    def testOrdered(self):
+        self.assertTupleEqual((JSONConfig, TOMLConfig), self.registry.ordered)
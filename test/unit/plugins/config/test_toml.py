@@ -142,3 +142,14 @@ class TestTOMLConfigParser(unittest.TestCase):
             ]
         }
         self._test(content, expected)
+
+
+class TestTOMLConfigSniff(unittest.TestCase):
+    def _test(self, expected: float, head: str):
+        self.assertEqual(expected, TOMLConfig.sniff(head))
+
+    def testOwnFormat(self):
+        self._test(0.9, "foo = 1")
+
+    def testOtherFormat(self):
+        self._test(0.0, '{"foo": 1}')
@@ -1,6 +1,10 @@
 from unittest import TestCase
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
 from pydantic import ValidationError
 from fold.plugins.outputs.common import OutputPlugin, OutputManager, OutputPluginConfig
+from fold.utils.dag import DependencyCycleError, DependencyError
+from fold.utils.plugin import PluginManager
 
 
 class TestOutputHandlerConfig(TestCase):
@@ -70,3 +74,115 @@ class TestOutputManager(TestCase):
                 self.assertSetEqual(manager.handlers, set())
             with self.subTest("plugins"):
                 self.assertDictEqual(manager.plugins, self.mockPlugins)
+
+
+class TestOutputManagerParseList(TestCase):
+    def testDiscoverOnce(self):
+        """Plugins are discovered at most once per list rather than once per entry"""
+        config = [{"name": "Stdout"}] * 3
+        manager = PluginManager(OutputPlugin)
+        with patch.object(PluginManager, "discover", wraps=manager.discover) as discover:
+            OutputManager.parseConfig(config)
+        self.assertLessEqual(discover.call_count, 1)
+
+    def testDefaultPluginsMemoized(self):
+        OutputManager.DEFAULT_PLUGINS
+        with patch.object(PluginManager, "discover") as discover:
+            OutputManager.DEFAULT_PLUGINS
+        discover.assert_not_called()
+
+
+class TestOutputManagerDependencies(TestCase):
+    def _plugin(self, name, requires=(), fail=False):
+        constructed = self.constructed
+
+        class Handler:
+            REQUIRES = frozenset(requires)
+            closed = False
+
+            def __init__(self, config, dependencies=None) -> None:
+                if fail:
+                    raise RuntimeError(name)
+                self.dependencies = dependencies
+                constructed.append(name)
+
+            def close(self):
+                self.closed = True
+
+        Handler.__name__ = name
+        return Handler
+
+    def setUp(self) -> None:
+        self.constructed = []
+
+    def testOrder(self):
+        plugins = {
+            "cache": self._plugin("cache"),
+            "file": self._plugin("file", ["cache"]),
+            "stdout": self._plugin("stdout"),
+        }
+        config = [OutputPluginConfig(name=name) for name in ("file", "stdout", "cache")]
+        manager = OutputManager(config, plugins)
+        self.assertListEqual(["file", "stdout", "cache"], [type(h).__name__ for h in manager.handlers])
+        self.assertLess(self.constructed.index("cache"), self.constructed.index("file"))
+        self.assertIs(manager.handlers[2], manager.handlers[0].dependencies["cache"])
+
+    def testEmptyWithExecutor(self):
+        with ThreadPoolExecutor(1) as executor:
+            self.assertListEqual([], OutputManager([], {}, executor).handlers)
+
+    def testMissing(self):
+        plugins = {"file": self._plugin("file", ["cache"])}
+        self.assertRaises(KeyError, OutputManager, OutputPluginConfig(name="file"), plugins)
+
+    def testCycle(self):
+        plugins = {"a": self._plugin("a", ["b"]), "b": self._plugin("b", ["a"])}
+        config = [OutputPluginConfig(name="a"), OutputPluginConfig(name="b")]
+        self.assertRaises(DependencyCycleError, OutputManager, config, plugins)
+        self.assertListEqual([], self.constructed)
+
+    def testFailureClosesHandlers(self):
+        plugins = {
+            "cache": self._plugin("cache", fail=True),
+            "file": self._plugin("file", ["cache"]),
+            "stdout": self._plugin("stdout"),
+        }
+        config = [OutputPluginConfig(name=name) for name in ("file", "stdout", "cache")]
+        with self.assertRaises(DependencyError) as context:
+            OutputManager(config, plugins)
+        self.assertDictEqual({0: 2}, context.exception.skipped)
+        self.assertTrue(all(h.closed for h in context.exception.results.values()))
+
+    def _manager(self):
+        self.plugins = {
+            "cache": self._plugin("cache"),
+            "file": self._plugin("file", ["cache"]),
+            "stdout": self._plugin("stdout"),
+        }
+        config = [OutputPluginConfig(name=name) for name in ("file", "stdout", "cache")]
+        return OutputManager(config, self.plugins)
+
+    def testSwapDependency(self):
+        manager = self._manager()
+        old = list(manager.handlers)
+        cache = self._plugin("cache")
+        self.assertTrue(manager.swapPlugins({self.plugins["cache"]: cache}))
+        file, stdout, new = manager.handlers
+        self.assertIsInstance(new, cache)
+        self.assertIs(new, file.dependencies["cache"])
+        self.assertIsNot(old[0], file)
+        self.assertIs(old[1], stdout)
+        self.assertListEqual([True, False, True], [h.closed for h in old])
+
+    def testSwapDependent(self):
+        manager = self._manager()
+        old = list(manager.handlers)
+        file = self._plugin("file", ["cache"])
+        self.assertTrue(manager.swapPlugins({self.plugins["file"]: file}))
+        self.assertIsInstance(manager.handlers[0], file)
+        self.assertIs(old[2], manager.handlers[0].dependencies["cache"])
+        self.assertListEqual([True, False, False], [h.closed for h in old])
+
+    def testSwapUnknown(self):
+        manager = self._manager()
+        self.assertFalse(manager.swapPlugins({self._plugin("other"): self._plugin("other")}))
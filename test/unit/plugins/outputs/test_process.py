@@ -0,0 +1,107 @@
+import unittest
+import os
+import sys
+import tempfile
+import textwrap
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from fold.plugins.outputs.common import OutputManager, OutputPluginConfig
+from fold.plugins.outputs.process import ProcessHandler
+
+
+class TestProcessHandler(unittest.TestCase):
+    """Plugins live in a module of their own so that spawned workers can import them"""
+
+    MODULE = "fold_process_sample"
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.directory = tempfile.TemporaryDirectory()
+        Path(cls.directory.name, f"{cls.MODULE}.py").write_text(
+            textwrap.dedent(
+                """
+                import os
+                from fold.plugins.outputs import OutputPlugin
+
+                class Pid(OutputPlugin):
+                    @classmethod
+                    def parseConfig(cls, config):
+                        return config
+
+                    def write(self, data):
+                        if data == "crash":
+                            os._exit(1)
+                        return (os.getpid(), data)
+                """
+            )
+        )
+        sys.path.insert(0, cls.directory.name)
+        import fold_process_sample
+
+        cls.plugin = fold_process_sample.Pid
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        sys.path.remove(cls.directory.name)
+        sys.modules.pop(cls.MODULE, None)
+        cls.directory.cleanup()
+
+    def testConfig(self):
+        self.assertRaises(ValidationError, OutputPluginConfig, name="Pid", mode="fiber")
+        self.assertRaises(ValidationError, OutputPluginConfig, name="Pid", workers=0)
+
+    def testWrite(self):
+        config = OutputPluginConfig(name="Pid", mode="process")
+        manager = OutputManager(config, {"Pid": self.plugin})
+        try:
+            (handler,) = manager.handlers
+            self.assertIsInstance(handler, ProcessHandler)
+            pid, data = handler.write({"a": 1}).result(timeout=60)
+            self.assertNotEqual(os.getpid(), pid)
+            self.assertDictEqual({"a": 1}, data)
+        finally:
+            manager.close()
+
+    def testRestart(self):
+        handler = ProcessHandler(self.plugin, OutputPluginConfig(name="Pid"))
+        try:
+            with self.assertRaises(BrokenProcessPool):
+                handler.write("crash").result(timeout=60)
+            self.assertEqual("after", handler.write("after").result(timeout=60)[1])
+            # once for the crash, once more when the replayed write crashes alone
+            self.assertEqual(2, handler.restarts)
+            self.assertEqual(1, handler.failures)
+        finally:
+            handler.close()
+
+    def testReplay(self):
+        handler = ProcessHandler(self.plugin, OutputPluginConfig(name="Pid"))
+        try:
+            handler.write("warmup").result(timeout=60)
+            futures = [handler.write(data) for data in ("a", "crash", "b", "c")]
+            with self.assertRaises(BrokenProcessPool):
+                futures[1].result(timeout=60)
+            self.assertListEqual(
+                ["a", "b", "c"], [futures[i].result(timeout=60)[1] for i in (0, 2, 3)]
+            )
+            self.assertEqual(1, handler.failures)
+        finally:
+            handler.close()
+
+    def testManagerFailures(self):
+        config = OutputPluginConfig(name="Pid", mode="process")
+        manager = OutputManager(config, {"Pid": self.plugin})
+        try:
+            manager.write("crash")
+            manager.write("after")
+        finally:
+            manager.close()
+        self.assertEqual(1, manager.failures)
+        self.assertIsInstance(manager.lastError, BrokenProcessPool)
+
+
+if __name__ == "__main__":
+    unittest.main()
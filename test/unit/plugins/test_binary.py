@@ -0,0 +1,117 @@
+import unittest
+import io
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from fold.plugins.logger import LogHandlerConfig, LogManager, logger
+from fold.plugins.logger.binary import MAGIC, BinarySink, BinarySinkConfig, convert, readRecords
+
+
+class TestBinaryLog(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name, "app.bin")
+
+    def tearDown(self) -> None:
+        logger.remove()
+        self.directory.cleanup()
+
+    def _log(self):
+        logger.remove()
+        logger.add(BinarySink(BinarySinkConfig(path=self.path)))
+        logger.debug("first")
+        logger.bind(user="bob").warning("second")
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.exception("third")
+        logger.remove()
+
+    def _read(self, **filters):
+        with open(self.path, "rb") as file:
+            return list(readRecords(file, **filters))
+
+    def testRoundTrip(self):
+        self._log()
+        first, second, third = self._read()
+        self.assertEqual(("first", "DEBUG", 10), (first.message, first.levelName, first.level))
+        self.assertEqual(__name__, first.name)
+        self.assertEqual("_log", first.function)
+        self.assertDictEqual({"user": "bob"}, second.extra)
+        self.assertIn("ZeroDivisionError", third.exception)
+        self.assertIsNone(first.exception)
+
+    def testInterned(self):
+        """Repeated strings are stored once"""
+        logger.remove()
+        logger.add(BinarySink(BinarySinkConfig(path=self.path)))
+        for _ in range(3):
+            logger.info("message")
+        logger.remove()
+        self.assertEqual(1, self.path.read_bytes().count(__file__.encode()))
+
+    def testFilters(self):
+        self._log()
+        self.assertListEqual(["second", "third"], [r.message for r in self._read(level=30)])
+        self.assertListEqual([], self._read(since=time.time() + 60))
+        self.assertEqual(3, len(self._read(until=time.time() + 60)))
+
+    def testAppend(self):
+        self._log()
+        self._log()
+        self.assertEqual(6, len(self._read()))
+        self.assertEqual(1, self.path.read_bytes().count(MAGIC))
+
+    def testTruncated(self):
+        """A log cut anywhere ends after its last complete record"""
+        self._log()
+        data = self.path.read_bytes()
+        for end in range(len(MAGIC), len(data)):
+            records = list(readRecords(io.BytesIO(data[:end])))
+            self.assertLessEqual(len(records), 3)
+            self.assertListEqual(["first", "second", "third"][: len(records)], [r.message for r in records])
+
+    def testAppendAfterTruncation(self):
+        """A writer appending to a log cut mid-frame drops the partial frame"""
+        self._log()
+        data = self.path.read_bytes()
+        self.path.write_bytes(data[:-5])
+        self._log()
+        messages = [r.message for r in self._read()]
+        self.assertListEqual(["first", "second", "first", "second", "third"], messages)
+
+    def testFlushInterval(self):
+        sink = BinarySink(BinarySinkConfig(path=self.path, flush_interval=0.05))
+        try:
+            logger.remove()
+            logger.add(sink)
+            logger.info("idle")
+            deadline = time.monotonic() + 5
+            while (self.path.stat().st_size <= len(MAGIC) or not self._read()) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertListEqual(["idle"], [r.message for r in self._read()])
+        finally:
+            logger.remove()
+
+    def testNotBinaryLog(self):
+        self.assertRaises(ValueError, list, readRecords(io.BytesIO(b"plain text")))
+
+    def testConvert(self):
+        self._log()
+        target = io.StringIO()
+        with open(self.path, "rb") as source:
+            self.assertEqual(2, convert(source, target, level=30))
+        lines = [json.loads(line) for line in target.getvalue().splitlines()]
+        self.assertEqual("second", lines[0]["message"])
+
+    def testConfig(self):
+        LogManager(LogHandlerConfig(sink="binary", binary_sink={"path": self.path}))
+        logger.info("hello")
+        logger.remove()
+        self.assertEqual(["hello"], [r.message for r in self._read()])
+
+
+if __name__ == "__main__":
+    unittest.main()
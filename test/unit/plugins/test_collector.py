@@ -0,0 +1,101 @@
+import unittest
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from fold.plugins.logger import CollectorClient, CollectorSinkConfig, LogCollector, LogManager, logger
+from fold.plugins.logger.collector import COLLECTOR_ENV, collectorPath
+
+
+def waitFor(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestLogCollector(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name, "collector.sock")
+        self.output = io.StringIO()
+
+    def tearDown(self) -> None:
+        logger.remove()
+        self.directory.cleanup()
+
+    def _messages(self, *texts):
+        """Capture loguru messages, with their records, as a client sink would receive them"""
+        messages = []
+        logger.remove()
+        logger.add(messages.append, format="{message}")
+        for text in texts:
+            logger.bind(worker=1).warning(text)
+        logger.remove()
+        return messages
+
+    def _collect(self):
+        logger.add(self.output, format="{level} {name}:{function} {extra[worker]} {message}")
+
+    def testForward(self):
+        messages = self._messages("first", "second")
+        self._collect()
+        client = CollectorClient(CollectorSinkConfig(path=self.path))
+        with LogCollector(self.path, export=False):
+            client.writeBatch(messages)
+            client.stop()
+            self.assertTrue(waitFor(lambda: self.output.getvalue().count("\n") == 2))
+        lines = self.output.getvalue().splitlines()
+        self.assertListEqual(
+            [f"WARNING {__name__}:_messages 1 first", f"WARNING {__name__}:_messages 1 second"], lines
+        )
+
+    def testBufferWhileDown(self):
+        messages = self._messages("a", "b", "c")
+        client = CollectorClient(CollectorSinkConfig(path=self.path, buffer_size=2, reconnect_interval=0.01))
+        client.writeBatch(messages)
+        self.assertEqual(1, client.dropped)
+        self._collect()
+        with LogCollector(self.path, export=False):
+            time.sleep(0.02)
+            client.writeBatch([])
+            client.stop()
+            self.assertTrue(waitFor(lambda: self.output.getvalue().count("\n") == 2))
+        self.assertNotIn(" a\n", self.output.getvalue())
+
+    def testCollectorPath(self):
+        with patch.dict(os.environ, {COLLECTOR_ENV: ""}):
+            with LogCollector(self.path):
+                # the process running the collector keeps its own sinks
+                self.assertIsNone(collectorPath())
+                self.assertEqual(str(self.path), os.environ[COLLECTOR_ENV])
+            self.assertNotIn(COLLECTOR_ENV, os.environ)
+
+    def testWorkerProcess(self):
+        self._collect()
+        script = textwrap.dedent(
+            """
+            from fold.plugins.logger import LogHandlerConfig, LogManager, logger
+            LogManager(LogHandlerConfig(sink="stderr", level="INFO"))
+            logger.bind(worker=2).debug("dropped")
+            logger.bind(worker=2).info("from worker")
+            logger.remove()
+            """
+        )
+        with LogCollector(self.path) as collector:
+            environment = {**os.environ, "PYTHONPATH": os.getcwd()}
+            result = subprocess.run([sys.executable, "-c", script], env=environment, capture_output=True, text=True, timeout=60)
+            self.assertEqual("", result.stderr)
+            self.assertTrue(waitFor(lambda: "from worker" in self.output.getvalue()))
+        self.assertIn("INFO __main__:<module> 2 from worker", self.output.getvalue())
+        self.assertNotIn("dropped", self.output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import io
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from pydantic import ValidationError
+
+from fold.plugins.logger import FilterSpec, LogHandlerConfig, LogManager, compileFilter, logger
+from fold.plugins.logger import filters
+
+
+def record(name="app", message="message", level=20):
+    return {"name": name, "message": message, "level": SimpleNamespace(no=level)}
+
+
+class TestCompileFilter(unittest.TestCase):
+    def _kept(self, spec: dict, records) -> int:
+        predicate = compileFilter(FilterSpec(**spec))
+        return sum(predicate(r) for r in records)
+
+    def testEmpty(self):
+        self.assertEqual(3, self._kept({}, [record()] * 3))
+
+    def testLevel(self):
+        records = [record(level=10), record(level=30)]
+        with self.subTest("number"):
+            self.assertEqual(1, self._kept({"level": 20}, records))
+        with self.subTest("name"):
+            self.assertEqual(1, self._kept({"level": "WARNING"}, records))
+
+    def testSample(self):
+        self.assertEqual(3, self._kept({"sample": 4}, [record(message=str(i)) for i in range(12)]))
+
+    def testRate(self):
+        with patch.object(filters, "monotonic", return_value=0.0):
+            self.assertEqual(2, self._kept({"rate": 1, "burst": 2}, [record(message=str(i)) for i in range(5)]))
+
+    def testDedup(self):
+        records = [record(), record(), record(message="other"), record(name="db")]
+        self.assertEqual(3, self._kept({"dedup": 60}, records))
+
+    def testModules(self):
+        spec = {
+            "level": "INFO",
+            "modules": {"urllib3": {"enabled": False}, "app.db": {"level": "ERROR"}},
+        }
+        records = [
+            record("urllib3.connection"),
+            record("app.db.query", level=30),
+            record("app.db", level=40),
+            record("app.web"),
+            record("app.web", level=10),
+        ]
+        predicate = compileFilter(FilterSpec(**spec))
+        self.assertListEqual([False, False, True, True, False], [predicate(r) for r in records])
+
+    def testUnknownKey(self):
+        self.assertRaises(ValidationError, FilterSpec, rates=1)
+
+
+class TestLogManagerFilterSpec(unittest.TestCase):
+    def tearDown(self) -> None:
+        logger.remove()
+
+    def testExclusive(self):
+        self.assertRaises(ValidationError, LogHandlerConfig, sink="x", filter="app", filter_spec={})
+
+    def testConfig(self):
+        stream = io.StringIO()
+        LogManager(LogHandlerConfig(sink=stream, format="{message}", filter_spec={"dedup": 60}))
+        for _ in range(3):
+            logger.info("repeated")
+        self.assertEqual("repeated\n", stream.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,9 @@
 import unittest
+import io
 import sys
 from pathlib import Path
 
-from pydantic import ValidationError
-
-from fold.plugins.logger.logger import LogHandlerConfig
+from fold.plugins.logger.logger import LogHandlerConfig, LogManager, logger
 
 
 class TestLogConfig(unittest.TestCase):
@@ -39,3 +38,57 @@ class TestLogConfig(unittest.TestCase):
         expected = {"sink": sys.stderr}
 
         self._test(expected, content)
+
+
+class TestLogManagerParseBatch(unittest.TestCase):
+    def testCustomSinks(self):
+        config = [{"sink": "custom", "custom_sink": "sys:stderr"}] * 3
+        result = LogManager.parseConfig(config)
+        self.assertListEqual([sys.stderr] * 3, [conf.sink for conf in result])
+
+    def testMissingModules(self):
+        """Every missing module is reported before any handler is validated"""
+        config = [
+            {"sink": "custom", "custom_sink": "fold_missing_a:sink"},
+            {"sink": "custom", "custom_sink": "fold_missing_b:sink"},
+        ]
+        with self.assertRaises(ImportError) as context:
+            LogManager.parseConfig(config)
+        self.assertEqual(2, len(context.exception.errors))
+
+
+class TestLogManagerReconfigure(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stream = io.StringIO()
+        self.other = io.StringIO()
+
+    def tearDown(self) -> None:
+        LogManager([]).remove()
+
+    def _config(self, stream, level="INFO"):
+        return LogHandlerConfig(sink=stream, format="{message}", level=level)
+
+    def testUnchangedKept(self):
+        first = LogManager([self._config(self.stream), self._config(self.other)])
+        second = LogManager([self._config(self.stream), self._config(self.other, "DEBUG")])
+        self.assertListEqual(
+            list(first.handlers.values())[0], list(second.handlers.values())[0]
+        )
+        self.assertNotEqual(
+            list(first.handlers.values())[1], list(second.handlers.values())[1]
+        )
+        logger.debug("debug")
+        self.assertEqual(("", "debug\n"), (self.stream.getvalue(), self.other.getvalue()))
+
+    def testRemoved(self):
+        LogManager([self._config(self.stream), self._config(self.other)])
+        LogManager(self._config(self.stream))
+        logger.info("info")
+        self.assertEqual(("info\n", ""), (self.stream.getvalue(), self.other.getvalue()))
+
+    def testFirstConfigClearsForeignHandlers(self):
+        LogManager([]).remove()
+        logger.add(self.other)
+        LogManager(self._config(self.stream))
+        logger.info("info")
+        self.assertEqual("", self.other.getvalue())
@@ -0,0 +1,201 @@
+import unittest
+import gzip
+import io
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from fold.plugins.logger import (
+    AsyncSink,
+    AsyncSinkConfig,
+    FileSink,
+    FileSinkConfig,
+    LogHandlerConfig,
+    LogManager,
+    logger,
+)
+
+
+class BlockingStream(io.StringIO):
+    """Stream whose writes wait until released, counting the write calls"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+        self.entered = threading.Event()
+        self.calls = 0
+
+    def write(self, text: str) -> int:
+        self.entered.set()
+        self.release.wait()
+        self.calls += 1
+        return super().write(text)
+
+
+class TestAsyncSink(unittest.TestCase):
+    def _stalled(self, **config):
+        """Sink whose thread is stuck writing the first record"""
+        stream = BlockingStream()
+        sink = AsyncSink(stream, AsyncSinkConfig(batch_size=1, **config))
+        sink.write("first\n")
+        stream.entered.wait()
+        return stream, sink
+
+    def testBatching(self):
+        stream = BlockingStream()
+        stream.release.set()
+        sink = AsyncSink(stream, AsyncSinkConfig(batch_size=50, flush_interval=10))
+        for i in range(100):
+            sink.write(f"{i}\n")
+        sink.stop()
+        self.assertEqual("".join(f"{i}\n" for i in range(100)), stream.getvalue())
+        self.assertEqual(2, sink.stats.batches)
+
+    def testFlushInterval(self):
+        stream = BlockingStream()
+        stream.release.set()
+        sink = AsyncSink(stream, AsyncSinkConfig(batch_size=50, flush_interval=0.01))
+        sink.write("a\n")
+        stream.entered.wait(5)
+        sink.stop()
+        self.assertEqual("a\n", stream.getvalue())
+
+    def testDropNewest(self):
+        stream, sink = self._stalled(queue_size=2, policy="drop_newest")
+        for message in ("a\n", "b\n", "c\n"):
+            sink.write(message)
+        self.assertEqual((2, 1), (sink.stats.depth, sink.stats.dropped))
+        stream.release.set()
+        sink.stop()
+        self.assertEqual("first\na\nb\n", stream.getvalue())
+
+    def testDropOldest(self):
+        stream, sink = self._stalled(queue_size=2, policy="drop_oldest")
+        for message in ("a\n", "b\n", "c\n"):
+            sink.write(message)
+        stream.release.set()
+        sink.stop()
+        self.assertEqual("first\nb\nc\n", stream.getvalue())
+
+    def testSample(self):
+        stream, sink = self._stalled(queue_size=100, policy="sample", sample_every=2, sample_above=0.01)
+        for i in range(10):
+            sink.write(f"{i}\n")
+        self.assertEqual(5, sink.stats.dropped)
+        stream.release.set()
+        sink.stop()
+
+    def testBlock(self):
+        stream, sink = self._stalled(queue_size=1, policy="block")
+        sink.write("a\n")
+        writer = threading.Thread(target=sink.write, args=("b\n",))
+        writer.start()
+        writer.join(0.05)
+        self.assertTrue(writer.is_alive())
+        stream.release.set()
+        writer.join(5)
+        sink.stop()
+        self.assertEqual("first\na\nb\n", stream.getvalue())
+        self.assertEqual(0, sink.stats.dropped)
+
+    def testUnsupportedSink(self):
+        self.assertRaises(TypeError, AsyncSink, 42)
+
+
+class TestLogManagerAsyncSink(unittest.TestCase):
+    def tearDown(self) -> None:
+        logger.remove()
+
+    def testConfig(self):
+        stream = io.StringIO()
+        config = LogHandlerConfig(sink=stream, format="{message}", async_sink={"batch_size": 10})
+        self.assertNotIn("async_sink", config.dict())
+        manager = LogManager(config)
+        logger.info("hello")
+        logger.remove()  # stops the sink, writing what is queued
+        self.assertEqual("hello\n", stream.getvalue())
+        self.assertEqual(1, manager.sinks[0].stats.written)
+
+
+class TestFileSink(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name, "app.log")
+
+    def tearDown(self) -> None:
+        logger.remove()
+        self.directory.cleanup()
+
+    def _sink(self, **config) -> FileSink:
+        return FileSink(FileSinkConfig(path=self.path, **config))
+
+    def testBuffered(self):
+        sink = self._sink(flush_interval=3600)
+        sink.write("a\n")
+        self.assertEqual("", self.path.read_text())
+        sink.sync()
+        self.assertEqual("a\n", self.path.read_text())
+        sink.stop()
+
+    def testIdleFlush(self):
+        """The buffer is flushed without further writes"""
+        sink = self._sink(flush_interval=0.05)
+        sink.write("a\n")
+        deadline = time.monotonic() + 5
+        while not self.path.read_text() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual("a\n", self.path.read_text())
+        sink.stop()
+
+    def testRotateBySize(self):
+        sink = self._sink(rotation_size=4)
+        for message in ("aa\n", "bb\n", "cc\n"):
+            sink.write(message)
+        sink.stop()
+        self.assertEqual("cc\n", self.path.read_text())
+        rotated = sorted(path.read_text() for path in sink.rotatedFiles())
+        self.assertListEqual(["aa\n", "bb\n"], rotated)
+
+    def testRotateByTime(self):
+        sink = self._sink(rotation_interval=1e-9)
+        sink.write("a\n")
+        sink.write("b\n")
+        sink.stop()
+        self.assertEqual(1, len(sink.rotatedFiles()))
+
+    def testCompressionAndRetention(self):
+        sink = self._sink(rotation_size=1, compression="gz", retention=2)
+        for i in range(5):
+            sink.write(f"{i}\n")
+        sink.stop()
+        rotated = sink.rotatedFiles()
+        self.assertEqual(2, len(rotated))
+        self.assertTrue(all(path.suffix == ".gz" for path in rotated))
+        self.assertSetEqual({b"2\n", b"3\n"}, {gzip.decompress(path.read_bytes()) for path in rotated})
+
+    def testRetentionKeepsSiblings(self):
+        """Files sharing the log name but not rotated by the sink are left alone"""
+        siblings = [self.path.with_name("app.log.bin"), self.path.with_name("app.log.old")]
+        for path in siblings:
+            path.write_text("keep")
+        sink = self._sink(rotation_size=1, retention=1)
+        for i in range(3):
+            sink.write(f"{i}\n")
+        sink.stop()
+        self.assertEqual(1, len(sink.rotatedFiles()))
+        self.assertTrue(all(path.read_text() == "keep" for path in siblings))
+
+    def testConfig(self):
+        self.assertRaises(ValidationError, LogHandlerConfig, sink="file")
+        config = LogHandlerConfig(sink="file", format="{message}", file_sink={"path": self.path})
+        LogManager(config)
+        logger.info("hello")
+        logger.remove()
+        self.assertEqual("hello\n", self.path.read_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fold.utils.dag import (
+    DependencyCycleError,
+    DependencyError,
+    dependencyLevels,
+    findCycle,
+    runGraph,
+)
+
+
+class TestDependencyLevels(unittest.TestCase):
+    def testLevels(self):
+        graph = {"c": ["a", "b"], "a": [], "b": ["a"], "d": []}
+        self.assertListEqual([["a", "d"], ["b"], ["c"]], dependencyLevels(graph))
+
+    def testUnknown(self):
+        self.assertRaises(KeyError, dependencyLevels, {"a": ["b"]})
+
+    def testCycle(self):
+        graph = {"a": ["b"], "b": ["c"], "c": ["a"], "d": []}
+        with self.assertRaises(DependencyCycleError) as context:
+            dependencyLevels(graph)
+        cycle = context.exception.cycle
+        self.assertEqual(cycle[0], cycle[-1])
+        self.assertSetEqual({"a", "b", "c"}, set(cycle))
+
+    def testNoCycle(self):
+        self.assertIsNone(findCycle({"a": ["b"], "b": []}))
+
+
+class TestRunGraph(unittest.TestCase):
+    GRAPH = {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]}
+
+    def _test(self, executor=None):
+        result = runGraph(self.GRAPH, lambda node, deps: node + "".join(sorted(deps.values())), executor)
+        self.assertDictEqual({"a": "a", "b": "ba", "c": "ca", "d": "dbaca"}, result)
+
+    def testSerial(self):
+        self._test()
+
+    def testPool(self):
+        with ThreadPoolExecutor(4) as executor:
+            self._test(executor)
+
+    def testEmpty(self):
+        with ThreadPoolExecutor(1) as executor:
+            self.assertDictEqual({}, runGraph({}, lambda node, deps: node, executor))
+
+    def testConcurrent(self):
+        """Independent nodes run at the same time"""
+        barrier = threading.Barrier(2, timeout=5)
+        with ThreadPoolExecutor(2) as executor:
+            runGraph({"a": [], "b": []}, lambda node, deps: barrier.wait(), executor)
+
+    def testFailure(self):
+        def run(node, deps):
+            if node == "b":
+                raise RuntimeError(node)
+            return node
+
+        for executor in (None, ThreadPoolExecutor(2)):
+            with self.subTest(executor=executor), self.assertRaises(DependencyError) as context:
+                runGraph(self.GRAPH, run, executor)
+            error = context.exception
+            self.assertListEqual(["b"], list(error.errors))
+            self.assertDictEqual({"d": "b"}, error.skipped)
+            self.assertDictEqual({"a": "a", "c": "c"}, error.results)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
 import unittest
+import sys
+import tempfile
+from pathlib import Path
 
-from fold.utils.imp import importFromString
+from fold.utils.imp import ImportResolver, importFromString
 
 
 class TestStringImporter(unittest.TestCase):
@@ -31,3 +34,69 @@ class TestStringImporter(unittest.TestCase):
         name = "json:decoder.JSONDecodeError"
         result = importFromString(name)
         self.assertEqual(expected, result)
+
+    def testNestedAttribute(self):
+        """Attributes are looked up on the object being walked, not on the module"""
+        name = "pathlib:PurePath.__name__"
+        result = importFromString(name)
+        self.assertEqual("PurePath", result)
+
+
+class TestImportResolver(unittest.TestCase):
+    def setUp(self) -> None:
+        self.resolver = ImportResolver()
+
+    def testMemoized(self):
+        from pathlib import Path as expected
+
+        for _ in range(3):
+            self.assertIs(expected, self.resolver.resolve("pathlib:Path"))
+        self.assertEqual((2, 1), (self.resolver.stats.hits, self.resolver.stats.misses))
+
+    def testResolveMany(self):
+        import json
+
+        names = ["json", "json:loads", "json"]
+        expected = {"json": json, "json:loads": json.loads}
+        self.assertDictEqual(expected, self.resolver.resolveMany(names))
+
+    def testValidate(self):
+        errors = self.resolver.validate(["json:loads", "fold_missing_module:foo"])
+        self.assertListEqual(["fold_missing_module:foo"], list(errors))
+        self.assertIsInstance(errors["fold_missing_module:foo"], ModuleNotFoundError)
+
+    def testValidateWithoutImport(self):
+        """Parent packages are not executed to find their submodules"""
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory, "fold_validate_sample")
+            root.mkdir()
+            (root / "__init__.py").write_text("raise RuntimeError('imported')\n")
+            (root / "sub.py").write_text("")
+            sys.path.insert(0, directory)
+            try:
+                errors = self.resolver.validate(["fold_validate_sample.sub:x", "fold_validate_sample.missing:y"])
+            finally:
+                sys.path.remove(directory)
+        self.assertListEqual(["fold_validate_sample.missing:y"], list(errors))
+        self.assertNotIn("fold_validate_sample", sys.modules)
+
+    def testResolveManyReportsAll(self):
+        names = ["fold_missing_a:x", "fold_missing_b:y"]
+        with self.assertRaises(ImportError) as context:
+            self.resolver.resolveMany(names)
+        self.assertListEqual(names, list(context.exception.errors))
+
+    def testResolveManyMissingObject(self):
+        with self.assertRaises(ImportError) as context:
+            self.resolver.resolveMany(["json:missing"])
+        self.assertIsInstance(context.exception.errors["json:missing"], AttributeError)
+
+    def testInvalidate(self):
+        """Objects named through or defined in a module are dropped"""
+        self.resolver.resolveMany(["json", "json:loads", "json.decoder:JSONDecoder", "pathlib:Path"])
+        # json re-exports JSONDecoder, which is defined in json.decoder
+        self.resolver.resolve("json:JSONDecoder")
+        self.assertEqual(2, self.resolver.invalidate(["json.decoder"]))
+        self.assertEqual(2, self.resolver.invalidate(["json"]))
+        self.resolver.resolve("pathlib:Path")
+        self.assertEqual(1, self.resolver.stats.hits)
@@ -0,0 +1,127 @@
+import unittest
+import hashlib
+import importlib
+import os
+import sys
+import tempfile
+import textwrap
+from pathlib import Path
+from unittest.mock import patch
+
+from fold.core.plugin import Plugin
+from fold.utils.cache import ImportCache
+from fold.utils.plugin import PluginManager
+
+
+class TestImportCache(unittest.TestCase):
+    def testLRUEviction(self):
+        cache = ImportCache(maxsize=2)
+        cache["a"], cache["b"] = 1, 2
+        cache.get("a")
+        cache["c"] = 3
+        self.assertListEqual(["a", "c"], list(cache))
+        self.assertEqual(1, cache.stats.evictions)
+
+    def testStats(self):
+        cache = ImportCache()
+        cache["a"] = 1
+        cache.get("a")
+        cache.get("b")
+        self.assertEqual((1, 1), (cache.stats.hits, cache.stats.misses))
+
+    def testClear(self):
+        cache = ImportCache()
+        cache["a"] = 1
+        cache.clear()
+        self.assertDictEqual({}, cache)
+
+    def testInvalidValidation(self):
+        self.assertRaises(ValueError, ImportCache, validate="ctime")
+
+
+class TestImportCacheInvalidation(unittest.TestCase):
+    PACKAGE = "fold_cache_sample"
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = Path(self.directory.name, f"{self.PACKAGE}.py")
+        self._write("A")
+        sys.path.insert(0, self.directory.name)
+
+    def tearDown(self) -> None:
+        sys.path.remove(self.directory.name)
+        sys.modules.pop(self.PACKAGE, None)
+        self.directory.cleanup()
+
+    def _write(self, name: str) -> None:
+        self.source.write_text(
+            textwrap.dedent(
+                f"""
+                from fold.core import Plugin
+
+                class {name}(Plugin):
+                    @classmethod
+                    def parseConfig(cls, config):
+                        return config
+                """
+            )
+        )
+        # make the change visible even within the timestamp resolution
+        stat = self.source.stat()
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + len(name) * 10**9))
+
+    def _test(self, validate: str):
+        manager = PluginManager(Plugin, ImportCache(validate=validate))
+        self.assertSetEqual({"A"}, {p.__name__ for p in manager.discover(self.PACKAGE)})
+        self._write("Bee")
+        self.assertSetEqual({"Bee"}, {p.__name__ for p in manager.discover(self.PACKAGE)})
+        self.assertEqual(1, manager.stats.invalidations)
+
+    def testMtime(self):
+        self._test("mtime")
+
+    def testHash(self):
+        self._test("hash")
+
+    def testHashOnlyTouched(self):
+        """A hash cache hit hashes the file again only if it was touched"""
+        module = importlib.import_module(self.PACKAGE)
+        cache = ImportCache(validate="hash")
+        cache["module"] = module
+        with patch("fold.utils.cache.hashlib.sha256", wraps=hashlib.sha256) as sha256:
+            for _ in range(3):
+                self.assertIs(module, cache.get("module"))
+            sha256.assert_not_called()
+            stat = self.source.stat()
+            os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            self.assertIs(module, cache.get("module"))
+            self.assertIs(module, cache.get("module"))
+            sha256.assert_called_once()
+
+    def testUnvalidated(self):
+        manager = PluginManager(Plugin, ImportCache(validate=None))
+        manager.discover(self.PACKAGE)
+        self._write("Bee")
+        self.assertSetEqual({"A"}, {p.__name__ for p in manager.discover(self.PACKAGE)})
+
+
+class TestPluginManagerScope(unittest.TestCase):
+    def testSharedByDefault(self):
+        self.assertIs(PluginManager(Plugin).cache, PluginManager(Plugin).cache)
+
+    def testPrivateCache(self):
+        manager = PluginManager(Plugin, ImportCache())
+        manager.discover("fold.core.reload")
+        self.assertIn("fold.core.reload", manager.cache)
+        self.assertNotIn("fold.core.reload", PluginManager(Plugin).cache)
+
+    def testFlushClearsSharedCache(self):
+        cache = ImportCache()
+        first, second = PluginManager(Plugin, cache), PluginManager(Plugin, cache)
+        first.discover("fold.plugins.config")
+        second.flushCache()
+        self.assertDictEqual({}, first.cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import sys
+import tempfile
+import textwrap
+from pathlib import Path
+from unittest.mock import patch
+
+from fold.core.plugin import Plugin
+from fold.utils.plugin import PluginManager, PluginRegistry
+from fold.utils.pluginIndex import PluginIndex, findSource, scanModule
+
+
+class TestPluginIndex(unittest.TestCase):
+    """Plugins live in a package whose import would fail, so any import is detected"""
+
+    PACKAGE = "fold_index_sample"
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.directory = tempfile.TemporaryDirectory()
+        root = Path(cls.directory.name, cls.PACKAGE)
+        root.mkdir()
+        (root / "__init__.py").write_text("from .impl import Heavy, Derived\n")
+        (root / "impl.py").write_text(
+            textwrap.dedent(
+                """
+                import a_missing_heavy_dependency
+                from fold.core import Plugin
+
+                class Heavy(Plugin):
+                    EXTENSIONS = {"heavy"}
+
+                class Derived(Heavy):
+                    pass
+
+                class _Private(Plugin):
+                    pass
+
+                class NotAPlugin:
+                    pass
+                """
+            )
+        )
+        sys.path.insert(0, cls.directory.name)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        sys.path.remove(cls.directory.name)
+        cls.directory.cleanup()
+
+    def setUp(self) -> None:
+        self.index = PluginIndex()
+
+    def _names(self, specs):
+        return {spec.name for spec in specs}
+
+    def testFindSource(self):
+        self.assertEqual("impl.py", findSource(f"{self.PACKAGE}.impl").name)
+        self.assertNotIn(self.PACKAGE, sys.modules)
+
+    def testLookup(self):
+        specs = self.index.lookup(self.PACKAGE, Plugin)
+        with self.subTest("plugins"):
+            self.assertSetEqual({"Heavy", "Derived"}, self._names(specs))
+        with self.subTest("not imported"):
+            self.assertNotIn(f"{self.PACKAGE}.impl", sys.modules)
+
+    def testAttributes(self):
+        specs = {spec.name: spec for spec in self.index.lookup(self.PACKAGE, Plugin)}
+        with self.subTest("extensions"):
+            self.assertSetEqual({"heavy"}, specs["Heavy"].extensions)
+        with self.subTest("path"):
+            self.assertEqual(f"{self.PACKAGE}.impl:Heavy", specs["Heavy"].path)
+
+    def testRoundTrip(self):
+        self.index.lookup(self.PACKAGE, Plugin)
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "index.json")
+            self.index.dump(path)
+            loaded = PluginIndex.load(path)
+        with self.subTest("lookup"):
+            self.assertSetEqual(
+                self.index.lookup(self.PACKAGE, Plugin), loaded.lookup(self.PACKAGE, Plugin)
+            )
+        with self.subTest("stale"):
+            self.assertSetEqual(set(), loaded.stale())
+
+    def testScan(self):
+        specs = PluginManager(Plugin).scan(self.PACKAGE, index=self.index)
+        self.assertSetEqual({"Heavy", "Derived"}, self._names(specs))
+
+    def testLoadedIndexRegistry(self):
+        """A lazy registry discovers from a loaded index without scanning sources"""
+        self.index.lookup(self.PACKAGE, Plugin)
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "index.json")
+            self.index.dump(path)
+            loaded = PluginIndex.load(path)
+        with patch("fold.utils.pluginIndex.scanModule") as scan:
+            registry = PluginRegistry(Plugin, [self.PACKAGE], lazy=True, index=loaded)
+            self.assertSetEqual({"Heavy", "Derived"}, set(registry.byName))
+        scan.assert_not_called()
+
+    def testLoadedIndexStale(self):
+        """Modules changed since the index was written are rescanned"""
+        self.index.lookup(self.PACKAGE, Plugin)
+        self.index._modules[f"{self.PACKAGE}.impl"].mtime = 0
+        with patch("fold.utils.pluginIndex.scanModule", wraps=scanModule) as scan:
+            PluginManager(Plugin, index=self.index)
+        scan.assert_called_once_with(f"{self.PACKAGE}.impl")
+        self.assertSetEqual(set(), self.index.stale())
+
+    def testScanMatchesDiscover(self):
+        from fold.plugins.outputs import OutputPlugin
+
+        manager = PluginManager(OutputPlugin)
+        expected = {plugin.__name__ for plugin in manager.discover("fold.plugins.outputs")}
+        self.assertSetEqual(expected, self._names(manager.scan("fold.plugins.outputs")))
@@ -0,0 +1,98 @@
+import unittest
+import io
+import json
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from fold.core.config import BaseConfig
+from fold.core.plugin import Plugin
+from fold.utils.cache import ImportCache
+from fold.utils.plugin import PluginManager
+from fold.utils.profile import Profiler, profile, span
+
+
+class TestProfiler(unittest.TestCase):
+    def testNesting(self):
+        profiler = Profiler()
+        with profiler.span("outer", "load"):
+            with profiler.span("inner", "import"):
+                pass
+        (root,) = profiler.roots
+        self.assertEqual("inner", root.children[0].name)
+        self.assertGreaterEqual(root.duration, root.children[0].duration)
+
+    def testThreadRoots(self):
+        profiler = Profiler()
+        with profiler.span("main"):
+            thread = threading.Thread(target=lambda: profiler.span("worker").__enter__())
+            thread.start()
+            thread.join()
+        self.assertSetEqual({"main", "worker"}, {root.name for root in profiler.roots})
+
+    def testError(self):
+        profiler = Profiler()
+        with self.assertRaises(KeyError):
+            with profiler.span("fails"):
+                raise KeyError("x")
+        self.assertIn("KeyError", profiler.roots[0].error)
+
+    def testCollapsed(self):
+        profiler = Profiler()
+        for _ in range(2):
+            with profiler.span("a b", "load"):
+                with profiler.span("c;d"):
+                    pass
+        lines = profiler.collapsed().splitlines()
+        self.assertListEqual(["load:a_b", "load:a_b;c,d"], [line.rsplit(" ", 1)[0] for line in lines])
+
+    def testDump(self):
+        profiler = Profiler()
+        with profiler.span("a"):
+            pass
+        file = io.StringIO()
+        profiler.dump(file)
+        self.assertEqual("a", json.loads(file.getvalue())[0]["name"])
+        self.assertRaises(ValueError, profiler.dump, file, "svg")
+
+
+class TestProfile(unittest.TestCase):
+    MODULE = "fold_profile_sample"
+
+    def testDisabled(self):
+        with span("nothing") as recorded:
+            self.assertIsNone(recorded)
+
+    def testNested(self):
+        with profile():
+            with self.assertRaises(RuntimeError):
+                with profile():
+                    pass
+
+    def testPluginLoad(self):
+        with tempfile.TemporaryDirectory() as directory:
+            Path(directory, f"{self.MODULE}.py").write_text(
+                "import fold_profile_dependency\nfrom fold.core import Plugin\n"
+            )
+            Path(directory, "fold_profile_dependency.py").write_text("")
+            sys.path.insert(0, directory)
+            try:
+                with profile() as profiler:
+                    PluginManager(Plugin, ImportCache()).discover(self.MODULE)
+            finally:
+                sys.path.remove(directory)
+                sys.modules.pop(self.MODULE, None)
+                sys.modules.pop("fold_profile_dependency", None)
+        stacks = profiler.collapsed()
+        self.assertIn(f"discover:{self.MODULE};module:fold_profile_dependency ", stacks)
+
+    def testParserAttempts(self):
+        with profile(imports=False) as profiler:
+            BaseConfig.parseText('{"a": 1}')
+        categories = {span.category for span in profiler.walk()}
+        self.assertIn("parse", categories)
+
+
+if __name__ == "__main__":
+    unittest.main()